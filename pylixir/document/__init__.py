@@ -11,5 +11,13 @@ This module provides functionality for:
 from .document_id import DocumentId, ADMIN, PUBLIC, NEW_DOCUMENT_ID
 from .document_info import DocumentInfo, listDocumentInfo
 from .document import Document
-from .update_pointer import update_pointer_value, deference_pointer
+from .partial_document import PartialDocument, UnloadedFieldError
+from .document_cache import CachePolicy, CacheBackend, LRUCacheBackend
+from .query_cache import QueryCachePolicy, invalidate_queries
+from .prefetch import prefetch, load_by_ids
+from .indexes import Index, IndexSyncReport, sync_indexes, sync_indexes_in_background
+from .pagination import DocumentPage
+from .bulk_writer import BulkWriter, BulkOpResult
+from .unit_of_work import UnitOfWork, begin_unit_of_work, current_unit_of_work, register_unit_of_work
+from .update_pointer import update_pointer_value, update_pointer_values, deference_pointer, deference_pointers
 from .modify_bson_fields import add_field, rename_field, delete_field
\ No newline at end of file
@@ -0,0 +1,43 @@
+import argparse
+import importlib
+import sys
+
+
+"""
+Command line tools for Documents.
+
+	python -m pylixir.document sync-indexes myapp.models [myapp.other_models ...] [--dry-run] [--drop-unknown]
+
+The modules are imported first so that their Document classes are registered. Connection settings are read from the usual environment variables (see readme.txt).
+"""
+
+def _sync_indexes(args: argparse.Namespace) -> int:
+	from ..typing.registration.create_type_registry import create_type_registry
+	from .indexes import sync_indexes
+
+	for module_name in args.modules:
+		importlib.import_module(module_name)
+	create_type_registry()
+
+	reports = sync_indexes(drop_unknown=args.drop_unknown, dry_run=args.dry_run)
+	for report in reports:
+		print(report)
+	if args.dry_run:
+		print("Dry run: nothing was changed.")
+	return 1 if any(report.conflicting for report in reports) else 0
+
+def main(argv: list[str] | None = None) -> int:
+	parser = argparse.ArgumentParser(prog="python -m pylixir.document")
+	subparsers = parser.add_subparsers(dest="command", required=True)
+
+	sync_parser = subparsers.add_parser("sync-indexes", help="Create the indexes declared on Document classes that are missing from mongo.")
+	sync_parser.add_argument("modules", nargs="+", help="Modules to import, which define the Document classes.")
+	sync_parser.add_argument("--dry-run", action="store_true", help="Only report what would be created or dropped.")
+	sync_parser.add_argument("--drop-unknown", action="store_true", help="Drop the indexes that aren't declared (except _id).")
+	sync_parser.set_defaults(func=_sync_indexes)
+
+	args = parser.parse_args(argv)
+	return args.func(args)
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,234 @@
+import time
+from dataclasses import dataclass, field
+from typing import Any, Self
+
+from pymongo import DeleteOne, InsertOne, ReplaceOne, UpdateOne
+from pymongo.collection import Collection
+from pymongo.errors import BulkWriteError
+
+from ..typing.fields.field_path import FieldPath
+from .change_tracking import copy_bson
+from .document_id import DocumentId
+from .unit_of_work import current_unit_of_work
+from .update_method import UpdateMethod
+from . import instrumentation
+
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+	from .document import Document
+
+
+"""
+Bulk writes
+
+A BulkWriter queues inserts, updates, field updates and deletes of any Documents, and sends them with bulk_write, chunk_size operations at a time per collection.
+Each operation runs the same hooks as the matching Document method when it is queued (__before_saving__, __class_validation__, __before_deleting__, field validation),
+so invalid operations raise immediately and nothing is sent for them.
+
+	with BulkWriter(chunk_size=500) as bulk:   # Flushes on exit. Nothing is sent if the block raises.
+		bulk.insert(new_project)
+		bulk.update(project)                    # Sends only the changed fields, like db_update_self()
+		bulk.update_field(Project, project_id, FieldPath.for_(Project, Project.title), "New title")
+		bulk.delete(old_project)
+	bulk.results                                # One BulkOpResult per operation, in the order they were queued
+
+With ordered=False (the default), mongo applies every operation it can, and the failures are reported in the results.
+With ordered=True, the flush stops at the first failure: the rest of that chunk, the later chunks and the queues of the collections after it are not sent, and are reported as not executed.
+mongo only reports how many updates matched per chunk, not which ones, so an update of a document that doesn't exist is not a failure. See unmatched_count.
+"""
+
+@dataclass
+class BulkOpResult:
+	""" The outcome of one queued operation. """
+	operation: str
+	""" 'insert', 'update', 'update_field' or 'delete' """
+	document_cls: type['Document']
+	document_id: Any
+	obj: 'Document | None'
+	""" The obj passed in, if any """
+	error: dict[str, Any] | None = None
+	""" The write error reported by mongo, if the operation failed """
+	executed: bool = True
+	""" False if the operation wasn't sent because an earlier operation failed (ordered=True only) """
+
+	@property
+	def ok(self) -> bool:
+		return self.executed and self.error is None
+
+@dataclass
+class _QueuedOp:
+	result: BulkOpResult
+	write: Any
+	document: dict[str, Any] | None = None
+	""" The document saved by an insert or update, to snapshot once it is written """
+	previous_version: int | None = None
+	""" The version to restore if an update fails """
+
+@dataclass
+class _CollectionQueue:
+	collection: Collection
+	ops: list[_QueuedOp] = field(default_factory=list)
+
+class BulkWriter:
+	""" Queues writes to Documents and sends them in chunks with bulk_write. """
+	def __init__(self, chunk_size: int = 1000, ordered: bool = False, raise_on_error: bool = True) -> None:
+		"""
+		Args:
+			chunk_size: The maximum number of operations per bulk_write.
+			ordered: If False, mongo keeps going after an operation fails. If True, nothing after the first failed operation is sent.
+			raise_on_error: If True, flush() raises a ValueError after sending everything if any operation failed. The results are still available.
+		"""
+		if chunk_size <= 0:
+			raise ValueError(f"chunk_size must be positive. Instead received {chunk_size}.")
+		self.chunk_size = chunk_size
+		self.ordered = ordered
+		self.raise_on_error = raise_on_error
+		self.results: list[BulkOpResult] = []
+		self.unmatched_count = 0
+		""" The number of updates that didn't match a document, across all flushes """
+		self._queues: dict[str, _CollectionQueue] = {}
+
+	def __enter__(self) -> Self:
+		return self
+
+	def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+		if exc_type is None:
+			self.flush()
+		else:
+			self.discard()
+
+	def __len__(self) -> int:
+		""" The number of queued operations """
+		return sum(len(queue.ops) for queue in self._queues.values())
+
+	# region: Queueing
+	def insert(self, obj: 'Document') -> BulkOpResult:
+		obj.__before_saving__(UpdateMethod.INSERT)
+		return self._queue_insert(obj)
+
+	def update(self, obj: 'Document') -> BulkOpResult:
+		""" Saves the obj, sending only the changed fields if it has a snapshot (see Document.db_update_self). """
+		obj.__before_saving__(UpdateMethod.UPDATE)
+		return self._queue_update(obj)
+
+	def update_field(self, document_cls: type['Document'], document_id: DocumentId, field_path: FieldPath, new_value: Any) -> BulkOpResult:
+		""" Sets a single independently updateable field (see Document.db_update_field). """
+		update = document_cls._prepare_field_update(document_id, field_path, new_value)
+		return self._queue(BulkOpResult("update_field", document_cls, document_id, None), UpdateOne({"_id": document_id}, update))
+
+	def delete(self, obj: 'Document') -> BulkOpResult:
+		if not obj.__before_deleting__():
+			raise ValueError("Can't delete this object because it is referenced by another.")
+		document_cls = type(obj)
+		return self._queue(BulkOpResult("delete", document_cls, obj._id, obj), DeleteOne(document_cls.__class_query__() | {"_id": obj._id}))
+
+	def _queue_insert(self, obj: 'Document') -> BulkOpResult:
+		""" Queues an insert without running __before_saving__. """
+		document = type(obj).__class_validation__(obj).to_document()
+		return self._queue(BulkOpResult("insert", type(obj), obj._id, obj), InsertOne(document), document)
+
+	def _queue_update(self, obj: 'Document') -> BulkOpResult:
+		""" Queues an update without running __before_saving__. """
+		previous_version = obj.__version__
+		document, update = obj._prepare_update()
+		if update is not None:
+			write: Any = UpdateOne({"_id": obj._id}, update)
+		else:
+			write = ReplaceOne({"_id": obj._id}, document)
+		return self._queue(BulkOpResult("update", type(obj), obj._id, obj), write, document, previous_version)
+
+	def _queue(self, result: BulkOpResult, write: Any, document: dict[str, Any] | None = None, previous_version: int | None = None) -> BulkOpResult:
+		collection_name = result.document_cls.get_collection_name()
+		queue = self._queues.get(collection_name)
+		if queue is None:
+			queue = self._queues[collection_name] = _CollectionQueue(result.document_cls.get_collection())
+		queue.ops.append(_QueuedOp(result, write, document, previous_version))
+		self.results.append(result)
+		return result
+	# endregion
+
+	def discard(self) -> None:
+		""" Drops the queued operations without sending them, restoring the versions of queued updates. """
+		for queue in self._queues.values():
+			self._skip(queue.ops)
+		self._queues.clear()
+
+	@staticmethod
+	def _skip(ops: list[_QueuedOp]) -> None:
+		""" Marks the operations as not executed, restoring the versions of queued updates. """
+		for op in ops:
+			if op.previous_version is not None and op.result.obj is not None:
+				op.result.obj.__version__ = op.previous_version
+			op.result.executed = False
+
+	def flush(self) -> list[BulkOpResult]:
+		""" Sends the queued operations, and returns their results. """
+		queues = self._queues
+		self._queues = {}
+		flushed: list[BulkOpResult] = []
+		stopped = False
+		for collection_name, queue in queues.items():
+			for chunk_start in range(0, len(queue.ops), self.chunk_size):
+				chunk = queue.ops[chunk_start:chunk_start + self.chunk_size]
+				if stopped:
+					self._skip(chunk)
+				elif not self._write_chunk(collection_name, queue.collection, chunk) and self.ordered:
+					stopped = True # Don't send anything after the first failure
+				flushed.extend(op.result for op in chunk)
+
+		if self.raise_on_error:
+			failed = [result for result in flushed if not result.ok]
+			if failed:
+				details = "\n".join(f"{result.operation} {result.document_cls.__name__} '{result.document_id}': {result.error['errmsg'] if result.error else 'not executed'}" for result in failed[:10])
+				raise ValueError(f"{len(failed)} of {len(flushed)} bulk write operations failed.\n{details}")
+		return flushed
+
+	def _write_chunk(self, collection_name: str, collection: Collection, chunk: list[_QueuedOp]) -> bool:
+		""" Sends a chunk of operations. Returns False if any of them failed. """
+		start_time = time.perf_counter()
+		try:
+			bulk_result = collection.bulk_write([op.write for op in chunk], ordered=self.ordered)
+			matched_count = bulk_result.matched_count
+		except BulkWriteError as e:
+			details = e.details
+			for write_error in details.get("writeErrors", []):
+				chunk[write_error["index"]].result.error = write_error
+			if self.ordered:
+				first_failed_index = min((write_error["index"] for write_error in details.get("writeErrors", [])), default=len(chunk))
+				for op in chunk[first_failed_index + 1:]:
+					op.result.executed = False
+			matched_count = details.get("nMatched", 0)
+		except Exception:
+			# We can't tell which writes were applied, so drop the snapshots. The next db_update_self() of these objs replaces the whole document.
+			for op in chunk:
+				op.result.executed = False
+				if op.result.obj is not None:
+					op.result.obj._set_db_snapshot(None)
+				op.result.document_cls._invalidate_cached(op.result.document_id)
+			raise
+
+		updates_count = sum(1 for op in chunk if op.result.ok and op.result.operation in ("update", "update_field"))
+		self.unmatched_count += max(updates_count - matched_count, 0)
+		unit = current_unit_of_work()
+		for op in chunk:
+			self._after_write(op, unit)
+		instrumentation.record(collection_name, "bulk_write", start_time, document_count=len(chunk), documents=[op.document for op in chunk if op.document is not None])
+		return all(op.result.error is None for op in chunk)
+
+	@staticmethod
+	def _after_write(op: _QueuedOp, unit: Any) -> None:
+		""" Updates the obj, cache and identity map to match what was written. """
+		result = op.result
+		if not result.ok:
+			if op.previous_version is not None and result.obj is not None:
+				result.obj.__version__ = op.previous_version
+			return
+
+		result.document_cls._invalidate_cached(result.document_id)
+		if op.document is not None and result.obj is not None:
+			result.obj._set_db_snapshot(copy_bson(op.document))
+		if unit is not None:
+			if result.operation == "delete" and result.obj is not None:
+				unit.evict(result.obj)
+			elif result.operation == "update_field":
+				unit.forget(result.document_cls, result.document_id) # The loaded instance is out of date
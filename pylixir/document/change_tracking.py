@@ -0,0 +1,119 @@
+from typing import Any
+
+
+"""
+Change tracking
+
+When a Document is loaded (or saved), a copy of its raw mongo document is kept on the instance under __db_snapshot__.
+Document.db_update_self() diffs the new document against this snapshot and sends a $set / $unset with only the paths that changed, instead of replacing the whole document.
+
+The diff is only used when it can be expressed exactly:
+	- Embedded documents (dicts) are diffed key by key.
+	- Lists are always set whole (we never emit positional updates).
+	- If an embedded document has a key that can't be used in dot notation (contains "." or starts with "$"), the whole embedded document is set.
+	- If that happens at the root of the document, diff_documents() returns None and the caller should fall back to replacing the document.
+"""
+
+__db_snapshot__ = "__db_snapshot__"
+
+def copy_bson(bson: Any) -> Any:
+	""" Recursively copies the mutable containers (dicts and lists) in a bson value. All other bson values are immutable and are shared. """
+	if type(bson) is dict:
+		return {key: copy_bson(value) for key, value in bson.items()}
+	if type(bson) is list:
+		return [copy_bson(value) for value in bson]
+	return bson
+
+def bson_equal(a: Any, b: Any) -> bool:
+	""" Compares two bson values. Unlike ==, values of different types (e.g. 1 and 1.0, or 1 and True) are not equal, since mongo stores them differently. """
+	if type(a) is not type(b):
+		return False
+	if type(a) is dict:
+		if len(a) != len(b) or list(a.keys()) != list(b.keys()):
+			return False
+		return all(bson_equal(value, b[key]) for key, value in a.items())
+	if type(a) is list:
+		if len(a) != len(b):
+			return False
+		return all(bson_equal(x, y) for x, y in zip(a, b))
+	return a == b
+
+def diff_documents(snapshot: dict[str, Any], document: dict[str, Any]) -> tuple[dict[str, Any], dict[str, Any]] | None:
+	""" Returns the ($set, $unset) needed to turn the snapshot into the document. Returns None if the change can't be expressed as a $set / $unset. """
+	set_fields: dict[str, Any] = {}
+	unset_fields: dict[str, Any] = {}
+	if not _diff(snapshot, document, "", set_fields, unset_fields):
+		return None
+	return set_fields, unset_fields
+
+def _is_addressable(key: Any) -> bool:
+	""" Returns True if the key can be used as part of a dot notation path. """
+	return isinstance(key, str) and key != "" and "." not in key and not key.startswith("$")
+
+def _diff(old: dict[str, Any], new: dict[str, Any], prefix: str, set_fields: dict[str, Any], unset_fields: dict[str, Any]) -> bool:
+	""" Adds the changes between old and new (embedded documents at path prefix) to set_fields and unset_fields. Returns False if the changes can't be addressed by path. """
+	# If any key at this level can't be addressed, we can't diff this level key by key
+	if not all(_is_addressable(key) for key in new) or not all(_is_addressable(key) for key in old):
+		if not prefix:
+			return False
+		if not bson_equal(old, new):
+			set_fields[prefix[:-1]] = new
+		return True
+
+	for key, value in new.items():
+		path = prefix + key
+		if key not in old:
+			set_fields[path] = value
+			continue
+
+		old_value = old[key]
+		if type(value) is dict and type(old_value) is dict:
+			_diff(old_value, value, path + ".", set_fields, unset_fields)
+		elif not bson_equal(old_value, value):
+			set_fields[path] = value
+
+	for key in old:
+		if key not in new:
+			unset_fields[prefix + key] = ""
+
+	return True
+
+def apply_update(snapshot: dict[str, Any], update: dict[str, Any]) -> bool:
+	""" Applies the $set and $inc of an update that was just written to the db to the snapshot, in place, so that it doesn't need to be reloaded.
+	Returns False if a path can't be followed (e.g. a missing embedded document or list index), in which case the snapshot is out of date and should be dropped. """
+	for operator, fields in update.items():
+		if operator not in ("$set", "$inc"):
+			return False
+		for path, value in fields.items():
+			parts = path.split(".")
+			container: Any = snapshot
+			for part in parts[:-1]:
+				container = _get_child(container, part)
+				if container is None:
+					return False
+			key = parts[-1]
+			if type(container) is list:
+				if not key.isdigit() or int(key) >= len(container):
+					return False
+				index: Any = int(key)
+			elif type(container) is dict:
+				index = key
+			else:
+				return False
+			if operator == "$set":
+				container[index] = copy_bson(value)
+			else:
+				current = container[index] if type(container) is list or index in container else 0
+				if type(current) not in (int, float):
+					return False
+				container[index] = current + value
+	return True
+
+def _get_child(container: Any, part: str) -> Any | None:
+	if type(container) is dict:
+		child = container.get(part)
+	elif type(container) is list and part.isdigit() and int(part) < len(container):
+		child = container[int(part)]
+	else:
+		return None
+	return child if type(child) in (dict, list) else None
@@ -1,6 +1,6 @@
 from datetime import datetime
-from typing import Any, Self, TypeVar, overload
-import time  # Add this import at the top
+from typing import Any, AsyncIterator, ClassVar, Iterable, Iterator, Self, TypeVar, overload
+import time
 
 from pymongo.collection import Collection
 from pymongo.typings import _Pipeline
@@ -8,7 +8,7 @@ from pymongo.database import Database
 from pymongo import ReturnDocument
 
 from ..typing.fields.field_schema import FieldSchema
-from .document_id import DocumentId
+from .document_id import DocumentId, PUBLIC
 from ..typing.bsonable_dataclass.bsonable_dataclass import BsonableDataclass
 from ..typing.fields.field_path import FieldPath
 from ..typing.fields.get_field_name import get_field_name
@@ -18,6 +18,14 @@ from ..utilities.special_values import ABSTRACT
 from .document_context import DocumentContext
 from ..utilities.logger import logger
 from ..typing.serialization.vars import __type_id__
+from .change_tracking import __db_snapshot__, apply_update, copy_bson, diff_documents
+from . import instrumentation
+from .unit_of_work import current_unit_of_work
+from .document_cache import CachePolicy
+from .query_cache import QueryCachePolicy, invalidate_queries
+from .indexes import Index
+from .partial_document import PartialDocument, ProjectedField, build_projection, from_projected_document
+from .pagination import DocumentPage, SortKey, add_sort_to_projection, build_keyset_query, decode_page_token, encode_page_token, resolve_sort
 
 
 T = TypeVar('T', bound="Document")
@@ -27,12 +35,99 @@ Validation Behavior:
 
 Both validation_func and document_validation_func will run for all fields when:
 	- updating fields directly (via the db_update_field functions) AND 
-	- when updating the entire document (validation_func will run as a result of reserialization in _validate_self() and document_validation_funcs will be run for each field in __before_saving__())
+	- when updating the entire document (validation_func will run while the document is serialized in to_document(), or as a result of reserialization in _validate_self() when __strict_validation__ is set, and document_validation_funcs will be run for each field in __before_saving__())
 So if you need to validate a field independently, you can simply define it in these functions, and they will always be enforced. (A field must be configured to allow independent updates.)
 
 If for some reaons, you need to validate at the document level, you can extend __before_saving__ for this purpose. This validation will only run when performing document-level updates.
 """
 
+def _get_exact_id(query: dict | None) -> Any | None:
+	""" Returns the _id if the query matches a single document by _id, e.g. {"_id": "..."}. """
+	if not query or len(query) != 1:
+		return None
+	_id = query.get("_id")
+	if isinstance(_id, (dict, list)): # An operator query, e.g. {"_id": {"$in": [...]}}
+		return None
+	return _id
+
+def _apply_cursor_options(cursor: Any, sort: Any, limit: int | None, skip: int | None) -> Any:
+	""" Applies the sort, limit and skip of a find_many query to a sync or async cursor. """
+	if sort:
+		cursor = cursor.sort(sort)
+	if limit:
+		cursor = cursor.limit(limit)
+	if skip:
+		cursor = cursor.skip(skip)
+	return cursor
+
+class _FoundDocuments:
+	""" Deserializes the documents of a db_find_many() / adb_find_many() query as they are read, keeping copies for instrumentation and the query cache if needed. """
+	def __init__(self, document_cls: type['Document'], projected_fields: tuple | None, cache_key: str | None) -> None:
+		self.document_cls = document_cls
+		self.projected_fields = projected_fields
+		self.cache_key = cache_key
+		self.objs: list = []
+		self.measured_documents: list | None = [] if instrumentation.is_measuring_byte_sizes() else None # Only kept around to measure their size
+		self.documents_to_cache: list | None = [] if cache_key is not None else None
+
+	def add(self, document: dict[str, Any]) -> None:
+		if self.measured_documents is not None:
+			self.measured_documents.append(copy_bson(document))
+		if self.documents_to_cache is not None:
+			self.documents_to_cache.append(copy_bson(document))
+		if self.projected_fields is not None:
+			self.objs.append(from_projected_document(self.document_cls, document, *self.projected_fields))
+		else:
+			obj = self.document_cls.from_document(document, trusted=True)
+			self.objs.append(self.document_cls._register_loaded(self.document_cls.__class_validation__(obj)))
+
+	def finish(self, query: dict, start_time: float) -> list:
+		""" Caches the result and records the query. Returns the loaded objs. """
+		document_cls = self.document_cls
+		if self.cache_key is not None and document_cls.__query_cache__ is not None:
+			document_cls.__query_cache__.set(self.cache_key, self.documents_to_cache)
+		instrumentation.record(document_cls.get_collection_name(), "find_many", start_time, document_count=len(self.objs), documents=self.measured_documents, detail=query)
+		return self.objs
+
+class _IteratedDocuments:
+	""" Deserializes the documents of a db_iter_many() / adb_iter_many() (or pipeline) cursor one at a time, recording the time spent fetching and deserializing each batch (excluding time spent by the caller). """
+	def __init__(self, document_cls: type['Document'], batch_size: int, operation: str, detail: Any, *, keep_snapshot: bool, trusted: bool, projected_fields: tuple | None) -> None:
+		self.document_cls = document_cls
+		self.batch_size = batch_size
+		self.operation = operation
+		self.detail = detail
+		self.keep_snapshot = keep_snapshot
+		self.trusted = trusted
+		self.projected_fields = projected_fields
+		self.batch_count = 0
+		self.batch_time = 0.0
+
+	def load(self, document: dict[str, Any], start_time: float) -> Any:
+		""" Deserializes a document that started being fetched at start_time. """
+		document_cls = self.document_cls
+		if self.projected_fields is not None:
+			obj: Any = from_projected_document(document_cls, document, *self.projected_fields)
+		else:
+			obj = document_cls.from_document(document, trusted=self.trusted)
+			if not self.keep_snapshot:
+				obj._set_db_snapshot(None)
+			obj = document_cls.__class_validation__(obj)
+			if self.keep_snapshot:
+				# Objs from a pipeline may be incomplete, so they don't join the identity map
+				obj = document_cls._register_loaded(obj)
+		self.batch_time += time.perf_counter() - start_time
+		self.batch_count += 1
+		if self.batch_count == self.batch_size:
+			self.finish()
+		return obj
+
+	def finish(self) -> None:
+		""" Records the current batch, if any. """
+		if self.batch_count:
+			instrumentation.record(self.document_cls.get_collection_name(), self.operation, None, document_count=self.batch_count, detail=self.detail, duration=self.batch_time)
+			self.batch_count = 0
+			self.batch_time = 0.0
+
 class Document(BsonableDataclass):
 	""" A dataclass that implements this method can be saved to MongoDb as a document. 
 	NOTE: ** WHEN INHERITING FROM MONGOABLE YOU MUST USE PYDANTIC'S DATACLASS INSTEAD OF PYTHON'S **
@@ -43,6 +138,16 @@ class Document(BsonableDataclass):
 	# Class fields
 	__type_id__ = ABSTRACT
 	__collection_name__ = ABSTRACT
+	__strict_validation__ = False
+	""" If True, validate this document before saving by rebuilding it (to_bson() + from_bson()), which also re-runs __post_init__. Otherwise, values are validated in a single pass as the document is serialized. """
+	__track_changes__ = True
+	""" If True, keep a snapshot of the document as it was loaded/saved so that db_update_self() can send only the changed fields. Set to False to save the cost of the snapshot for documents that are rarely updated. """
+	__cache__: ClassVar[CachePolicy | None] = None
+	""" Set to a CachePolicy to cache documents loaded by _id (see document_cache.py). """
+	__query_cache__: ClassVar[QueryCachePolicy | None] = None
+	""" Set to a QueryCachePolicy to cache the results of db_find_many() and db_count_documents() (see query_cache.py). """
+	__indexes__: ClassVar[tuple[Index, ...]] = ()
+	""" Indexes created by sync_indexes(), in addition to the fields configured with index=True (see indexes.py). """
 
 	@classmethod
 	def get_collection_name(cls) -> str:
@@ -99,10 +204,20 @@ class Document(BsonableDataclass):
 		Return the document as is if valid. Raise an error if invalid. """
 		return document
 
+	@classmethod
+	def stats(cls) -> dict[str, dict[str, dict[str, Any]]]:
+		""" Returns a snapshot of the database stats recorded for this Document's collection. Empty unless instrumentation.enable_stats() was called. """
+		stats = instrumentation.get_stats(cls.get_collection_name())
+		# Command events are keyed by "<db>.<collection>"
+		command_stats = instrumentation.get_stats(f"{cls.get_db_name()}.{cls.get_collection_name()}").get("command")
+		if command_stats:
+			stats["command"] = command_stats
+		return stats
+
 	@classmethod
 	def get_references(cls) -> dict[str, type["Document"]]:
 		""" Returns the dictionary of foreign keys this Document stores as a dict of the field name -> referenced Document class. """
-		from .. import type_registry
+		from ..typing import type_registry
 		document_info = next(iter(d for d in type_registry.document_info_list if d.cls is cls))
 		return document_info.reference_fields
 
@@ -111,18 +226,32 @@ class Document(BsonableDataclass):
 	# These bson_to_obj and obj_to_bson functions THEN access the to_bson and from_bson methods defined in BsonableDataclass. See readme.
 	def to_document(self) -> dict[str, Any]:
 		from ..typing.serialization.obj_to_bson import obj_to_bson
+		from ..typing.serialization.validating_serialization import validating_serialization
 		
 		# Before converting to document...
-		# Validate that this object is still in a valid state
-		self._validate_self()
+		# In strict mode, validate that this object is still in a valid state by rebuilding it
+		strict = type(self).__strict_validation__
+		if strict:
+			self._validate_self()
 		
 		# Update the metadata for the document
+		previous_last_modified = self.__last_modified__
 		self.__last_modified__ = datetime.now().timestamp()
 		
 		# If you want to bring this back, probably put this into an env var
 		# self.__last_modified_by_app_version__ = GLOBAL_VERSION
 
-		document = obj_to_bson(self)
+		# Otherwise, validate each value as it is serialized
+		try:
+			if strict:
+				document = obj_to_bson(self)
+			else:
+				with validating_serialization():
+					document = obj_to_bson(self)
+		except Exception:
+			# Don't leave the instance marked as modified if it failed validation
+			self.__last_modified__ = previous_last_modified
+			raise
 
 		# Suppress the serialization of __collection_name__
 		if "__collection_name__" in document:
@@ -131,7 +260,9 @@ class Document(BsonableDataclass):
 		return document
 
 	@classmethod
-	def from_document(cls, document) -> Self:
+	def from_document(cls, document, *, trusted: bool = False) -> Self:
+		""" Deserializes a mongo document into this class.
+		Set trusted to True for documents read straight from the database. This builds instances without re-validating each field (see trusted_deserialization). __class_validation__ is not affected. """
 		if not isinstance(document, dict):
 			raise
 		
@@ -150,20 +281,95 @@ class Document(BsonableDataclass):
 			last_modified_by_app_id=last_modified_by_app_id
 		)
 		
+		# Snapshot the document before deserializing it (deserialization modifies the bson, and some values are shared with the obj)
+		snapshot = copy_bson(document) if cls.__track_changes__ else None
+
 		# Deserialize
 		from ..typing.serialization.bson_to_type_annotation import bson_to_type_annotation
-		obj = bson_to_type_annotation(document, cls, context)
+		if trusted:
+			from ..typing.serialization.trusted_deserialization import trusted_deserialization
+			with trusted_deserialization():
+				obj = bson_to_type_annotation(document, cls, context)
+		else:
+			obj = bson_to_type_annotation(document, cls, context)
 		if not isinstance(obj, cls):
 			raise ValueError(f"Expected document to be deserialized into {cls.__name__}. Instead, document was deserialized into {type(obj).__name__}")
+		if snapshot is not None:
+			obj._set_db_snapshot(snapshot)
 		return obj
+
+	@classmethod
+	def _register_loaded(cls, obj: Self) -> Self:
+		""" Returns the instance of obj already loaded in the current unit of work, or obj itself (see unit_of_work.py). """
+		unit = current_unit_of_work()
+		return obj if unit is None else unit.register(obj)
+
+	@classmethod
+	def _register_updated(cls, obj: Self) -> Self:
+		""" Like _register_loaded, but obj holds the latest state of the document, so any instance already loaded is updated to match it. """
+		unit = current_unit_of_work()
+		return obj if unit is None else unit.refresh(obj)
+
+	@classmethod
+	def _get_cached_document(cls, _id: Any, match_class_query: bool) -> dict[str, Any] | None:
+		""" Returns the cached document with this _id, if this class has a __cache__ (see document_cache.py). """
+		cache = cls.__cache__
+		if cache is None:
+			return None
+		document = cache.get(cls.get_collection_name(), _id)
+		if document is not None and match_class_query and any(document.get(key) != value for key, value in cls.__class_query__().items()):
+			return None
+		return document
+
+	@classmethod
+	def _cache_document(cls, document: dict[str, Any]) -> None:
+		""" Caches a document just read from the db. Call this before deserializing the document, which modifies it. """
+		if cls.__cache__ is not None:
+			cls.__cache__.set(cls.get_collection_name(), document)
+
+	@classmethod
+	def _invalidate_cached(cls, _id: Any) -> None:
+		""" Drops the cached document with this _id, and the collection's cached queries, after it was written to. """
+		if cls.__cache__ is not None:
+			cls.__cache__.invalidate(cls.get_collection_name(), _id)
+		invalidate_queries(cls.get_collection_name())
+
+	@classmethod
+	def _invalidate_queries(cls) -> None:
+		""" Drops the collection's cached queries (see query_cache.py), after documents were inserted or deleted. """
+		invalidate_queries(cls.get_collection_name())
+
+	@classmethod
+	def _get_cached_query(cls, operation: str, filter_: dict, sort: Any = None, limit: int | None = None, skip: int | None = None, projection: dict | None = None) -> tuple[str | None, Any | None]:
+		""" Returns the __query_cache__ key for the query, and the cached result if there is one. The key is None if the query isn't cached. """
+		query_cache = cls.__query_cache__
+		if query_cache is None:
+			return None, None
+		key = query_cache.key(cls.get_collection_name(), operation, filter_, sort, limit, skip, projection)
+		if key is None:
+			return None, None
+		return key, query_cache.get(cls.get_collection_name(), key)
+
+	def _set_db_snapshot(self, document: dict[str, Any] | None) -> None:
+		""" Records the document as it is stored in the db. Pass in a copy, as the snapshot must not share values with the obj. """
+		if document is None or not type(self).__track_changes__:
+			self.__dict__.pop(__db_snapshot__, None)
+		else:
+			self.__dict__[__db_snapshot__] = document # Set through __dict__ so that this also works for frozen Documents
 	# endregion
 
 	def _validate_self(self) -> None:
 		"""
-		Force revalidation instance by rebuilding the instance.
+		Force revalidation of the instance. In strict mode, this rebuilds the instance. Otherwise, it validates each value while serializing.
 		"""
-		bson = self.to_bson()
-		type(self).from_bson(bson, None)
+		from ..typing.serialization.validating_serialization import validating_serialization
+
+		if type(self).__strict_validation__:
+			bson = self.to_bson()
+			type(self).from_bson(bson, None)
+		else:
+			with validating_serialization():
+				self.to_bson()
 	
 	def __before_deleting__(self) -> bool:
 		""" Override this if you want to add validation (like referential integrity) before deleting. """
@@ -215,39 +421,78 @@ class Document(BsonableDataclass):
 
 	# DB Class Methods
 	@classmethod
-	def db_insert_one(cls, document: 'Document') -> Self:
-		""" """
-		if not isinstance(document, Document):
-			raise TypeError(f"Expected Document type, but got {type(document).__name__}")
+	def db_insert_one(cls, document: 'Document', *, reread: bool = False) -> Self:
+		""" Inserts the document and returns it. 
+		By default, the obj passed in is returned (its _id is the one stored, and its __last_modified__ and snapshot are updated by the insert). Set reread to True to load a fresh copy from the db instead. """
+		if not isinstance(document, cls):
+			raise TypeError(f"Expected {cls.__name__} type, but got {type(document).__name__}")
 		
-		document.__before_saving__(UpdateMethod.INSERT)
-		bson_doc = document.to_bson()
-		result = cls.get_collection().insert_one(bson_doc)
+		document.db_insert_self()
 		
-		# Retrieve the inserted document to ensure we have the correct state
-		inserted_doc = cls.db_require_one_by_id(result.inserted_id)
-		return inserted_doc
+		if reread:
+			# Retrieve the inserted document to ensure we have the correct state
+			return cls.db_require_one_by_id(document._id)
+		return document
 
 	# Retrieval
+	@overload
 	@classmethod
 	def db_find_one(cls, query: dict | None = None) -> Self | None:
-		""" Query the database and return the first matching document as a Python object. Returns None if there are no matching documents. """
-		
-		start_time = time.time()
-		
-		if query is None:
-			query = {}
+		...
+
+	@overload
+	@classmethod
+	def db_find_one(cls, query: dict | None = None, *, fields: tuple[ProjectedField, ...]) -> PartialDocument[Self] | None:
+		...
+
+	@classmethod
+	def db_find_one(cls, query: dict | None = None, *, fields: tuple[ProjectedField, ...] | None = None) -> Self | PartialDocument[Self] | None:
+		""" Query the database and return the first matching document as a Python object. Returns None if there are no matching documents. 
+		If fields are specified, only those fields are loaded and a read-only PartialDocument is returned (see partial_document.py). """
+		start_time = time.perf_counter()
+		loaded_obj, document, filter_, projection, projected_fields, _id = cls._prepare_find_one(query, fields)
+		if loaded_obj is not None:
+			return loaded_obj
 		
-		document = cls.get_collection().find_one(cls.__class_query__() | query)
+		fetched = document is None
+		if fetched:
+			document = cls.get_collection().find_one(filter_, projection=projection)
+		return cls._finish_find_one(document, query, _id, projected_fields, start_time, fetched)
+
+	@classmethod
+	def _prepare_find_one(cls, query: dict | None, fields: tuple[ProjectedField, ...] | None) -> tuple[Self | None, dict[str, Any] | None, dict, dict | None, tuple | None, Any]:
+		""" Returns the instance already loaded in this unit of work (see unit_of_work.py) or the cached document, if the query is by _id,
+		along with the filter and projection to query with, the projected fields (if any) to build a PartialDocument with, and the _id. """
+		if fields is not None:
+			projection, top_level_fields, nested_fields = build_projection(cls, fields)
+			return None, None, cls.__class_query__() | (query or {}), projection, (top_level_fields, nested_fields), None
 		
-		print(f"Database Usage Logging: Retrieved document of type '{cls.__name__}' for query: {query} in {(time.time() - start_time):.3f} seconds")
+		_id = _get_exact_id(query)
+		if _id is None:
+			return None, None, cls.__class_query__() | (query or {}), None, None, None
+		unit = current_unit_of_work()
+		if unit is not None:
+			loaded_obj = unit.get(cls, _id)
+			if loaded_obj is not None:
+				return loaded_obj, None, {}, None, None, _id
+		return None, cls._get_cached_document(_id, match_class_query=True), cls.__class_query__() | (query or {}), None, None, _id
+
+	@classmethod
+	def _finish_find_one(cls, document: dict[str, Any] | None, query: dict | None, _id: Any, projected_fields: tuple | None, start_time: float, fetched: bool) -> Self | PartialDocument[Self] | None:
+		""" Deserializes the document found by db_find_one() / adb_find_one(). If it was fetched from mongo (rather than the cache), caches and records it first. """
+		if fetched:
+			if document and _id is not None:
+				cls._cache_document(document)
+			instrumentation.record(cls.get_collection_name(), "find_one", start_time, document_count=1 if document else 0, documents=(document,) if document else (), detail=query or {})
 		
 		if not document:
 			return None
+		elif projected_fields is not None:
+			return from_projected_document(cls, document, *projected_fields)
 		else:
-			obj = cls.from_document(document)
+			obj = cls.from_document(document, trusted=True)
 			cls.__class_validation__(obj)
-			return obj
+			return cls._register_loaded(obj)
 		
 	@classmethod
 	def db_require_one(cls, query: dict | None = None) -> Self:
@@ -262,32 +507,70 @@ class Document(BsonableDataclass):
 	@classmethod
 	def db_require_one_by_id(cls, _id: str) -> Self:
 		""" Return one by id. Raises error if not found """
-		query = { "_id": _id } # Assuming that _id is globally unique, we don't need to add the type query here
-		document = cls.get_collection().find_one(query)
+		unit = current_unit_of_work()
+		if unit is not None:
+			loaded_obj = unit.get(cls, _id)
+			if loaded_obj is not None:
+				return loaded_obj
+		
+		document = cls._get_cached_document(_id, match_class_query=False)
+		if document is None:
+			start_time = time.perf_counter()
+			query = { "_id": _id } # Assuming that _id is globally unique, we don't need to add the type query here
+			document = cls.get_collection().find_one(query)
+			if document:
+				cls._cache_document(document)
+			instrumentation.record(cls.get_collection_name(), "find_one", start_time, document_count=1 if document else 0, documents=(document,) if document else (), detail=query)
 		if not document:
 			raise ValueError(f"No {cls.__name__} found with _id {_id}.")
 		else:
 			obj = cls.from_document(document)
 			if not isinstance(obj, cls): raise
-			return cls.__class_validation__(obj)
+			return cls._register_loaded(cls.__class_validation__(obj))
 
 	@classmethod
 	def db_find_one_and_update(cls, filter: dict, update: dict, return_after_update: bool) -> Self | None:
 		""" Find a single document and update it, returning either the original or the updated document. """
 
 		return_option = ReturnDocument.AFTER if return_after_update else ReturnDocument.BEFORE
+		cls._flush_pending_writes(filter)
 
+		start_time = time.perf_counter()
 		document = cls.get_collection().find_one_and_update(
 			filter=cls.__class_query__() | filter,
 			update=update,
 			return_document=return_option
 		)
+		instrumentation.record(cls.get_collection_name(), "find_one_and_update", start_time, document_count=1 if document else 0, documents=(document,) if document else (), detail=filter)
 
 		if document:
-			obj = cls.from_document(document)
-			return cls.__class_validation__(obj)
+			cls._invalidate_cached(document["_id"])
+			obj = cls.__class_validation__(cls.from_document(document))
+			if return_after_update:
+				return cls._register_updated(obj)
+			# Any instance loaded earlier in this unit of work is now out of date
+			unit = current_unit_of_work()
+			if unit is not None:
+				unit.forget(cls, obj._id)
+			return obj
 		return None
 
+	@classmethod
+	def _flush_pending_writes(cls, filter: dict) -> None:
+		""" Flushes the unit of work before a write that returns the new state of the document, if a write is queued for a document it may match.
+		Otherwise the queued write would be sent after this one (overwriting it), and refreshing the loaded instance would drop its unsaved changes. """
+		unit = current_unit_of_work()
+		if unit is None:
+			return
+		_id = _get_exact_id(filter)
+		if _id is not None:
+			obj = unit.get(cls, _id)
+			pending = obj is not None and unit.has_pending_write(obj)
+		else:
+			pending = unit.has_pending_writes(cls.get_collection_name())
+		if pending:
+			unit.flush()
+
 	@classmethod
 	def db_replace_one(cls, filter: dict, replacement: Self, upsert: bool = False) -> Self | None:
 		""" Atomically replace a single document matching the filter with the replacement document.
@@ -303,55 +586,201 @@ class Document(BsonableDataclass):
 		# Run before_saving hooks and validation
 		replacement.__before_saving__(UpdateMethod.UPDATE)
 		replacement = cls.__class_validation__(replacement)
+		cls._flush_pending_writes(filter)
 		
+		start_time = time.perf_counter()
 		document = cls.get_collection().find_one_and_replace(
 			filter=cls.__class_query__() | filter,
 			replacement=replacement.to_document(),
 			return_document=ReturnDocument.AFTER,
 			upsert=upsert
 		)
+		instrumentation.record(cls.get_collection_name(), "replace_one", start_time, document_count=1 if document else 0, documents=(document,) if document else (), detail=filter)
 
 		if document:
+			cls._invalidate_cached(document["_id"])
 			obj = cls.from_document(document)
-			return cls.__class_validation__(obj)
+			return cls._register_updated(cls.__class_validation__(obj))
 		return None
 
 	@classmethod
 	def db_from_pipeline(cls, pipeline: _Pipeline) -> list[Self]:
 		""" Returns a list of objs based on the pipeline. Note that the pipeline MUST produce bson that matches this class's expected bson format. """
+		start_time = time.perf_counter()
 		cursor = cls.get_collection().aggregate(pipeline)
 		
 		objs: list[Self] = []
 		for document in cursor:
-			obj = cls.from_document(document)
+			obj = cls.from_document(document) # The pipeline may have produced anything, so validate it
 			objs.append(cls.__class_validation__(obj))
+		instrumentation.record(cls.get_collection_name(), "from_pipeline", start_time, document_count=len(objs), detail=pipeline)
 		return objs
 
+	@overload
 	@classmethod
 	def db_find_many(cls, query: dict, sort: dict | None = None, limit: int | None = None, skip: int | None = None) -> list[Self]:
-		""" Query the database and return all matching documents as Python objects. """
-		start_time = time.time()
+		...
+
+	@overload
+	@classmethod
+	def db_find_many(cls, query: dict, sort: dict | None = None, limit: int | None = None, skip: int | None = None, *, fields: tuple[ProjectedField, ...]) -> list[PartialDocument[Self]]:
+		...
+
+	@classmethod
+	def db_find_many(cls, query: dict, sort: dict | None = None, limit: int | None = None, skip: int | None = None, *, fields: tuple[ProjectedField, ...] | None = None) -> list[Self] | list[PartialDocument[Self]]:
+		""" Query the database and return all matching documents as Python objects. 
+		If fields are specified, only those fields are loaded and read-only PartialDocuments are returned (see partial_document.py). """
+		start_time = time.perf_counter()
+		filter_, projection, projected_fields, cache_key, cached_objs = cls._prepare_find_many(query, sort, limit, skip, fields)
+		if cached_objs is not None:
+			return cached_objs
 		
-		cursor = cls.get_collection().find(cls.__class_query__() | query)
+		found = _FoundDocuments(cls, projected_fields, cache_key)
+		for document in _apply_cursor_options(cls.get_collection().find(filter_, projection=projection), sort, limit, skip):
+			found.add(document)
+		return found.finish(query, start_time)
+
+	@classmethod
+	def _prepare_find_many(cls, query: dict, sort: Any, limit: int | None, skip: int | None, fields: tuple[ProjectedField, ...] | None) -> tuple[dict, dict | None, tuple | None, str | None, list | None]:
+		""" Returns the filter and projection of a db_find_many() query, the projected fields (if any) to build PartialDocuments with, and its query cache key.
+		If the query cache holds the result, it is returned as the last item, already deserialized. """
+		if fields is not None:
+			projection, top_level_fields, nested_fields = build_projection(cls, fields)
+			projected_fields: tuple | None = (top_level_fields, nested_fields)
+		else:
+			projection = None
+			projected_fields = None
+		
+		filter_ = cls.__class_query__() | query
+		cache_key, cached_documents = cls._get_cached_query("find_many", filter_, sort, limit, skip, projection)
+		cached_objs = cls._from_found_documents(cached_documents, projected_fields) if cached_documents is not None else None
+		return filter_, projection, projected_fields, cache_key, cached_objs
+
+	@classmethod
+	def _from_found_documents(cls, documents: Iterable[dict[str, Any]], projected_fields: tuple | None) -> list:
+		""" Deserializes found documents, into PartialDocuments if projected_fields (the top-level and nested fields from build_projection()) are passed in. """
+		if projected_fields is not None:
+			return [from_projected_document(cls, document, *projected_fields) for document in documents]
+		return [cls._register_loaded(cls.__class_validation__(cls.from_document(document, trusted=True))) for document in documents]
+
+	@overload
+	@classmethod
+	def db_find_page(cls, query: dict, sort: tuple[SortKey, ...], page_size: int, after: str | None = None) -> DocumentPage[Self]:
+		...
+
+	@overload
+	@classmethod
+	def db_find_page(cls, query: dict, sort: tuple[SortKey, ...], page_size: int, after: str | None = None, *, fields: tuple[ProjectedField, ...]) -> DocumentPage[PartialDocument[Self]]:
+		...
+
+	@classmethod
+	def db_find_page(cls, query: dict, sort: tuple[SortKey, ...], page_size: int, after: str | None = None, *, fields: tuple[ProjectedField, ...] | None = None) -> DocumentPage[Self] | DocumentPage[PartialDocument[Self]]:
+		""" Returns a page of matching documents in the sort order, continuing after the page token if one is passed in (see pagination.py).
+		Unlike skip, each page only reads page_size documents, given an index on the query fields followed by the sort fields. """
+		start_time = time.perf_counter()
+		filter_, resolved_sort, projection, projected_fields = cls._prepare_find_page(query, sort, page_size, after, fields)
+		
+		cursor = cls.get_collection().find(filter_, projection=projection).sort(resolved_sort).limit(page_size + 1) # One extra to tell whether there's a next page
+		documents = list(cursor)
+		measured_documents = [copy_bson(document) for document in documents] if instrumentation.is_measuring_byte_sizes() else None
+		page = cls._build_page(documents, resolved_sort, page_size, projected_fields)
+		instrumentation.record(cls.get_collection_name(), "find_page", start_time, document_count=len(page.objs), documents=measured_documents, detail=query)
+		return page
+
+	@classmethod
+	def _prepare_find_page(cls, query: dict, sort: tuple[SortKey, ...], page_size: int, after: str | None, fields: tuple[ProjectedField, ...] | None) -> tuple[dict, list[tuple[str, int]], dict | None, tuple | None]:
+		""" Returns the filter, sort and projection of a db_find_page() query, along with the projected fields (if any) to build PartialDocuments with. """
+		if page_size <= 0:
+			raise ValueError(f"page_size must be positive. Instead received {page_size}.")
+		resolved_sort = resolve_sort(cls, sort)
+		
+		filter_ = cls.__class_query__() | query
+		if after is not None:
+			filter_ = { "$and": [filter_, build_keyset_query(resolved_sort, decode_page_token(resolved_sort, after))] }
+		
+		if fields is not None:
+			projection, top_level_fields, nested_fields = build_projection(cls, fields)
+			return filter_, resolved_sort, add_sort_to_projection(projection, resolved_sort), (top_level_fields, nested_fields)
+		return filter_, resolved_sort, None, None
+
+	@classmethod
+	def _build_page(cls, documents: list[dict[str, Any]], resolved_sort: list[tuple[str, int]], page_size: int, projected_fields: tuple | None) -> DocumentPage:
+		""" Deserializes up to page_size documents, and builds the next page token if there were more. """
+		# Build the token before deserializing, which may modify the documents
+		next_token = encode_page_token(resolved_sort, documents[page_size - 1]) if len(documents) > page_size else None
+		return DocumentPage(cls._from_found_documents(documents[:page_size], projected_fields), next_token)
+
+	@overload
+	@classmethod
+	def db_iter_many(cls, query: dict, sort: dict | None = None, batch_size: int = 100) -> Iterator[Self]:
+		...
+
+	@overload
+	@classmethod
+	def db_iter_many(cls, query: dict, sort: dict | None = None, batch_size: int = 100, *, fields: tuple[ProjectedField, ...]) -> Iterator[PartialDocument[Self]]:
+		...
+
+	@classmethod
+	def db_iter_many(cls, query: dict, sort: dict | None = None, batch_size: int = 100, *, fields: tuple[ProjectedField, ...] | None = None) -> Iterator[Self] | Iterator[PartialDocument[Self]]:
+		""" Query the database and lazily yield matching documents as Python objects, deserializing one cursor batch at a time. Use this instead of db_find_many for large result sets.
+		If fields are specified, only those fields are loaded and read-only PartialDocuments are yielded (see partial_document.py), so that an incomplete obj can never be saved. """
+		filter_, projection, projected_fields = cls._prepare_iter_many(query, fields)
+		cursor = cls.get_collection().find(filter_, projection=projection, batch_size=batch_size)
 		if sort:
 			cursor = cursor.sort(sort)
-		if limit:
-			cursor = cursor.limit(limit)
-		if skip:
-			cursor.skip(skip)
+		
+		return cls._iter_cursor(cursor, batch_size, "iter_many", query, projected_fields=projected_fields)
 
-		objs: list[Self] = []
-		for document in cursor:
-			obj = cls.from_document(document)
-			objs.append(cls.__class_validation__(obj))
+	@classmethod
+	def _prepare_iter_many(cls, query: dict, fields: tuple[ProjectedField, ...] | None) -> tuple[dict, dict | None, tuple | None]:
+		""" Returns the filter and projection db_iter_many() / adb_iter_many() query with, and the projected fields (if any) to build PartialDocuments with. """
+		if fields is None:
+			return cls.__class_query__() | query, None, None
+		projection, top_level_fields, nested_fields = build_projection(cls, fields)
+		return cls.__class_query__() | query, projection, (top_level_fields, nested_fields)
+
+	@classmethod
+	def db_iter_from_pipeline(cls, pipeline: _Pipeline, batch_size: int = 100) -> Iterator[Self]:
+		""" Streaming version of db_from_pipeline. Note that the pipeline MUST produce bson that matches this class's expected bson format. """
+		cursor = cls.get_collection().aggregate(pipeline, batchSize=batch_size)
 		
-		print(f"Database Usage Logging: Retrieved {len(objs)} documents of type '{cls.__name__}' for query: {query} in {(time.time() - start_time):.3f} seconds")
-		return objs
+		# The pipeline may reshape documents, so validate them and don't keep a snapshot
+		return cls._iter_cursor(cursor, batch_size, "iter_from_pipeline", pipeline, keep_snapshot=False, trusted=False)
+
+	@classmethod
+	def _iter_cursor(cls, cursor: Iterable[dict[str, Any]], batch_size: int, operation: str, detail: Any, *, keep_snapshot: bool = True, trusted: bool = True, projected_fields: tuple | None = None) -> Iterator[Any]:
+		""" Deserializes documents from the cursor as they are consumed, recording the time spent fetching and deserializing each batch (excluding time spent by the caller).
+		Set trusted to False for documents that weren't read straight from the collection (see from_document).
+		If projected_fields (the top-level and nested fields from build_projection()) are passed in, PartialDocuments are yielded instead. """
+		iterated = _IteratedDocuments(cls, batch_size, operation, detail, keep_snapshot=keep_snapshot, trusted=trusted, projected_fields=projected_fields)
+		documents = iter(cursor)
+		try:
+			while True:
+				start_time = time.perf_counter()
+				document = next(documents, None)
+				if document is None:
+					break
+				yield iterated.load(document, start_time)
+			iterated.finish()
+		finally:
+			# Release the server-side cursor if the caller stops iterating early
+			close = getattr(cursor, "close", None)
+			if close is not None:
+				close()
 
 	@classmethod
 	def db_count_documents(cls, query: dict) -> int:
 		""" Return the total number of documents that match the query. """
-		return cls.get_collection().count_documents(cls.__class_query__() | query)
+		start_time = time.perf_counter()
+		filter_ = cls.__class_query__() | query
+		cache_key, cached_count = cls._get_cached_query("count_documents", filter_)
+		if cached_count is not None:
+			return cached_count
+		count = cls.get_collection().count_documents(filter_)
+		if cache_key is not None and cls.__query_cache__ is not None:
+			cls.__query_cache__.set(cache_key, count)
+		instrumentation.record(cls.get_collection_name(), "count_documents", start_time, detail=query)
+		return count
 
 	@classmethod
 	def db_delete_one(cls, query: dict[str, Any]) -> None:
@@ -367,60 +796,245 @@ class Document(BsonableDataclass):
 		""" Delete all objects matching the query from the Mongo database. """		
 		# TODO: Implement referential integrity checks
 		# Delete all objects matching the query from the Mongo database
+		start_time = time.perf_counter()
 		result = cls.get_collection().delete_many(cls.__class_query__() | query) # Add class query to query
+		if result.deleted_count:
+			if cls.__cache__ is not None:
+				cls.__cache__.invalidate_all() # We don't know which _ids were deleted
+			cls._invalidate_queries()
+		instrumentation.record(cls.get_collection_name(), "delete_many", start_time, document_count=result.deleted_count, detail=query)
 		return result.deleted_count
 
 	@classmethod
-	def db_insert_many(cls, objs: list[Self]) -> None:
-		""" Insert multiple objects into the Mongo database. """
-		if not objs:
-			return
+	def db_insert_many(cls, objs: list[Self], *, ordered: bool = True, chunk_size: int = 1000) -> None:
+		""" Insert multiple objects into the Mongo database. 
+		All objs are validated and serialized before anything is written, so an invalid obj stops the insert without inserting the others.
+		The documents are then sent chunk_size at a time, to bound the size of each request for large batches. 
+		If ordered is False, mongo keeps inserting the rest of the objs after one fails (e.g. with a duplicate _id), and may insert them in any order. 
+		Either way, a BulkWriteError is raised at the end of the chunk that failed, and later chunks are not sent. """
+		from pymongo.errors import BulkWriteError
+		
+		documents = cls._prepare_insert_many(objs, chunk_size)
+		for chunk_start in range(0, len(objs), chunk_size):
+			start_time = time.perf_counter()
+			chunk = objs[chunk_start:chunk_start + chunk_size]
+			chunk_documents = documents[chunk_start:chunk_start + chunk_size]
+			
+			try:
+				cls.get_collection().insert_many(chunk_documents, ordered=ordered)
+			except BulkWriteError as e:
+				cls._invalidate_queries() # The documents before the error were inserted
+				cls._snapshot_inserted(chunk, chunk_documents, e, ordered)
+				raise
+			
+			cls._invalidate_queries()
+			for obj, document in zip(chunk, chunk_documents):
+				obj._set_db_snapshot(copy_bson(document))
 			
+			instrumentation.record(cls.get_collection_name(), "insert_many", start_time, document_count=len(chunk_documents), documents=chunk_documents)
+
+	@classmethod
+	def _prepare_insert_many(cls, objs: list[Self], chunk_size: int) -> list[dict[str, Any]]:
+		""" Validates and serializes every obj for db_insert_many() / adb_insert_many(), before any of them is written. """
+		if chunk_size <= 0:
+			raise ValueError(f"chunk_size must be positive. Instead received {chunk_size}.")
 		documents = []
 		for obj in objs:
 			obj.__before_saving__(UpdateMethod.INSERT)
-			document = cls.__class_validation__(obj).to_document()
-			documents.append(document)
-			
-		cls.get_collection().insert_many(documents)
+			documents.append(cls.__class_validation__(obj).to_document())
+		return documents
+
+	@staticmethod
+	def _snapshot_inserted(chunk: list['Document'], chunk_documents: list[dict[str, Any]], error: Any, ordered: bool) -> None:
+		""" Snapshots the objs of a chunk that were inserted before insert_many raised the BulkWriteError. """
+		failed_indexes = { write_error["index"] for write_error in error.details.get("writeErrors", []) }
+		if ordered:
+			first_failed_index = min(failed_indexes, default=len(chunk_documents))
+			failed_indexes = set(range(first_failed_index, len(chunk_documents)))
+		for index, (obj, document) in enumerate(zip(chunk, chunk_documents)):
+			if index not in failed_indexes:
+				obj._set_db_snapshot(copy_bson(document))
 
 	# DB Instance Methods
 	def db_insert_self(self) -> None:
 		""" Insert this object into the Mongo database. 
 		You may optionally specify an _id field.
 		"""
+		start_time = time.perf_counter()
 		self.__before_saving__(UpdateMethod.INSERT)
+		
+		# In a unit of work, queue the insert (see unit_of_work.py)
+		unit = current_unit_of_work()
+		if unit is not None and unit.defer_writes:
+			type(self).__class_validation__(self)
+			unit.defer_insert(self)
+			return
+		
 		document = type(self).__class_validation__(self).to_document()
 		type(self).get_collection().insert_one(document)
+		type(self)._invalidate_queries()
+		self._set_db_snapshot(copy_bson(document))
+		instrumentation.record(type(self).get_collection_name(), "insert_self", start_time, document_count=1, documents=(document,), detail=self._id)
 
 	def db_upsert_self(self) -> None:
-		# Do not add __before_saving__ here, as db_insert and db_update should do that
-		existing_obj = self.db_find_one({"_id": self._id}) # Assuming that _id's are globally unique, you don't need to add the type query here.
-		if existing_obj is None:
-			type(self).__class_validation__(self).db_insert_self()
+		""" Inserts this object, or replaces the stored document if one with this _id exists. 
+		__before_saving__ runs with the UpdateMethod that actually applies. If this class's INSERT and UPDATE hooks are the same, that doesn't need to be known in advance, so this is a single replace_one(upsert=True).
+		Otherwise we guess (UPDATE if this obj was loaded from the db, INSERT if not), and only make a second round trip if the guess was wrong. """
+		unit = current_unit_of_work()
+		if unit is not None and unit.is_pending_insert(self):
+			return # The queued insert will save the latest state
+		if unit is not None and unit.has_pending_write(self):
+			unit.flush() # Send the queued update first, so that it isn't sent again after this write
+		
+		if not type(self)._has_method_specific_saving_hooks():
+			self.__before_saving__(UpdateMethod.UPDATE) # Same as UpdateMethod.INSERT for this class
+			self._db_replace_self(upsert=True)
+		elif self.__dict__.get(__db_snapshot__) is not None:
+			self.__before_saving__(UpdateMethod.UPDATE)
+			if not self._db_replace_self(upsert=False):
+				self.db_insert_self() # The document was deleted since we loaded it
 		else:
-			type(self).__class_validation__(self).db_update_self()
+			self.__before_saving__(UpdateMethod.INSERT)
+			if not self._db_insert_self_if_missing():
+				self.db_update_self()
+
+	@classmethod
+	def _has_method_specific_saving_hooks(cls) -> bool:
+		""" Returns True if __before_saving__ may behave differently for UpdateMethod.INSERT and UpdateMethod.UPDATE. """
+		if cls.__before_saving__ is not Document.__before_saving__:
+			return True
+		for field_schema in cls.__bsonable_fields__.values():
+			schema_config = field_schema.schema_config
+			if isinstance(schema_config, _DocumentSchemaConfig) and (schema_config.document_insertion_validation_func or schema_config.document_update_validation_func):
+				return True
+		return False
+
+	def _db_replace_self(self, upsert: bool) -> bool:
+		""" Replaces the stored document with this object, incrementing its version. Returns False if there was no document to replace (and upsert is False). 
+		The filter includes the __class_query__, so upserting never overwrites a document of another type with the same _id (the insert fails instead). """
+		start_time = time.perf_counter()
+		
+		previous_version = self.__version__
+		self.__version__ = previous_version + 1
+		try:
+			document = type(self).__class_validation__(self).to_document()
+		except Exception:
+			self.__version__ = previous_version
+			raise
+		
+		result = type(self).get_collection().replace_one(type(self).__class_query__() | {"_id": self._id}, document, upsert=upsert) # type: ignore
+		type(self)._invalidate_cached(self._id)
+		if result.matched_count == 0 and result.upserted_id is None:
+			self.__version__ = previous_version
+			return False
+		
+		self._set_db_snapshot(copy_bson(document))
+		instrumentation.record(type(self).get_collection_name(), "insert_self (upsert)" if result.upserted_id is not None else "update_self (replace)", start_time, document_count=1, documents=(document,), detail=self._id)
+		return True
+
+	def _db_insert_self_if_missing(self) -> bool:
+		""" Inserts this object unless a document with its _id exists, in a single round trip. Returns False if the document exists. """
+		start_time = time.perf_counter()
+		
+		document = type(self).__class_validation__(self).to_document()
+		insert_fields = { key: value for key, value in document.items() if key != "_id" } # The _id comes from the filter
+		result = type(self).get_collection().update_one(type(self).__class_query__() | {"_id": self._id}, {"$setOnInsert": insert_fields}, upsert=True) # type: ignore
+		if result.upserted_id is None:
+			return False
+		
+		type(self)._invalidate_queries()
+		self._set_db_snapshot(copy_bson(document))
+		instrumentation.record(type(self).get_collection_name(), "insert_self (upsert)", start_time, document_count=1, documents=(document,), detail=self._id)
+		return True
 
 	def db_update_self(self) -> None:
-		""" Persist the changes to the database. """
-		start_time = time.time()
+		""" Persist the changes to the database. 
+		If we have a snapshot of the document as it is stored in the db (see __track_changes__), only the changed fields are sent. Otherwise, the document is replaced. """
+		start_time = time.perf_counter()
 		
 		# Validate before updating
 		self.__before_saving__(UpdateMethod.UPDATE)
-		# If this was a retrieved object, replace the existing db object with this one
-		document = type(self).__class_validation__(self).to_document()
-		result = type(self).get_collection().replace_one({"_id": self._id}, document) # type: ignore
-		if result.matched_count != 1:
+		
+		# In a unit of work, queue the update. Repeated updates of the same obj are sent once, when the unit of work is flushed (see unit_of_work.py)
+		unit = current_unit_of_work()
+		if unit is not None and unit.defer_writes:
+			type(self).__class_validation__(self)
+			unit.defer_update(self)
+			return
+		
+		previous_version = self.__version__
+		document, update = self._prepare_update()
+		if update is not None:
+			result = type(self).get_collection().update_one({"_id": self._id}, update) # type: ignore
+		else:
+			# If this was a retrieved object, replace the existing db object with this one
+			result = type(self).get_collection().replace_one({"_id": self._id}, document) # type: ignore
+		self._finish_update(result.matched_count, document, update, previous_version, start_time)
+
+	def _finish_update(self, matched_count: int, document: dict[str, Any], update: dict[str, Any] | None, previous_version: int, start_time: float) -> None:
+		""" Checks the result of an update sent by db_update_self() or adb_update_self(), and records the new state of the document. """
+		type(self)._invalidate_cached(self._id)
+		if matched_count != 1:
+			self.__version__ = previous_version
 			raise ValueError(f"Error replacing the document. Are you sure a document with this _id {self._id} already exists?")
 		
-		print(f"Database Usage Logging: Updated document of type '{type(self).__name__}' with _id: {self._id} in {(time.time() - start_time):.3f} seconds")
+		self._set_db_snapshot(copy_bson(document))
+		
+		if update is not None:
+			instrumentation.record(type(self).get_collection_name(), "update_self", start_time, document_count=1, documents=(update,), detail=self._id)
+		else:
+			instrumentation.record(type(self).get_collection_name(), "update_self (replace)", start_time, document_count=1, documents=(document,), detail=self._id)
+
+	def _prepare_update(self) -> tuple[dict[str, Any], dict[str, Any] | None]:
+		""" Increments the document version and serializes self. Returns the document, along with the update to send instead of replacing the document (see _get_update_from_snapshot). """
+		previous_version = self.__version__
+		self.__version__ = previous_version + 1
+		try:
+			document = type(self).__class_validation__(self).to_document()
+		except Exception:
+			self.__version__ = previous_version
+			raise
+		return document, self._get_update_from_snapshot(document)
+
+	def _get_update_from_snapshot(self, document: dict[str, Any]) -> dict[str, Any] | None:
+		""" Returns a $set / $unset update that turns the snapshot into the document, incrementing __version__. Returns None if there is no snapshot or the changes can't be expressed as an update. """
+		snapshot = self.__dict__.get(__db_snapshot__)
+		if snapshot is None or snapshot.get("_id") != document.get("_id"):
+			return None
+		
+		diff = diff_documents(snapshot, document)
+		if diff is None:
+			return None
+		set_fields, unset_fields = diff
+		
+		# The version is incremented in the db rather than set, and can't also appear in $set
+		version_field_name = get_field_name(Document.__version__)
+		set_fields.pop(version_field_name, None)
+		unset_fields.pop(version_field_name, None)
+		
+		update: dict[str, Any] = { "$inc": { version_field_name: 1 } }
+		if set_fields:
+			update["$set"] = set_fields
+		if unset_fields:
+			update["$unset"] = unset_fields
+		return update
 
 	def db_delete_self(self) -> None:
 		""" Delete this object from the Mongo database. """		
 		if not self.__before_deleting__():
 			raise ValueError("Can't delete this object because it is referenced by another.")
 		
+		unit = current_unit_of_work()
+		if unit is not None:
+			was_pending_insert = unit.is_pending_insert(self)
+			unit.evict(self)
+			if was_pending_insert:
+				return # Never written to the db
+		
+		start_time = time.perf_counter()
 		result = type(self).get_collection().delete_one(type(self).__class_query__() | {"_id": self._id}) # type: ignore
+		type(self)._invalidate_cached(self._id)
+		instrumentation.record(type(self).get_collection_name(), "delete_self", start_time, document_count=result.deleted_count, detail=self._id)
 		if result.deleted_count != 1:
 			raise ValueError("Error deleting the document. Are you sure a document with this _id exists?")
 
@@ -435,10 +1049,8 @@ class Document(BsonableDataclass):
 
 	def db_update_self_field(self, field_path: tuple[FieldSchema | Any, ...] | FieldPath, new_value: Any) -> None:
 		""" Updates the specified field in the database and within the local Document obj. 
-		Pass in a Python object for field value, NOT bson. """
-		from ..typing.fields.field_pointer import DocumentFieldPointer
-		from ..typing.serialization.obj_to_bson import obj_to_bson
-		
+		Pass in a Python object for field value, NOT bson.
+		The field is written with a single update_one, and the local obj is patched rather than reloaded, so it doesn't pick up changes others made to the document since it was loaded. """
 		# Run class validation on self
 		self = type(self).__class_validation__(self)
 		
@@ -450,54 +1062,115 @@ class Document(BsonableDataclass):
 		else:
 			raise ValueError
 		
-		# Validate that we can update this field
-		field_schema = field_path.field_schema()
-		if not isinstance(field_schema.schema_config, _DocumentSchemaConfig):
-			raise ValueError(f"Field '{field_schema.field_name}' is not configured with DocumentFieldSchema. Attempted field access: {self}.")
-		
-		# Verify that this field is allowed to be edited directly
-		if not field_schema.schema_config.allow_independent_update:
-			raise ValueError(f"The field '{field_schema.field_name}' within class '{type(self).__name__}' is not indepdendently updateable.")
+		if not type(self)._update_fields(self._id, {field_path: new_value}, obj=self):
+			raise ValueError("Failed to update document. No matching document found or update operation failed.")
+
+	def db_update_self_fields(self, updates: dict[FieldPath, Any]) -> None:
+		""" Updates several independently updateable fields of this document in a single update_one (with a single __version__ increment), and within the local Document obj.
+		Every value is validated before anything is written. Pass in Python objects for the values, NOT bson. """
+		self = type(self).__class_validation__(self)
 		
-		# 1. Validate the field value against the field schema
-		field_schema.type_expectation.validate(new_value, None)
-		# 2. Run the dataclass field validation func, if defined
-		if field_schema.schema_config.validation_func:
-			field_schema.schema_config.validation_func(new_value)
-		# 3. Run the document field validation func, if defined
-		if field_schema.schema_config.document_update_validation_func:
-			# Always pass in a pointer to the field itself, along with the new value. This way the document field validation function can lookup its own document if needed, and has context about its relationship to the document.
-			field_schema.schema_config.document_update_validation_func(DocumentFieldPointer(self._id, field_path), new_value)
-		
-		# Conver to bson
-		bson = obj_to_bson(new_value)
-
-		# Get mongo field name (dot notation)
-		mongo_field_name = field_path.as_mongo_db_dot_notation()
-
-		updated_document = type(self).get_collection().find_one_and_update(
-			{"_id": self._id},
-			{
-				"$set": { 
-					mongo_field_name: bson, # Update the field value
-					get_field_name(Document.__last_modified__): datetime.now().timestamp() # Update the document's __last_modified__
-				},
-				"$inc": { "__version__": 1 }, # Increment the document version
-			},
-			return_document=ReturnDocument.AFTER
-		)
+		for field_path in updates:
+			if field_path.containing_cls() is not type(self):
+				raise ValueError("Inconsistent field path.")
 		
-		# Update the document in memory
-		if updated_document:
-			updated_obj = type(self).from_document(updated_document)
-			self.__dict__.update(updated_obj.__dict__)
-		else:
+		if not type(self)._update_fields(self._id, updates, obj=self):
 			raise ValueError("Failed to update document. No matching document found or update operation failed.")
 
 	@classmethod
 	def db_update_field(cls, document_id: DocumentId, field_path: FieldPath, new_value: Any) -> None:
 		""" Updates a single field in a document by its ID and field path. """
+		if not cls._update_fields(document_id, {field_path: new_value}):
+			raise ValueError(f"Failed to update document {document_id}. Document not found or update failed.")
+
+	@classmethod
+	def db_update_fields(cls, document_id: DocumentId, updates: dict[FieldPath, Any]) -> None:
+		""" Updates several independently updateable fields of a document in a single update_one, with a single __version__ increment.
+		Every value is validated before anything is written. """
+		if not cls._update_fields(document_id, updates):
+			raise ValueError(f"Failed to update document {document_id}. Document not found or update failed.")
+
+	@classmethod
+	def _update_fields(cls, document_id: DocumentId, updates: dict[FieldPath, Any], *, filter: dict | None = None, obj: Self | None = None) -> bool:
+		""" Validates and sets independently updateable fields with a single update_one, then patches the local obj (by default, the instance loaded in this unit of work, if any).
+		filter adds conditions the document must match, e.g. an __owner_query__(). Returns False if no document matched. """
+		update = cls._prepare_fields_update(document_id, updates)
+		return cls._send_fields_update(document_id, updates, update, filter=filter, obj=obj)
+
+	@classmethod
+	def _send_fields_update(cls, document_id: DocumentId, updates: dict[FieldPath, Any], update: dict[str, Any], *, filter: dict | None = None, obj: Self | None = None) -> bool:
+		""" Sends an update prepared by _prepare_fields_update(). See _update_fields(). """
+		start_time = time.perf_counter()
+		unit = current_unit_of_work()
+		if obj is None and unit is not None:
+			obj = unit.get(cls, document_id)
+		if obj is not None and unit is not None and unit.has_pending_write(obj):
+			unit.flush() # Send the queued write first, so that it doesn't overwrite this update
+		
+		result = cls.get_collection().update_one(cls.__class_query__() | (filter or {}) | {"_id": document_id}, update)
+		cls._invalidate_cached(document_id)
+		instrumentation.record(cls.get_collection_name(), "update_fields" if len(updates) > 1 else "update_field", start_time, document_count=result.modified_count, detail=document_id)
+		if result.matched_count == 0:
+			return False
+		
+		if obj is not None:
+			obj._apply_fields_update(updates, update)
+		return True
+
+	def _apply_fields_update(self, updates: dict[FieldPath, Any], update: dict[str, Any]) -> None:
+		""" Applies a fields update from _prepare_fields_update(), which was just written to the db, to self and its snapshot without reloading the document. """
+		try:
+			for field_path, new_value in updates.items():
+				field_path.update_instance(self, new_value)
+		except AttributeError:
+			# Frozen dataclasses along the path can't be modified in place, so reload the document instead
+			start_time = time.perf_counter()
+			document = type(self).get_collection().find_one({"_id": self._id})
+			instrumentation.record(type(self).get_collection_name(), "find_one", start_time, document_count=1 if document else 0, documents=(document,) if document else (), detail=self._id)
+			if document is None:
+				raise ValueError(f"Failed to reload document {self._id} after updating it.")
+			self.__dict__.update(type(self).from_document(document).__dict__)
+			return
+		
+		# Set through __dict__, like the snapshot
+		self.__dict__["__version__"] = self.__version__ + update["$inc"]["__version__"]
+		self.__dict__["__last_modified__"] = update["$set"]["__last_modified__"]
+		snapshot = self.__dict__.get(__db_snapshot__)
+		if snapshot is not None and not apply_update(snapshot, update):
+			self._set_db_snapshot(None) # db_update_self() will replace the document instead of diffing
+
+	@classmethod
+	def _prepare_field_update(cls, document_id: DocumentId, field_path: FieldPath, new_value: Any) -> dict[str, Any]:
+		""" Validates the new value of an independently updateable field, and returns the mongo update that sets it. """
+		return cls._prepare_fields_update(document_id, {field_path: new_value})
+
+	@classmethod
+	def _prepare_fields_update(cls, document_id: DocumentId, updates: dict[FieldPath, Any]) -> dict[str, Any]:
+		""" Validates the new values of independently updateable fields, and returns the mongo update that sets them all, with a single __version__ increment. """
+		if not updates:
+			raise ValueError("Expected at least one field to update.")
+		
+		set_fields: dict[str, Any] = {}
+		for field_path, new_value in updates.items():
+			mongo_field_name, bson = cls._validate_field_update(document_id, field_path, new_value)
+			
+			# mongo rejects an update that sets a field along with one of its subfields
+			for other_field_name in set_fields:
+				if mongo_field_name == other_field_name or mongo_field_name.startswith(other_field_name + ".") or other_field_name.startswith(mongo_field_name + "."):
+					raise ValueError(f"Can't update both '{other_field_name}' and '{mongo_field_name}' of document {document_id} at once, since they overlap.")
+			set_fields[mongo_field_name] = bson
+		
+		set_fields[get_field_name(Document.__last_modified__)] = datetime.now().timestamp()
+		return {
+			"$set": set_fields,
+			"$inc": {"__version__": 1}
+		}
+
+	@classmethod
+	def _validate_field_update(cls, document_id: DocumentId, field_path: FieldPath, new_value: Any) -> tuple[str, Any]:
+		""" Validates the new value of an independently updateable field, and returns its mongo field name (dot notation) and bson. """
 		from ..typing.fields.field_pointer import DocumentFieldPointer
+		from ..typing.serialization.obj_to_bson import obj_to_bson
 		
 		# Get the field schema
 		field_schema = field_path.field_schema()
@@ -519,29 +1192,290 @@ class Document(BsonableDataclass):
 			# Always pass in a pointer to the field itself, along with the new value. This way the document field validation function can lookup its own document if needed, and has context about its relationship to the document.
 			field_schema.schema_config.document_update_validation_func(DocumentFieldPointer(document_id, field_path), new_value)
 		
-		# Convert to BSON
-		bson = obj_to_bson(new_value)
-		
-		# Get mongo field name (dot notation)
-		mongo_field_name = field_path.as_mongo_db_dot_notation()
-		
-		# Update the document
-		updated_document = cls.get_collection().find_one_and_update(
-			{"_id": document_id},
-			{
-				"$set": {
-					mongo_field_name: bson,
-					get_field_name(Document.__last_modified__): datetime.now().timestamp()
-				},
-				"$inc": {"__version__": 1}
-			},
-			return_document=ReturnDocument.AFTER
-		)
+		# Convert to BSON, and get the mongo field name (dot notation)
+		return field_path.as_mongo_db_dot_notation(), obj_to_bson(new_value)
+
+	# region: Async
+	# Async mirrors of the db_ methods, on an AsyncMongoClient per event loop (see mongo_client.py). Serialization, hooks, caching and instrumentation are shared with the sync methods.
+	# Async reads take part in the unit of work's identity map (see unit_of_work.py), but async writes are never deferred, except for an adb_update_self() of an obj that already has a queued write.
+	@classmethod
+	def get_async_db(cls) -> Any:
+		""" NOTE: LogDocument overrides this in order to return a different db. """
+		from .mongo_db import get_async_mongo_db
+		return get_async_mongo_db()
+
+	@classmethod
+	def get_async_collection(cls) -> Any:
+		""" Returns the corresponding pymongo AsyncCollection. """
+		return cls.get_async_db()[cls.get_collection_name()]
+
+	@overload
+	@classmethod
+	async def adb_find_one(cls, query: dict | None = None) -> Self | None:
+		...
+
+	@overload
+	@classmethod
+	async def adb_find_one(cls, query: dict | None = None, *, fields: tuple[ProjectedField, ...]) -> PartialDocument[Self] | None:
+		...
+
+	@classmethod
+	async def adb_find_one(cls, query: dict | None = None, *, fields: tuple[ProjectedField, ...] | None = None) -> Self | PartialDocument[Self] | None:
+		""" Async db_find_one. """
+		start_time = time.perf_counter()
+		loaded_obj, document, filter_, projection, projected_fields, _id = cls._prepare_find_one(query, fields)
+		if loaded_obj is not None:
+			return loaded_obj
 		
-		if not updated_document:
-			raise ValueError(f"Failed to update document {document_id}. Document not found or update failed.")
+		fetched = document is None
+		if fetched:
+			document = await cls.get_async_collection().find_one(filter_, projection=projection)
+		return cls._finish_find_one(document, query, _id, projected_fields, start_time, fetched)
+
+	@classmethod
+	async def adb_require_one_by_id(cls, _id: str) -> Self:
+		""" Async db_require_one_by_id. """
+		unit = current_unit_of_work()
+		if unit is not None:
+			loaded_obj = unit.get(cls, _id)
+			if loaded_obj is not None:
+				return loaded_obj
+		
+		document = cls._get_cached_document(_id, match_class_query=False)
+		if document is None:
+			start_time = time.perf_counter()
+			document = await cls.get_async_collection().find_one({ "_id": _id })
+			if document:
+				cls._cache_document(document)
+			instrumentation.record(cls.get_collection_name(), "find_one", start_time, document_count=1 if document else 0, documents=(document,) if document else (), detail=_id)
+		if not document:
+			raise ValueError(f"No {cls.__name__} found with _id {_id}.")
+		obj = cls.from_document(document)
+		return cls._register_loaded(cls.__class_validation__(obj))
+
+	@overload
+	@classmethod
+	async def adb_find_many(cls, query: dict, sort: dict | None = None, limit: int | None = None, skip: int | None = None) -> list[Self]:
+		...
+
+	@overload
+	@classmethod
+	async def adb_find_many(cls, query: dict, sort: dict | None = None, limit: int | None = None, skip: int | None = None, *, fields: tuple[ProjectedField, ...]) -> list[PartialDocument[Self]]:
+		...
+
+	@classmethod
+	async def adb_find_many(cls, query: dict, sort: dict | None = None, limit: int | None = None, skip: int | None = None, *, fields: tuple[ProjectedField, ...] | None = None) -> list[Self] | list[PartialDocument[Self]]:
+		""" Async db_find_many. """
+		start_time = time.perf_counter()
+		filter_, projection, projected_fields, cache_key, cached_objs = cls._prepare_find_many(query, sort, limit, skip, fields)
+		if cached_objs is not None:
+			return cached_objs
+		
+		found = _FoundDocuments(cls, projected_fields, cache_key)
+		async for document in _apply_cursor_options(cls.get_async_collection().find(filter_, projection=projection), sort, limit, skip):
+			found.add(document)
+		return found.finish(query, start_time)
+
+	@overload
+	@classmethod
+	async def adb_find_page(cls, query: dict, sort: tuple[SortKey, ...], page_size: int, after: str | None = None) -> DocumentPage[Self]:
+		...
+
+	@overload
+	@classmethod
+	async def adb_find_page(cls, query: dict, sort: tuple[SortKey, ...], page_size: int, after: str | None = None, *, fields: tuple[ProjectedField, ...]) -> DocumentPage[PartialDocument[Self]]:
+		...
+
+	@classmethod
+	async def adb_find_page(cls, query: dict, sort: tuple[SortKey, ...], page_size: int, after: str | None = None, *, fields: tuple[ProjectedField, ...] | None = None) -> DocumentPage[Self] | DocumentPage[PartialDocument[Self]]:
+		""" Async db_find_page. """
+		start_time = time.perf_counter()
+		filter_, resolved_sort, projection, projected_fields = cls._prepare_find_page(query, sort, page_size, after, fields)
+		
+		cursor = cls.get_async_collection().find(filter_, projection=projection).sort(resolved_sort).limit(page_size + 1)
+		documents = await cursor.to_list()
+		measured_documents = [copy_bson(document) for document in documents] if instrumentation.is_measuring_byte_sizes() else None
+		page = cls._build_page(documents, resolved_sort, page_size, projected_fields)
+		instrumentation.record(cls.get_collection_name(), "find_page", start_time, document_count=len(page.objs), documents=measured_documents, detail=query)
+		return page
+
+	@overload
+	@classmethod
+	def adb_iter_many(cls, query: dict, sort: dict | None = None, batch_size: int = 100) -> AsyncIterator[Self]:
+		...
+
+	@overload
+	@classmethod
+	def adb_iter_many(cls, query: dict, sort: dict | None = None, batch_size: int = 100, *, fields: tuple[ProjectedField, ...]) -> AsyncIterator[PartialDocument[Self]]:
+		...
+
+	@classmethod
+	async def adb_iter_many(cls, query: dict, sort: dict | None = None, batch_size: int = 100, *, fields: tuple[ProjectedField, ...] | None = None) -> AsyncIterator[Any]:
+		""" Async db_iter_many. Deserializes documents as they are consumed, one cursor batch at a time. """
+		filter_, projection, projected_fields = cls._prepare_iter_many(query, fields)
+		cursor = cls.get_async_collection().find(filter_, projection=projection, batch_size=batch_size)
+		if sort:
+			cursor = cursor.sort(sort)
+		
+		iterated = _IteratedDocuments(cls, batch_size, "iter_many", query, keep_snapshot=True, trusted=True, projected_fields=projected_fields)
+		documents = aiter(cursor)
+		try:
+			while True:
+				start_time = time.perf_counter()
+				document = await anext(documents, None)
+				if document is None:
+					break
+				yield iterated.load(document, start_time)
+			iterated.finish()
+		finally:
+			# Release the server-side cursor if the caller stops iterating early
+			await cursor.close()
+
+	@classmethod
+	async def adb_from_pipeline(cls, pipeline: _Pipeline) -> list[Self]:
+		""" Async db_from_pipeline. """
+		start_time = time.perf_counter()
+		cursor = await cls.get_async_collection().aggregate(pipeline)
+		
+		objs: list[Self] = []
+		async for document in cursor:
+			obj = cls.from_document(document) # The pipeline may have produced anything, so validate it
+			objs.append(cls.__class_validation__(obj))
+		instrumentation.record(cls.get_collection_name(), "from_pipeline", start_time, document_count=len(objs), detail=pipeline)
+		return objs
+
+	@classmethod
+	async def adb_count_documents(cls, query: dict) -> int:
+		""" Async db_count_documents. """
+		start_time = time.perf_counter()
+		filter_ = cls.__class_query__() | query
+		cache_key, cached_count = cls._get_cached_query("count_documents", filter_)
+		if cached_count is not None:
+			return cached_count
+		count = await cls.get_async_collection().count_documents(filter_)
+		if cache_key is not None and cls.__query_cache__ is not None:
+			cls.__query_cache__.set(cache_key, count)
+		instrumentation.record(cls.get_collection_name(), "count_documents", start_time, detail=query)
+		return count
+
+	async def adb_insert_self(self) -> None:
+		""" Async db_insert_self. """
+		start_time = time.perf_counter()
+		self.__before_saving__(UpdateMethod.INSERT)
+		document = type(self).__class_validation__(self).to_document()
+		await type(self).get_async_collection().insert_one(document)
+		type(self)._invalidate_queries()
+		self._set_db_snapshot(copy_bson(document))
+		instrumentation.record(type(self).get_collection_name(), "insert_self", start_time, document_count=1, documents=(document,), detail=self._id)
+
+	@classmethod
+	async def adb_insert_many(cls, objs: list[Self], *, ordered: bool = True, chunk_size: int = 1000) -> None:
+		""" Async db_insert_many. """
+		from pymongo.errors import BulkWriteError
+		
+		documents = cls._prepare_insert_many(objs, chunk_size)
+		for chunk_start in range(0, len(objs), chunk_size):
+			start_time = time.perf_counter()
+			chunk = objs[chunk_start:chunk_start + chunk_size]
+			chunk_documents = documents[chunk_start:chunk_start + chunk_size]
+			
+			try:
+				await cls.get_async_collection().insert_many(chunk_documents, ordered=ordered)
+			except BulkWriteError as e:
+				cls._invalidate_queries() # The documents before the error were inserted
+				cls._snapshot_inserted(chunk, chunk_documents, e, ordered)
+				raise
+			
+			cls._invalidate_queries()
+			for obj, document in zip(chunk, chunk_documents):
+				obj._set_db_snapshot(copy_bson(document))
+			
+			instrumentation.record(cls.get_collection_name(), "insert_many", start_time, document_count=len(chunk_documents), documents=chunk_documents)
+
+	async def adb_update_self(self) -> None:
+		""" Async db_update_self. If this obj already has a write queued in the unit of work, the update joins it instead of being sent now, like a deferred db_update_self(). """
+		start_time = time.perf_counter()
+		self.__before_saving__(UpdateMethod.UPDATE)
+		
+		# Sending the update now would fail for a queued insert, and a queued update would send it again on flush
+		unit = current_unit_of_work()
+		if unit is not None and unit.has_pending_write(self):
+			type(self).__class_validation__(self)
+			unit.defer_update(self)
+			return
+		
+		previous_version = self.__version__
+		document, update = self._prepare_update()
+		collection = type(self).get_async_collection()
+		if update is not None:
+			result = await collection.update_one({"_id": self._id}, update)
+		else:
+			result = await collection.replace_one({"_id": self._id}, document)
+		self._finish_update(result.matched_count, document, update, previous_version, start_time)
+
+	async def adb_delete_self(self) -> None:
+		""" Async db_delete_self. """
+		if not self.__before_deleting__():
+			raise ValueError("Can't delete this object because it is referenced by another.")
+		
+		unit = current_unit_of_work()
+		if unit is not None:
+			was_pending_insert = unit.is_pending_insert(self)
+			unit.evict(self)
+			if was_pending_insert:
+				return # Never written to the db
+		
+		start_time = time.perf_counter()
+		result = await type(self).get_async_collection().delete_one(type(self).__class_query__() | {"_id": self._id})
+		type(self)._invalidate_cached(self._id)
+		instrumentation.record(type(self).get_collection_name(), "delete_self", start_time, document_count=result.deleted_count, detail=self._id)
+		if result.deleted_count != 1:
+			raise ValueError("Error deleting the document. Are you sure a document with this _id exists?")
+
+	@classmethod
+	async def adb_delete_many(cls, query: dict[str, Any]) -> int:
+		""" Async db_delete_many. """
+		start_time = time.perf_counter()
+		result = await cls.get_async_collection().delete_many(cls.__class_query__() | query)
+		if result.deleted_count:
+			if cls.__cache__ is not None:
+				cls.__cache__.invalidate_all() # We don't know which _ids were deleted
+			cls._invalidate_queries()
+		instrumentation.record(cls.get_collection_name(), "delete_many", start_time, document_count=result.deleted_count, detail=query)
+		return result.deleted_count
+	# endregion
+
+	# References
+	def get_reference(self, field: FieldSchema) -> 'Document | None':
+		""" Returns the Document referenced by a DocumentId field, or None if the field is None or the Document doesn't exist.
+		Uses the Document attached by prefetch() if there is one, otherwise loads it (see prefetch.py). """
+		from .prefetch import get_prefetched
+		
+		_id = getattr(self, field.field_name)
+		is_prefetched, referenced_obj = get_prefetched(self, field.field_name, _id)
+		if is_prefetched:
+			return referenced_obj
+		if _id is None:
+			return None
+		
+		referenced_cls = type(self).get_references().get(field.field_name)
+		if referenced_cls is None:
+			raise ValueError(f"Field '{field.field_name}' of '{type(self).__name__}' is not a DocumentId reference to another Document.")
+		return referenced_cls.db_find_one({ "_id": _id })
 
 	# Ownership
+	@classmethod
+	def __owner_query__(cls, user_id: DocumentId | None) -> dict | None:
+		""" Returns a query matching the documents of this class that the user (None if not logged in) may access, i.e. those whose get_owner() is the user or PUBLIC.
+		This lets writes check ownership in their filter, without loading the document first (see update_pointer_value).
+		Returns None if get_owner() or __class_validation__() is overridden, in which case ownership is checked on the loaded document (which also runs the class validation). Override this too to keep the fast path.
+		NOTE: This only matches a stored fk_user_id, not one read from a legacy field or the field default, so callers must load and check the document when it matches nothing. """
+		if cls.get_owner is not Document.get_owner or cls.__class_validation__.__func__ is not Document.__class_validation__.__func__ or "fk_user_id" not in cls.__bsonable_fields__: # type: ignore
+			return None
+		if user_id is None:
+			return { "fk_user_id": PUBLIC }
+		return { "fk_user_id": { "$in": [user_id, PUBLIC] } }
+
 	def get_owner(self) -> DocumentId:
 		""" Every Document should have a way to look up which user it belongs to. By default, this just looks for a field named fk_user_id. Override this if needed. """
 		if not "fk_user_id" in type(self).__bsonable_fields__:
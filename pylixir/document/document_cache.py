@@ -0,0 +1,134 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Protocol
+
+from .change_tracking import copy_bson
+
+
+"""
+Document cache
+
+Document classes can opt in to a read-through cache of their raw mongo documents, keyed by _id:
+
+	class Project(Document):
+		__cache__ = CachePolicy(max_size=10_000, ttl=60)
+
+db_require_one_by_id() and db_find_one({"_id": ...}) read from the cache, and fill it on a miss.
+Entries are invalidated by db_update_self(), db_update_self_field(), db_update_field(), db_replace_one(), db_find_one_and_update() and deletes.
+db_delete_many() can't tell which documents it deleted, so it clears the whole cache.
+Writes that bypass Document (e.g. get_collection().update_one(...)) are not seen: either call __cache__.invalidate() or rely on the ttl.
+
+The default backend is an in-process LRU. Anything implementing CacheBackend can be used instead (e.g. a store shared between processes).
+Subclasses inherit their parent's __cache__. Keys include the collection name, so classes sharing a policy don't collide.
+"""
+
+class CacheBackend(Protocol):
+	""" Stores cache entries by key. Values must be returned as they were stored, and are never modified by the caller. """
+	def get(self, key: str) -> Any | None: ...
+	def set(self, key: str, value: Any) -> int:
+		""" Stores the value. Returns the number of entries evicted to make room. """
+		...
+	def delete(self, key: str) -> None: ...
+	def clear(self) -> None: ...
+
+class LRUCacheBackend:
+	""" An in-process, thread-safe cache that evicts the least recently used entries beyond max_size. """
+	def __init__(self, max_size: int = 1024) -> None:
+		if max_size <= 0:
+			raise ValueError(f"max_size must be positive. Instead received {max_size}.")
+		self.max_size = max_size
+		self._entries: OrderedDict[str, Any] = OrderedDict()
+		self._lock = threading.Lock()
+
+	def get(self, key: str) -> Any | None:
+		with self._lock:
+			value = self._entries.get(key)
+			if value is not None:
+				self._entries.move_to_end(key)
+			return value
+
+	def set(self, key: str, value: Any) -> int:
+		with self._lock:
+			self._entries[key] = value
+			self._entries.move_to_end(key)
+			evicted = 0
+			while len(self._entries) > self.max_size:
+				self._entries.popitem(last=False)
+				evicted += 1
+			return evicted
+
+	def delete(self, key: str) -> None:
+		with self._lock:
+			self._entries.pop(key, None)
+
+	def clear(self) -> None:
+		with self._lock:
+			self._entries.clear()
+
+	def __len__(self) -> int:
+		return len(self._entries)
+
+class CachePolicy:
+	""" Configures the cache for a Document class (see __cache__). """
+	def __init__(self, max_size: int = 1024, ttl: float | None = 300, backend: CacheBackend | None = None) -> None:
+		"""
+		Args:
+			max_size: The maximum number of documents kept by the default LRU backend. Ignored if a backend is passed in.
+			ttl: Seconds before an entry expires, or None to keep entries until they're evicted or invalidated.
+			backend: Where to store the entries. Defaults to an LRUCacheBackend.
+		"""
+		if ttl is not None and ttl <= 0:
+			raise ValueError(f"ttl must be positive or None. Instead received {ttl}.")
+		self.ttl = ttl
+		self.backend: CacheBackend = backend if backend is not None else LRUCacheBackend(max_size)
+		self.hits = 0
+		self.misses = 0
+		self.evictions = 0
+		""" Entries evicted by the backend to make room, or expired by the ttl. """
+		self.invalidations = 0
+
+	@staticmethod
+	def _key(collection_name: str, _id: Any) -> str:
+		return f"{collection_name}:{_id}"
+
+	def get(self, collection_name: str, _id: Any) -> dict[str, Any] | None:
+		""" Returns a copy of the cached document, or None. """
+		key = self._key(collection_name, _id)
+		entry = self.backend.get(key)
+		if entry is None:
+			self.misses += 1
+			return None
+		expires_at, document = entry
+		if expires_at is not None and expires_at <= time.monotonic():
+			self.backend.delete(key)
+			self.evictions += 1
+			self.misses += 1
+			return None
+		self.hits += 1
+		return copy_bson(document) # Deserializing modifies the document, so never hand out the stored one
+
+	def set(self, collection_name: str, document: dict[str, Any]) -> None:
+		""" Stores a copy of a document as read from the db. """
+		expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+		self.evictions += self.backend.set(self._key(collection_name, document["_id"]), (expires_at, copy_bson(document)))
+
+	def invalidate(self, collection_name: str, _id: Any) -> None:
+		self.backend.delete(self._key(collection_name, _id))
+		self.invalidations += 1
+
+	def invalidate_all(self) -> None:
+		self.backend.clear()
+		self.invalidations += 1
+
+	def stats(self) -> dict[str, int]:
+		""" Returns the hit, miss, eviction and invalidation counters. """
+		return {
+			"hits": self.hits,
+			"misses": self.misses,
+			"evictions": self.evictions,
+			"invalidations": self.invalidations
+		}
+
+	def reset_stats(self) -> None:
+		self.hits = self.misses = self.evictions = self.invalidations = 0
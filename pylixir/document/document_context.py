@@ -1,23 +1,77 @@
 from __future__ import annotations
-from dataclasses import dataclass
 
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from ..typing.fields.field_path import FieldPath
 
 
-@dataclass(frozen=True)
 class DocumentContext:
-    document_path: FieldPath
-    """ The path of the current field relative to the document root. 
-    List elements will be returned as [idx]. """
-    
-    document_id: str | None = None
-    last_modified_by_global_version: str | None = None
-    last_modified_by_app_id: str | None = None
-    """ These will come from the document. """
-    
-    collection_name: str | None = None
+    """ Describes where a value being (de)serialized lives within a document. Only read when formatting error messages and logs.
+
+    subpath() and subidx() are called for every field and list element during deserialization, so they don't build a new FieldPath.
+    Instead, each sub-context just points at its parent, and document_path is built (and cached) the first time it is read.
+    Instances are immutable. """
+    __slots__ = ("_parent", "_segment", "_document_path", "_metadata")
+
+    def __init__(self,
+                 document_path: FieldPath,
+                 document_id: str | None = None,
+                 last_modified_by_global_version: str | None = None,
+                 last_modified_by_app_id: str | None = None,
+                 collection_name: str | None = None
+                ) -> None:
+        self._parent: DocumentContext | None = None
+        self._segment: str | int | None = None # A field name for subpath(), an index for subidx()
+        self._document_path: FieldPath | None = document_path
+        self._metadata = (document_id, last_modified_by_global_version, last_modified_by_app_id, collection_name) # Shared by all sub-contexts
+
+    @property
+    def document_path(self) -> FieldPath:
+        """ The path of the current field relative to the document root.
+        List elements will be returned as [idx]. """
+        if self._document_path is None:
+            # Walk up to the nearest context with a known path, then build the path back down
+            segments: list[str | int] = []
+            context = self
+            while context._document_path is None:
+                segments.append(context._segment) # type: ignore
+                context = context._parent # type: ignore
+            document_path = context._document_path
+            for segment in reversed(segments):
+                document_path = document_path.subidx(segment) if isinstance(segment, int) else document_path.subfield(segment)
+            object.__setattr__(self, "_document_path", document_path) # Cache (doesn't change the value of the context)
+        return self._document_path
+
+    @property
+    def document_id(self) -> str | None:
+        return self._metadata[0]
+
+    @property
+    def last_modified_by_global_version(self) -> str | None:
+        """ These will come from the document. """
+        return self._metadata[1]
+
+    @property
+    def last_modified_by_app_id(self) -> str | None:
+        return self._metadata[2]
+
+    @property
+    def collection_name(self) -> str | None:
+        return self._metadata[3]
+
+    def __setattr__(self, name: str, value: object) -> None:
+        if hasattr(self, "_metadata"):
+            raise AttributeError(f"DocumentContext is immutable. Use replace(), subpath() or subidx() instead of setting '{name}'.")
+        super().__setattr__(name, value)
+
+    def _child(self, segment: str | int) -> 'DocumentContext':
+        """ Returns a sub-context that points at this context. Its document_path is built lazily. """
+        child = object.__new__(DocumentContext)
+        object.__setattr__(child, "_parent", self)
+        object.__setattr__(child, "_segment", segment)
+        object.__setattr__(child, "_document_path", None)
+        object.__setattr__(child, "_metadata", self._metadata)
+        return child
 
     def replace(self, document_path: FieldPath | None = None) -> 'DocumentContext':
         new_context = DocumentContext(
@@ -31,19 +85,16 @@ class DocumentContext:
 
     def subpath(self, field_name: str) -> 'DocumentContext':
         """ Returns a new DocumentContext with a modified document_path. """
-        new_context = self.replace(
-            document_path=self.document_path.subfield(field_name)
-        )
-        return new_context
+        return self._child(field_name)
 
     def subidx(self, idx: int) -> 'DocumentContext':
         """ Returns a new DocumentContext with a modified document_path. """
-        new_context = self.replace(
-            document_path=self.document_path.subidx(idx)
-        )
-        return new_context
+        return self._child(idx)
+
+    def __repr__(self) -> str:
+        return f"DocumentContext(document_path={self.document_path!r}, document_id={self.document_id!r}, collection_name={self.collection_name!r})"
 
     def __str__(self) -> str:
         """ Printable to logs. """
         output = f"Collection: {self.collection_name}\nDocument _id: {self.document_id}\nDocument path: {self.document_path}\nLast Modified by Global Version: {self.last_modified_by_global_version}\nLast Modified By App: {self.last_modified_by_app_id}"
-        return output
\ No newline at end of file
+        return output
@@ -0,0 +1,262 @@
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Iterable
+
+from pymongo import ASCENDING, IndexModel
+
+from ..typing.fields.field_path import FieldPath
+from ..typing.fields.field_schema import FieldSchema
+from ..typing.fields.schema_config import _DocumentSchemaConfig
+from ..typing.serialization.vars import __type_id__
+from ..utilities.logger import logger
+from ..utilities.special_values import ABSTRACT
+
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+	from .document import Document
+
+
+"""
+Declarative indexes
+
+Document classes declare their indexes, and sync_indexes() creates the ones missing from mongo:
+
+	class Project(Document):
+		fk_user_id: DocumentId = DocumentSchemaConfig(index=True)        # Single field. unique=True for a unique index
+		slug: str = DocumentSchemaConfig(unique=True)
+		__indexes__ = (
+			Index("fk_user_id", ("last_opened", DESCENDING)),          # Compound. Keys are field names or mongo dot notation
+			Index("settings.theme", sparse=True),
+		)
+	Project.__indexes__ += (Index(FieldPath.for_(Project, Project.inner, Inner.x)),) # FieldSchemas and FieldPaths can be used once the class exists
+
+Every Document query filters on __type_id__ (see __class_query__). When several Document types share a collection, each index is prefixed with
+__type_id__ so that it only covers one type (and unique indexes are unique per type). Pass include_type_id to an Index to override this.
+
+	create_type_registry(sync_indexes=True)   # Syncs in a background thread after registration, logging the result
+	python -m pylixir.document sync-indexes myapp.models [--dry-run] [--drop-unknown]
+
+Indexes are matched to the existing ones by their keys. An existing index with the same keys but different options is reported as conflicting and left as is:
+mongo can't hold both, so drop it by hand. Indexes that aren't declared are only dropped with drop_unknown.
+"""
+
+IndexField = str | FieldSchema | FieldPath
+IndexKey = IndexField | tuple[IndexField, Any]
+""" A field, or a (field, direction) tuple. The direction defaults to ASCENDING. Any pymongo index type can be used, e.g. DESCENDING, TEXT or HASHED. """
+
+class Index:
+	""" An index declared on a Document class (see __indexes__). """
+	def __init__(
+			self,
+			*keys: IndexKey,
+			unique: bool = False,
+			sparse: bool = False,
+			partial_filter: dict[str, Any] | None = None,
+			expire_after_seconds: int | None = None,
+			name: str | None = None,
+			include_type_id: bool | None = None
+		) -> None:
+		"""
+		Args:
+			partial_filter: Only index the documents matching this query (partialFilterExpression).
+			expire_after_seconds: Makes this a TTL index. It must have a single datetime field, so __type_id__ is never prepended.
+			name: Defaults to mongo's generated name, e.g. "fk_user_id_1_last_opened_-1".
+			include_type_id: Prepend __type_id__ to the keys. None prepends it only if several Document types share the collection.
+		"""
+		if not keys:
+			raise ValueError("An Index needs at least one key.")
+		if expire_after_seconds is not None and len(keys) != 1:
+			raise ValueError("A TTL index (expire_after_seconds) must have exactly one key.")
+		self.keys = keys
+		self.unique = unique
+		self.sparse = sparse
+		self.partial_filter = partial_filter
+		self.expire_after_seconds = expire_after_seconds
+		self.name = name
+		self.include_type_id = include_type_id
+
+	def __repr__(self) -> str:
+		return f"Index({', '.join(repr(key) for key in self.keys)}{', unique=True' if self.unique else ''})"
+
+	def resolve_keys(self, document_cls: type['Document']) -> list[tuple[str, Any]]:
+		""" Returns the keys as (mongo field, direction). """
+		resolved: list[tuple[str, Any]] = []
+		for key in self.keys:
+			field_, direction = key if isinstance(key, tuple) else (key, ASCENDING)
+			resolved.append((to_mongo_field(document_cls, field_), direction))
+		return resolved
+
+	def get_options(self) -> dict[str, Any]:
+		""" Returns the index options as reported by index_information(). """
+		options: dict[str, Any] = {}
+		if self.unique:
+			options["unique"] = True
+		if self.sparse:
+			options["sparse"] = True
+		if self.partial_filter is not None:
+			options["partialFilterExpression"] = self.partial_filter
+		if self.expire_after_seconds is not None:
+			options["expireAfterSeconds"] = self.expire_after_seconds
+		return options
+
+def to_mongo_field(document_cls: type['Document'], field_: IndexField) -> str:
+	""" Returns the mongo dot notation for a field name, FieldSchema or FieldPath. """
+	if isinstance(field_, FieldPath):
+		return field_.as_mongo_db_dot_notation()
+	if isinstance(field_, FieldSchema):
+		if not issubclass(document_cls, field_.containing_cls):
+			raise ValueError(f"Can't index field '{field_.field_name}' of '{field_.containing_cls.__name__}' on '{document_cls.__name__}'. Use a FieldPath for nested fields.")
+		return field_.field_name
+	if isinstance(field_, str):
+		return field_
+	raise TypeError(f"Expected an index key to be a str, FieldSchema or FieldPath. Instead received {type(field_)}.")
+
+@dataclass
+class IndexSyncReport:
+	""" What sync_indexes() found (and did) for one collection. Indexes are listed by name. """
+	db_name: str
+	collection_name: str
+	created: list[str] = field(default_factory=list)
+	""" Missing indexes that were created (or would be, for a dry run) """
+	existing: list[str] = field(default_factory=list)
+	conflicting: list[str] = field(default_factory=list)
+	""" Existing indexes with the same keys as a declared index, but different options """
+	unknown: list[str] = field(default_factory=list)
+	""" Existing indexes that aren't declared """
+	dropped: list[str] = field(default_factory=list)
+
+	def __str__(self) -> str:
+		lines = [f"{self.db_name}.{self.collection_name}:"]
+		for label, names in (("created", self.created), ("existing", self.existing), ("conflicting", self.conflicting), ("unknown", self.unknown), ("dropped", self.dropped)):
+			if names:
+				lines.append(f"  {label}: {', '.join(names)}")
+		if len(lines) == 1:
+			lines.append("  no indexes declared")
+		return "\n".join(lines)
+
+def get_index_models(document_cls: type['Document'], shared_collection: bool | None = None) -> list[IndexModel]:
+	""" Returns the IndexModels declared on a Document class, by its field configs and __indexes__.
+
+	Args:
+		shared_collection: Whether several Document types share the collection. Looked up if None.
+	"""
+	if shared_collection is None:
+		shared_collection = len(_get_collection_type_ids().get(_collection_key(document_cls), ())) > 1
+
+	indexes: list[Index] = []
+	for field_name, field_schema in document_cls.__bsonable_fields__.items():
+		schema_config = field_schema.schema_config
+		if isinstance(schema_config, _DocumentSchemaConfig) and schema_config.index:
+			indexes.append(Index(field_name, unique=schema_config.unique))
+	indexes.extend(document_cls.__indexes__)
+
+	index_models: dict[tuple[tuple[str, Any], ...], IndexModel] = {}
+	for index in indexes:
+		keys = index.resolve_keys(document_cls)
+		include_type_id = index.include_type_id if index.include_type_id is not None else (shared_collection and index.expire_after_seconds is None)
+		if include_type_id and keys[0][0] != __type_id__:
+			keys.insert(0, (__type_id__, ASCENDING))
+		options = index.get_options()
+		if index.name is not None:
+			options["name"] = index.name
+		index_models.setdefault(tuple(keys), IndexModel(keys, **options)) # The same keys may be declared by a field config and __indexes__
+	return list(index_models.values())
+
+def _collection_key(document_cls: type['Document']) -> tuple[str, str]:
+	return (document_cls.get_db_name(), document_cls.get_collection_name())
+
+def _get_collection_type_ids() -> dict[tuple[str, str], set[str]]:
+	""" Returns the type ids stored in each collection, by (db name, collection name), including unregistered subclasses. """
+	from ..typing.registration.get_all_subclasses import get_all_subclasses
+	from .document import Document
+
+	type_ids: dict[tuple[str, str], set[str]] = {}
+	for document_cls in get_all_subclasses(Document):
+		if getattr(document_cls, "__collection_name__", ABSTRACT) == ABSTRACT or document_cls.__type_id__ == ABSTRACT:
+			continue
+		type_ids.setdefault(_collection_key(document_cls), set()).add(document_cls.__type_id__)
+	return type_ids
+
+def sync_indexes(document_classes: Iterable[type['Document']] | None = None, *, drop_unknown: bool = False, dry_run: bool = False) -> list[IndexSyncReport]:
+	""" Creates the declared indexes that are missing from mongo, and returns a report per collection.
+
+	Args:
+		document_classes: Defaults to all registered Document classes. Call create_type_registry() first.
+		drop_unknown: Drop existing indexes that aren't declared (except _id).
+		dry_run: Only report what would be created or dropped.
+	"""
+	if document_classes is None:
+		from ..typing import type_registry
+		document_classes = [document_info.cls for document_info in type_registry.document_info_list]
+
+	# Group by collection, since several classes may declare indexes on the same one
+	collection_type_ids = _get_collection_type_ids()
+	classes_by_collection: dict[tuple[str, str], list[type['Document']]] = {}
+	for document_cls in document_classes:
+		classes_by_collection.setdefault(_collection_key(document_cls), []).append(document_cls)
+
+	reports: list[IndexSyncReport] = []
+	for (db_name, collection_name), collection_classes in classes_by_collection.items():
+		shared_collection = len(collection_type_ids.get((db_name, collection_name), ())) > 1
+		index_models: dict[tuple[tuple[str, Any], ...], IndexModel] = {}
+		for document_cls in collection_classes:
+			for index_model in get_index_models(document_cls, shared_collection):
+				index_models.setdefault(_normalize_keys(index_model.document["key"].items()), index_model)
+		reports.append(_sync_collection(collection_classes[0].get_collection(), db_name, index_models, drop_unknown=drop_unknown, dry_run=dry_run))
+	return reports
+
+def _sync_collection(collection: Any, db_name: str, index_models: dict[tuple[tuple[str, Any], ...], IndexModel], *, drop_unknown: bool, dry_run: bool) -> IndexSyncReport:
+	report = IndexSyncReport(db_name, collection.name)
+	existing_by_keys = { _normalize_keys(info["key"]): (name, info) for name, info in collection.index_information().items() }
+
+	missing: list[IndexModel] = []
+	for keys, index_model in index_models.items():
+		existing = existing_by_keys.pop(keys, None)
+		if existing is None:
+			missing.append(index_model)
+			report.created.append(index_model.document["name"])
+			continue
+		name, info = existing
+		if _options_match(index_model.document, info):
+			report.existing.append(name)
+		else:
+			report.conflicting.append(name)
+
+	report.unknown = [name for name, _info in existing_by_keys.values() if name != "_id_"]
+	if dry_run:
+		return report
+
+	if missing:
+		collection.create_indexes(missing)
+	if drop_unknown:
+		for name in report.unknown:
+			collection.drop_index(name)
+			report.dropped.append(name)
+	return report
+
+def _normalize_keys(keys: Iterable[tuple[str, Any]]) -> tuple[tuple[str, Any], ...]:
+	""" Returns the keys as a tuple, with numeric directions as ints (the server may report 1.0 for 1). """
+	return tuple((field_, int(direction) if isinstance(direction, float) else direction) for field_, direction in keys)
+
+_COMPARED_OPTIONS = ("unique", "sparse", "partialFilterExpression", "expireAfterSeconds")
+
+def _options_match(declared: dict[str, Any], existing: dict[str, Any]) -> bool:
+	return all(bool(declared.get(option)) == bool(existing.get(option)) if option in ("unique", "sparse") else declared.get(option) == existing.get(option) for option in _COMPARED_OPTIONS)
+
+def sync_indexes_in_background(document_classes: Iterable[type['Document']] | None = None, *, drop_unknown: bool = False) -> threading.Thread:
+	""" Runs sync_indexes() in a daemon thread, logging the result, so that startup doesn't wait for index builds. """
+	document_classes = list(document_classes) if document_classes is not None else None # Don't consume the caller's iterable from another thread
+
+	def run() -> None:
+		try:
+			for report in sync_indexes(document_classes, drop_unknown=drop_unknown):
+				if report.created or report.conflicting or report.dropped:
+					logger.info(f"Synced indexes. {report}")
+				if report.conflicting:
+					logger.warning(f"Indexes on {report.db_name}.{report.collection_name} conflict with the declared ones and were not changed: {', '.join(report.conflicting)}")
+		except Exception as e:
+			logger.error(f"Error syncing indexes: {e}")
+
+	thread = threading.Thread(target=run, name="sync_indexes", daemon=True)
+	thread.start()
+	return thread
@@ -0,0 +1,271 @@
+import threading
+import time
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable
+
+from pymongo import monitoring
+
+from ..utilities.logger import logger
+
+
+"""
+Database instrumentation
+
+Document methods and (optionally) pymongo command monitoring report a DbEvent for each database operation to all subscribers.
+When nothing is subscribed, recording an event is a single truthiness check.
+
+	enable_stats()                          # Aggregate per-collection, per-operation stats. Read them with Document.stats() or get_stats()
+	enable_slow_query_logging(100)          # Log operations slower than 100ms
+	enable_command_monitoring()             # Also record every command sent by pymongo (call at startup, before the first query)
+	enable_byte_sizes()                     # Also measure the bson size of documents read and written (costs a bson.encode per document)
+	subscribe(my_callback)                  # Receive every DbEvent
+"""
+
+@dataclass(frozen=True, slots=True)
+class DbEvent:
+	""" A single database operation. """
+	source: str
+	""" 'document' for Document methods, 'command' for pymongo commands. """
+	collection: str
+	operation: str
+	duration: float
+	""" Seconds """
+	document_count: int = 0
+	byte_size: int | None = None
+	""" Total bson size of the documents read or written. Only measured when enable_byte_sizes() is on. """
+	detail: str | None = None
+	""" e.g. the query, for slow query logs """
+
+Subscriber = Callable[[DbEvent], None]
+
+# Module-level state
+_subscribers: tuple[Subscriber, ...] = () # Replaced rather than mutated, so it's safe to iterate while others subscribe
+_measure_byte_sizes = False
+_command_monitoring = False
+_stats_aggregator: 'StatsAggregator | None' = None
+
+def subscribe(subscriber: Subscriber) -> None:
+	""" Calls the subscriber with every DbEvent. """
+	global _subscribers
+	if subscriber not in _subscribers:
+		_subscribers = _subscribers + (subscriber,)
+
+def unsubscribe(subscriber: Subscriber) -> None:
+	global _subscribers
+	_subscribers = tuple(s for s in _subscribers if s != subscriber)
+
+def is_enabled() -> bool:
+	""" Returns True if anything is subscribed to DbEvents. """
+	return bool(_subscribers)
+
+def enable_byte_sizes(enabled: bool = True) -> None:
+	""" Measures the bson size of documents in document events. """
+	global _measure_byte_sizes
+	_measure_byte_sizes = enabled
+
+def is_measuring_byte_sizes() -> bool:
+	""" Returns True if documents should be passed to record() so that their size can be measured. """
+	return _measure_byte_sizes and bool(_subscribers)
+
+def record(collection: str, operation: str, start_time: float | None, document_count: int = 0, documents: Iterable[dict[str, Any]] | None = None, detail: Any = None, *, duration: float | None = None) -> None:
+	""" Reports a Document operation that started at start_time (time.perf_counter()).
+	For operations whose time isn't one contiguous span (e.g. a streamed batch, which excludes the time spent by the caller), pass the measured duration instead. """
+	if not _subscribers:
+		return
+	if duration is None and start_time is None:
+		raise ValueError("Either start_time or duration must be passed to record().")
+
+	byte_size = None
+	if _measure_byte_sizes and documents is not None:
+		import bson
+		byte_size = sum(len(bson.encode(document)) for document in documents)
+
+	_publish(DbEvent(
+		source="document",
+		collection=collection,
+		operation=operation,
+		duration=duration if duration is not None else time.perf_counter() - start_time,
+		document_count=document_count,
+		byte_size=byte_size,
+		detail=str(detail) if detail is not None else None
+	))
+
+def _publish(event: DbEvent) -> None:
+	for subscriber in _subscribers:
+		try:
+			subscriber(event)
+		except Exception as e:
+			# Instrumentation must never break a database operation
+			logger.error(f"Error in db instrumentation subscriber {subscriber}: {e}")
+
+#region: Stats
+# Upper bounds of the latency histogram buckets, in milliseconds. The last bucket is unbounded.
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+class OperationStats:
+	""" Aggregated stats for one (source, collection, operation). """
+	__slots__ = ("count", "total_duration", "max_duration", "document_count", "byte_size", "latency_histogram")
+
+	def __init__(self) -> None:
+		self.count = 0
+		self.total_duration = 0.0
+		self.max_duration = 0.0
+		self.document_count = 0
+		self.byte_size = 0
+		self.latency_histogram = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+	def add(self, event: DbEvent) -> None:
+		self.count += 1
+		self.total_duration += event.duration
+		self.max_duration = max(self.max_duration, event.duration)
+		self.document_count += event.document_count
+		if event.byte_size is not None:
+			self.byte_size += event.byte_size
+		self.latency_histogram[bisect_left(LATENCY_BUCKETS_MS, event.duration * 1000)] += 1
+
+	def to_dict(self) -> dict[str, Any]:
+		return {
+			"count": self.count,
+			"total_duration": self.total_duration,
+			"mean_duration": self.total_duration / self.count if self.count else 0.0,
+			"max_duration": self.max_duration,
+			"document_count": self.document_count,
+			"byte_size": self.byte_size,
+			"latency_histogram_ms": { f"<={bound}" : n for bound, n in zip(LATENCY_BUCKETS_MS, self.latency_histogram) } | { f">{LATENCY_BUCKETS_MS[-1]}": self.latency_histogram[-1] }
+		}
+
+class StatsAggregator:
+	""" Subscriber that aggregates DbEvents per source, collection and operation. """
+	def __init__(self) -> None:
+		self._lock = threading.Lock()
+		self._stats: dict[tuple[str, str, str], OperationStats] = {}
+
+	def __call__(self, event: DbEvent) -> None:
+		key = (event.source, event.collection, event.operation)
+		with self._lock:
+			stats = self._stats.get(key)
+			if stats is None:
+				stats = self._stats[key] = OperationStats()
+			stats.add(event)
+
+	def snapshot(self, collection: str | None = None) -> dict[str, dict[str, dict[str, Any]]]:
+		""" Returns {source: {"collection.operation": stats}}, optionally for a single collection. """
+		output: dict[str, dict[str, dict[str, Any]]] = {}
+		with self._lock:
+			for (source, event_collection, operation), stats in self._stats.items():
+				if collection is not None and event_collection != collection:
+					continue
+				output.setdefault(source, {})[f"{event_collection}.{operation}"] = stats.to_dict()
+		return output
+
+	def reset(self) -> None:
+		with self._lock:
+			self._stats.clear()
+
+def enable_stats() -> StatsAggregator:
+	""" Subscribes the default StatsAggregator (used by Document.stats()) and returns it. """
+	global _stats_aggregator
+	if _stats_aggregator is None:
+		_stats_aggregator = StatsAggregator()
+	subscribe(_stats_aggregator)
+	return _stats_aggregator
+
+def get_stats(collection: str | None = None) -> dict[str, dict[str, dict[str, Any]]]:
+	""" Returns a snapshot of the default StatsAggregator. Empty unless enable_stats() was called. """
+	if _stats_aggregator is None:
+		return {}
+	return _stats_aggregator.snapshot(collection)
+# endregion
+
+#region: Slow query logging
+class SlowQueryLogger:
+	""" Subscriber that logs operations slower than the threshold. """
+	def __init__(self, threshold_ms: float) -> None:
+		self.threshold_ms = threshold_ms
+
+	def __call__(self, event: DbEvent) -> None:
+		duration_ms = event.duration * 1000
+		if duration_ms >= self.threshold_ms:
+			detail = f" {event.detail}" if event.detail else ""
+			logger.warning(f"Slow database operation: {event.source} '{event.operation}' on '{event.collection}' ({event.document_count} documents) took {duration_ms:.1f}ms.{detail}")
+
+_slow_query_logger: SlowQueryLogger | None = None
+
+def enable_slow_query_logging(threshold_ms: float) -> None:
+	""" Logs a warning for every operation slower than threshold_ms. """
+	global _slow_query_logger
+	if _slow_query_logger is not None:
+		unsubscribe(_slow_query_logger)
+	_slow_query_logger = SlowQueryLogger(threshold_ms)
+	subscribe(_slow_query_logger)
+
+def disable_slow_query_logging() -> None:
+	global _slow_query_logger
+	if _slow_query_logger is not None:
+		unsubscribe(_slow_query_logger)
+		_slow_query_logger = None
+# endregion
+
+#region: Command monitoring
+class CommandInstrumentationListener(monitoring.CommandListener):
+	""" Reports every command sent by pymongo as a DbEvent. """
+	def __init__(self) -> None:
+		self._collections: dict[tuple[int, int], str] = {}
+
+	def started(self, event: monitoring.CommandStartedEvent) -> None:
+		if not _subscribers:
+			return
+		collection = event.command.get(event.command_name)
+		if event.command_name == "getMore":
+			collection = event.command.get("collection")
+		self._collections[(event.request_id, event.operation_id)] = f"{event.database_name}.{collection}" if isinstance(collection, str) else event.database_name
+
+	def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+		collection = self._collections.pop((event.request_id, event.operation_id), None)
+		if collection is None or not _subscribers:
+			return
+		_publish(DbEvent(
+			source="command",
+			collection=collection,
+			operation=event.command_name,
+			duration=event.duration_micros / 1_000_000,
+			document_count=_reply_document_count(event.reply)
+		))
+
+	def failed(self, event: monitoring.CommandFailedEvent) -> None:
+		collection = self._collections.pop((event.request_id, event.operation_id), None)
+		if collection is None or not _subscribers:
+			return
+		_publish(DbEvent(
+			source="command",
+			collection=collection,
+			operation=f"{event.command_name} (failed)",
+			duration=event.duration_micros / 1_000_000
+		))
+
+def _reply_document_count(reply: Any) -> int:
+	""" Returns the number of documents returned or affected by a command. """
+	if not isinstance(reply, dict):
+		return 0
+	cursor = reply.get("cursor")
+	if isinstance(cursor, dict):
+		return len(cursor.get("firstBatch", cursor.get("nextBatch", ())))
+	n = reply.get("n")
+	return n if isinstance(n, int) else 0
+
+_command_listener = CommandInstrumentationListener()
+
+def enable_command_monitoring() -> None:
+	""" Attaches the command listener to the shared MongoClients. Call this at startup: existing clients are closed so they can be recreated with the listener. """
+	global _command_monitoring
+	if _command_monitoring:
+		return
+	_command_monitoring = True
+	from .mongo_client import close_mongo_clients
+	close_mongo_clients()
+
+def get_event_listeners() -> list[monitoring.CommandListener]:
+	""" Returns the listeners to pass to new MongoClients. """
+	return [_command_listener] if _command_monitoring else []
+# endregion
@@ -1,3 +1,5 @@
+from typing import Any
+
 from pymongo.database import Database
 
 from .document import Document
@@ -16,6 +18,11 @@ class LogDocument(Document):
         from .mongo_db import create_mongo_log_db
         return create_mongo_log_db()
 
+    @classmethod
+    def get_async_db(cls) -> Any:
+        from .mongo_db import get_async_mongo_log_db
+        return get_async_mongo_log_db()
+
     def get_owner(self) -> DocumentId:
         return ADMIN
     
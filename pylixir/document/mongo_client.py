@@ -0,0 +1,171 @@
+import asyncio
+import os
+import threading
+import weakref
+from dataclasses import dataclass, field
+from typing import Any
+
+from pymongo import MongoClient
+
+from .instrumentation import get_event_listeners
+from ..utilities.logger import logger
+
+
+"""
+Connection manager
+
+Owns a single MongoClient (and so a single connection pool and set of monitor threads) per MONGO_URL. The main db and the log db share it.
+Pool and compression settings come from a MongoClientConfig, which by default is read from environment variables (see MongoClientConfig.from_env()).
+
+Async Documents methods (adb_*) use AsyncMongoClients (pymongo>=4.13), created with the same config. An AsyncMongoClient is bound to the event loop it is
+first used on, so there is one per event loop and MONGO_URL. They are dropped along with their event loop.
+
+MongoClients are not fork-safe. If the process forks after a client was created (e.g. gunicorn with --preload), the child drops its inherited clients
+and lazily creates new ones. The inherited clients are not closed in the child, since their sockets are still in use by the parent.
+"""
+
+@dataclass(frozen=True)
+class MongoClientConfig:
+    """ Settings passed to MongoClient. None means use the pymongo default. """
+    max_pool_size: int | None = None
+    min_pool_size: int | None = None
+    wait_queue_timeout_ms: int | None = None
+    compressors: str | None = None
+    """ Comma separated list, e.g. "zstd,snappy,zlib". zstd and snappy require extra packages. """
+    app_name: str | None = None
+    extra_kwargs: dict[str, Any] = field(default_factory=dict)
+    """ Any other MongoClient kwargs. """
+
+    @classmethod
+    def from_env(cls) -> 'MongoClientConfig':
+        """ Reads MONGO_MAX_POOL_SIZE, MONGO_MIN_POOL_SIZE, MONGO_WAIT_QUEUE_TIMEOUT_MS, MONGO_COMPRESSORS and MONGO_APP_NAME. """
+        return cls(
+            max_pool_size=_int_from_env("MONGO_MAX_POOL_SIZE"),
+            min_pool_size=_int_from_env("MONGO_MIN_POOL_SIZE"),
+            wait_queue_timeout_ms=_int_from_env("MONGO_WAIT_QUEUE_TIMEOUT_MS"),
+            compressors=os.environ.get("MONGO_COMPRESSORS") or None,
+            app_name=os.environ.get("MONGO_APP_NAME") or None
+        )
+
+    def to_client_kwargs(self) -> dict[str, Any]:
+        """ Returns the kwargs for MongoClient. """
+        kwargs: dict[str, Any] = {}
+        if self.max_pool_size is not None:
+            kwargs["maxPoolSize"] = self.max_pool_size
+        if self.min_pool_size is not None:
+            kwargs["minPoolSize"] = self.min_pool_size
+        if self.wait_queue_timeout_ms is not None:
+            kwargs["waitQueueTimeoutMS"] = self.wait_queue_timeout_ms
+        if self.compressors is not None:
+            kwargs["compressors"] = self.compressors
+        if self.app_name is not None:
+            kwargs["appname"] = self.app_name
+        kwargs.update(self.extra_kwargs)
+        return kwargs
+
+def _int_from_env(name: str) -> int | None:
+    value = os.environ.get(name)
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"Environment variable {name} must be an integer. Instead received '{value}'.")
+
+# Module-level state
+_clients: dict[str, MongoClient] = {}
+_async_clients: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, Any]]' = weakref.WeakKeyDictionary()
+_config: MongoClientConfig | None = None
+_lock = threading.Lock()
+
+def configure_mongo_client(config: MongoClientConfig) -> None:
+    """ Sets the config used for new MongoClients. Call this at startup, before the first query. Any existing clients are closed. """
+    global _config
+    with _lock:
+        _config = config
+        _close_clients()
+
+def get_mongo_client(url: str | None = None) -> MongoClient:
+    """ Returns the shared MongoClient for the url (MONGO_URL by default), creating it on first use. """
+    if url is None:
+        url = os.environ.get("MONGO_URL")
+        if not url: raise ValueError("Please set MONGO_URL in your environment variables.")
+
+    client = _clients.get(url)
+    if client is not None:
+        return client
+
+    with _lock:
+        client = _clients.get(url)
+        if client is None:
+            global _config
+            if _config is None:
+                _config = MongoClientConfig.from_env()
+            kwargs = _config.to_client_kwargs()
+            event_listeners = get_event_listeners()
+            if event_listeners:
+                kwargs["event_listeners"] = list(kwargs.get("event_listeners", ())) + event_listeners
+            client = MongoClient(url, **kwargs)
+            _clients[url] = client
+        return client
+
+def close_mongo_clients() -> None:
+    """ Closes all shared MongoClients. They will be recreated on next use. """
+    with _lock:
+        _close_clients()
+
+def _close_clients() -> None:
+    for client in _clients.values():
+        client.close()
+    _clients.clear()
+    _async_clients.clear() # Their close() must be awaited on their own event loop, so just drop them (see close_async_mongo_clients)
+    _reset_mongo_dbs()
+
+def get_async_mongo_client(url: str | None = None) -> Any:
+    """ Returns the shared AsyncMongoClient for the url (MONGO_URL by default) and the running event loop, creating it on first use. """
+    from pymongo import AsyncMongoClient
+
+    if url is None:
+        url = os.environ.get("MONGO_URL")
+        if not url: raise ValueError("Please set MONGO_URL in your environment variables.")
+
+    loop = asyncio.get_running_loop()
+    loop_clients = _async_clients.get(loop)
+    if loop_clients is None:
+        loop_clients = _async_clients[loop] = {}
+    client = loop_clients.get(url)
+    if client is None:
+        # No lock needed: only the event loop's thread creates clients for it
+        global _config
+        if _config is None:
+            _config = MongoClientConfig.from_env()
+        kwargs = _config.to_client_kwargs()
+        event_listeners = get_event_listeners()
+        if event_listeners:
+            kwargs["event_listeners"] = list(kwargs.get("event_listeners", ())) + event_listeners
+        client = loop_clients[url] = AsyncMongoClient(url, **kwargs)
+    return client
+
+async def close_async_mongo_clients() -> None:
+    """ Closes the shared AsyncMongoClients of the running event loop. They will be recreated on next use. """
+    loop_clients = _async_clients.pop(asyncio.get_running_loop(), {})
+    for client in loop_clients.values():
+        await client.close()
+
+def _reset_mongo_dbs() -> None:
+    """ The databases cached by mongo_db are bound to a client, so drop them along with the clients. """
+    from .mongo_db import reset_mongo_dbs
+    reset_mongo_dbs()
+
+def _reset_after_fork() -> None:
+    """ Drops the clients inherited from the parent process without closing them (the parent still owns their sockets). """
+    global _lock
+    _lock = threading.Lock() # The lock may have been held by another thread in the parent when we forked
+    if _clients:
+        logger.debug("Dropping MongoClients inherited from the parent process after fork.")
+    _clients.clear()
+    _async_clients.clear()
+    _reset_mongo_dbs()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
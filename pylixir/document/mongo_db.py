@@ -1,8 +1,10 @@
 import os
+from typing import Any
 
-from pymongo import MongoClient
 from pymongo.database import Database
 
+from .mongo_client import get_async_mongo_client, get_mongo_client
+
 # Module-level cache for database instances
 _mongo_db = None
 _mongo_log_db = None
@@ -11,30 +13,40 @@ def create_mongo_db() -> Database:
     global _mongo_db
     if _mongo_db is not None:
         return _mongo_db
-    
-    MONGO_URL = os.environ.get("MONGO_URL")
-    if not MONGO_URL: raise ValueError("Please set MONGO_URL in your environment variables.")
 
     MONGO_DB_NAME = os.environ.get("MONGO_DB_NAME")
     if not MONGO_DB_NAME: raise ValueError("Please set MONGO_DB_NAME in your environment variables.")
 
-    # Initialize database
-    mongo_client = MongoClient(MONGO_URL)
-    _mongo_db = mongo_client[MONGO_DB_NAME]
+    # Initialize database. The main and log databases share a single client (see mongo_client.py)
+    _mongo_db = get_mongo_client()[MONGO_DB_NAME]
     return _mongo_db
 
 def create_mongo_log_db() -> Database:
     global _mongo_log_db
     if _mongo_log_db is not None:
         return _mongo_log_db
-    
-    MONGO_URL = os.environ.get("MONGO_URL")
-    if not MONGO_URL: raise ValueError("Please set MONGO_URL in your environment variables.")
 
     MONGO_LOG_DB_NAME = os.environ.get("MONGO_LOG_DB_NAME")
     if not MONGO_LOG_DB_NAME: raise ValueError("Please set MONGO_LOG_DB_NAME in your environment variables.")
 
     # Initialize database
-    mongo_client = MongoClient(MONGO_URL)
-    _mongo_log_db = mongo_client[MONGO_LOG_DB_NAME]
-    return _mongo_log_db
\ No newline at end of file
+    _mongo_log_db = get_mongo_client()[MONGO_LOG_DB_NAME]
+    return _mongo_log_db
+
+def get_async_mongo_db() -> Any:
+    """ Returns the main database on the AsyncMongoClient of the running event loop. """
+    MONGO_DB_NAME = os.environ.get("MONGO_DB_NAME")
+    if not MONGO_DB_NAME: raise ValueError("Please set MONGO_DB_NAME in your environment variables.")
+    return get_async_mongo_client()[MONGO_DB_NAME]
+
+def get_async_mongo_log_db() -> Any:
+    """ Returns the log database on the AsyncMongoClient of the running event loop. """
+    MONGO_LOG_DB_NAME = os.environ.get("MONGO_LOG_DB_NAME")
+    if not MONGO_LOG_DB_NAME: raise ValueError("Please set MONGO_LOG_DB_NAME in your environment variables.")
+    return get_async_mongo_client()[MONGO_LOG_DB_NAME]
+
+def reset_mongo_dbs() -> None:
+    """ Drops the cached databases, e.g. after their client was closed. They will be recreated on next use. """
+    global _mongo_db, _mongo_log_db
+    _mongo_db = None
+    _mongo_log_db = None
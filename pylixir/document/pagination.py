@@ -0,0 +1,130 @@
+import base64
+import binascii
+from dataclasses import dataclass
+from typing import Any, Generic, Sequence, TypeVar
+
+from bson import json_util
+from bson.json_util import CANONICAL_JSON_OPTIONS
+from pymongo import ASCENDING, DESCENDING
+
+from .indexes import IndexKey, to_mongo_field
+
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+	from .document import Document
+
+
+"""
+Keyset pagination
+
+db_find_page() loads a page of documents in a fixed order, and returns a token that continues after the last one:
+
+	page = Project.db_find_page({"fk_user_id": user_id}, sort=(("last_opened", DESCENDING),), page_size=50)
+	page.objs
+	next_page = Project.db_find_page({"fk_user_id": user_id}, sort=(("last_opened", DESCENDING),), page_size=50, after=page.next_token)
+
+Instead of skipping the earlier documents (which mongo still has to walk, so deep pages get slower), each page queries for the documents after the last
+sort key seen, so every page costs the same. _id is appended to the sort as a tie-breaker. For the query to be O(page size), declare an index matching the
+query's equality fields followed by the sort (see indexes.py), e.g. Index("fk_user_id", ("last_opened", DESCENDING), ("_id", DESCENDING)).
+
+The token is an opaque, url-safe string, so it can be stored as a str field of a Page_ or Frame_ and kept in the URL (strings are written to the query string as is).
+A token only works with the sort it was created with. Documents inserted or updated behind the token's position are not seen by later pages.
+Sort fields must hold a single value per document (not lists).
+"""
+
+D = TypeVar('D')
+
+SortKey = IndexKey
+""" A field, or a (field, direction) tuple. The direction defaults to ASCENDING. """
+
+@dataclass
+class DocumentPage(Generic[D]):
+	""" A page of documents loaded by db_find_page(). """
+	objs: list[D]
+	next_token: str | None
+	""" Pass as after= to load the next page. None if this is the last page. """
+
+	@property
+	def has_more(self) -> bool:
+		return self.next_token is not None
+
+def resolve_sort(document_cls: type['Document'], sort: Sequence[SortKey]) -> list[tuple[str, int]]:
+	""" Returns the sort as (mongo field, direction), with _id appended as a tie-breaker in the direction of the last key. """
+	resolved: list[tuple[str, int]] = []
+	for key in sort:
+		field_, direction = key if isinstance(key, tuple) else (key, ASCENDING)
+		if direction not in (ASCENDING, DESCENDING):
+			raise ValueError(f"Expected a sort direction of ASCENDING or DESCENDING. Instead received {direction}.")
+		resolved.append((to_mongo_field(document_cls, field_), direction))
+
+	if not any(mongo_field == "_id" for mongo_field, _direction in resolved):
+		resolved.append(("_id", resolved[-1][1] if resolved else ASCENDING))
+	elif resolved[-1][0] != "_id":
+		raise ValueError("_id must be the last sort key, since it is the tie-breaker.")
+	return resolved
+
+def encode_page_token(sort: list[tuple[str, int]], document: dict[str, Any]) -> str:
+	""" Returns a token holding the sort key of the document. """
+	values = [_get_value(document, mongo_field) for mongo_field, _direction in sort]
+	payload = json_util.dumps({ "s": _sort_signature(sort), "v": values }, json_options=CANONICAL_JSON_OPTIONS) # Canonical, so that e.g. ints and floats round trip
+	return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_page_token(sort: list[tuple[str, int]], token: str) -> list[Any]:
+	""" Returns the sort key held by the token. """
+	try:
+		payload = json_util.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+		token_sort = payload["s"]
+		values = payload["v"]
+	except (binascii.Error, ValueError, TypeError, KeyError):
+		raise ValueError("Invalid page token.")
+	if token_sort != _sort_signature(sort) or not isinstance(values, list) or len(values) != len(sort):
+		raise ValueError("This page token was created for a different sort.")
+	return values
+
+def _sort_signature(sort: list[tuple[str, int]]) -> str:
+	""" e.g. "title,-last_opened,-_id" """
+	return ",".join(mongo_field if direction == ASCENDING else f"-{mongo_field}" for mongo_field, direction in sort)
+
+def build_keyset_query(sort: list[tuple[str, int]], values: list[Any]) -> dict[str, Any]:
+	""" Returns a query matching the documents that come after the sort key in the sort order.
+
+	For sort (a, b, _id), that's: a after its value, or a equal and b after its value, or a and b equal and _id after its value. """
+	branches: list[dict[str, Any]] = []
+	for i, (mongo_field, direction) in enumerate(sort):
+		branch: dict[str, Any] = { sort_field: value for (sort_field, _direction), value in zip(sort[:i], values[:i]) }
+		after = _after(mongo_field, direction, values[i])
+		if after is None:
+			continue
+		branches.append(branch | after if mongo_field not in branch else { "$and": [branch, after] })
+	return { "$or": branches } if branches else { "_id": { "$in": [] } }
+
+def _after(mongo_field: str, direction: int, value: Any) -> dict[str, Any] | None:
+	""" Returns the condition for values after this one, or None if nothing comes after it. mongo sorts null (and missing) values before all others. """
+	if value is None:
+		return { mongo_field: { "$ne": None } } if direction == ASCENDING else None
+	if direction == ASCENDING:
+		return { mongo_field: { "$gt": value } }
+	# mongo only compares values of the same type, so the nulls sorted after a value in descending order must be matched separately
+	return { "$or": [{ mongo_field: { "$lt": value } }, { mongo_field: None }] }
+
+def _get_value(document: dict[str, Any], mongo_field: str) -> Any:
+	value: Any = document
+	for part in mongo_field.split("."):
+		if not isinstance(value, dict):
+			return None
+		value = value.get(part)
+	if isinstance(value, list):
+		raise ValueError(f"Can't paginate by '{mongo_field}', since it holds a list.")
+	return value
+
+def add_sort_to_projection(projection: dict[str, int], sort: list[tuple[str, int]]) -> dict[str, int]:
+	""" Returns the projection, extended to load the sort fields, which the page token is built from. """
+	projection = dict(projection)
+	for mongo_field, _direction in sort:
+		if any(mongo_field == projected or mongo_field.startswith(projected + ".") for projected in projection):
+			continue
+		# mongo rejects overlapping paths, so replace any projected subfields with the whole field
+		for projected in [projected for projected in projection if projected.startswith(mongo_field + ".")]:
+			del projection[projected]
+		projection[mongo_field] = 1
+	return projection
@@ -0,0 +1,171 @@
+from typing import Any, Generic, TypeVar
+
+from ..typing.fields.field_path import FieldPath
+from ..typing.fields.field_schema import FieldSchema
+from .document_context import DocumentContext
+
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+	from .document import Document
+
+
+"""
+Partial documents
+
+Document.db_find_one() and db_find_many() accept fields=(Cls.title, FieldPath.for_(Cls, Cls.inner, Inner.x), ...).
+Only those fields are requested from mongo (via a projection), and the results are returned as read-only PartialDocument views instead of Document instances.
+
+Top-level fields are read as attributes (partial.title). Nested FieldPaths are read by subscripting (partial[field_path]).
+_id is always loaded. Accessing a field that wasn't loaded raises an UnloadedFieldError.
+NOTE: __class_validation__ takes a full Document, so it is not run against partial views. __class_query__ is still applied.
+"""
+
+D = TypeVar('D', bound='Document')
+
+ProjectedField = FieldSchema | FieldPath
+
+class UnloadedFieldError(AttributeError):
+	""" Raised when accessing a field that was not loaded into a PartialDocument. """
+
+class PartialDocument(Generic[D]):
+	""" A read-only view of the fields of a Document that were loaded with a projection. """
+	__slots__ = ("_document_cls", "_values", "_path_values")
+
+	def __init__(self, document_cls: type[D], values: dict[str, Any], path_values: dict[FieldPath, Any]) -> None:
+		object.__setattr__(self, "_document_cls", document_cls)
+		object.__setattr__(self, "_values", values)
+		object.__setattr__(self, "_path_values", path_values)
+
+	@property
+	def document_cls(self) -> type[D]:
+		""" The Document class this is a partial view of. """
+		return self._document_cls
+
+	def loaded_fields(self) -> tuple[str, ...]:
+		""" Returns the names of the top-level fields that were loaded. """
+		return tuple(self._values)
+
+	def __getattr__(self, name: str) -> Any:
+		# Only called for names that aren't slots, properties or methods
+		values = object.__getattribute__(self, "_values")
+		if name in values:
+			return values[name]
+		document_cls = object.__getattribute__(self, "_document_cls")
+		if name in document_cls.__bsonable_fields__:
+			raise UnloadedFieldError(f"Field '{name}' of '{document_cls.__name__}' was not loaded. Add it to fields=... to load it.")
+		raise AttributeError(f"'{document_cls.__name__}' has no field '{name}'.")
+
+	def __getitem__(self, field: ProjectedField) -> Any:
+		""" Returns the value of a loaded field, which may be a nested FieldPath. """
+		if isinstance(field, FieldSchema):
+			return getattr(self, field.field_name)
+		if field in self._path_values:
+			return self._path_values[field]
+		parts = field.get_parts()
+		if len(parts) == 1:
+			return getattr(self, parts[0])
+		if parts[0] in self._values:
+			return _navigate(self._values[parts[0]], parts[1:])
+		raise UnloadedFieldError(f"Field path '{field}' was not loaded. Add it to fields=... to load it.")
+
+	def __setattr__(self, name: str, value: Any) -> None:
+		raise AttributeError(f"PartialDocument is read-only. Load the full '{self._document_cls.__name__}' to modify '{name}'.")
+
+	def __delattr__(self, name: str) -> None:
+		raise AttributeError(f"PartialDocument is read-only. Load the full '{self._document_cls.__name__}' to modify '{name}'.")
+
+	def __repr__(self) -> str:
+		loaded = ", ".join([f"{name}={value!r}" for name, value in self._values.items()] + [f"{path}={value!r}" for path, value in self._path_values.items()])
+		return f"PartialDocument[{self._document_cls.__name__}]({loaded})"
+
+def _navigate(value: Any, parts: tuple[str, ...]) -> Any:
+	""" Navigates through nested dataclass attributes. """
+	for part in parts:
+		value = getattr(value, part)
+	return value
+
+def build_projection(document_cls: type['Document'], fields: tuple[ProjectedField, ...]) -> tuple[dict[str, int], dict[str, FieldSchema], dict[FieldPath, FieldSchema]]:
+	""" Returns the mongo projection for the fields, along with the top-level fields and nested field paths it loads. """
+	top_level_fields: dict[str, FieldSchema] = {}
+	nested_fields: dict[FieldPath, FieldSchema] = {}
+
+	for field in fields:
+		if isinstance(field, FieldPath):
+			if not issubclass(document_cls, field.containing_cls()):
+				raise ValueError(f"Field path '{field}' does not belong to '{document_cls.__name__}'.")
+			parts = field.get_parts()
+			if any(part.startswith(("[", "{")) for part in parts):
+				raise ValueError(f"Field path '{field}' can't be projected. Only paths through dataclass fields are supported (no list indices or dict keys).")
+			if len(parts) == 1:
+				top_level_fields[parts[0]] = _get_field_schema(document_cls, parts[0])
+			else:
+				nested_fields[field] = field.field_schema()
+		elif isinstance(field, FieldSchema):
+			top_level_fields[field.field_name] = _get_field_schema(document_cls, field.field_name)
+		else:
+			raise TypeError(f"Expected a FieldSchema or FieldPath to project. Instead received {type(field).__name__}.")
+
+	projection = { "_id": 1 }
+	for field_name in top_level_fields:
+		projection[field_name] = 1
+		projection[field_name + "__legacy__"] = 1 # See BsonableDataclass._missing_field_value
+	for field_path in nested_fields:
+		# Skip paths already covered by a top-level field (mongo rejects overlapping projections)
+		if field_path.get_parts()[0] not in top_level_fields:
+			projection[field_path.as_mongo_db_dot_notation()] = 1
+	return projection, top_level_fields, nested_fields
+
+def _get_field_schema(document_cls: type['Document'], field_name: str) -> FieldSchema:
+	field_schema = document_cls.__bsonable_fields__.get(field_name)
+	if field_schema is None:
+		raise ValueError(f"'{document_cls.__name__}' has no field '{field_name}'.")
+	return field_schema
+
+def from_projected_document(document_cls: type[D], document: dict[str, Any], top_level_fields: dict[str, FieldSchema], nested_fields: dict[FieldPath, FieldSchema]) -> PartialDocument[D]:
+	""" Deserializes a document loaded with build_projection() into a PartialDocument. """
+	from ..typing.serialization.bson_to_type_expectation import bson_to_type_expectation
+	from ..typing.serialization.trusted_deserialization import trusted_deserialization
+
+	document_id = document.get("_id")
+	if not document_id:
+		raise ValueError(f"Projected document of type '{document_cls.__name__}' is missing an _id.")
+	context = DocumentContext(
+		document_path=FieldPath.for_(document_cls),
+		document_id=document_id,
+		collection_name=document_cls.get_collection_name()
+	)
+
+	values: dict[str, Any] = {}
+	path_values: dict[FieldPath, Any] = {}
+	with trusted_deserialization():
+		for field_name, field_schema in ({ "_id": _get_field_schema(document_cls, "_id") } | top_level_fields).items():
+			if field_name in document:
+				values[field_name] = bson_to_type_expectation(document[field_name], field_schema.type_expectation, context.subpath(field_name))
+			else:
+				values[field_name] = document_cls._missing_field_value(document, field_name, field_schema, context)
+
+		for field_path, field_schema in nested_fields.items():
+			parts = field_path.get_parts()
+			if parts[0] in values:
+				path_values[field_path] = _navigate(values[parts[0]], parts[1:])
+				continue
+
+			# Walk down the embedded documents
+			bson: Any = document
+			field_context = context
+			missing = False
+			for part in parts:
+				field_context = field_context.subpath(part)
+				if not isinstance(bson, dict) or part not in bson:
+					missing = True
+					break
+				bson = bson[part]
+
+			if missing:
+				if not field_schema.schema_config.has_default():
+					raise ValueError(f"Error loading field path '{field_path}'. Document is missing a value for the field.\n\n{field_context}")
+				path_values[field_path] = field_schema.schema_config.get_default()
+			else:
+				path_values[field_path] = bson_to_type_expectation(bson, field_schema.type_expectation, field_context)
+
+	return PartialDocument(document_cls, values, path_values)
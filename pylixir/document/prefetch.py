@@ -0,0 +1,103 @@
+from typing import Any, Iterable, TypeVar
+
+from ..typing.fields.field_schema import FieldSchema
+from .unit_of_work import current_unit_of_work
+
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+	from .document import Document
+
+
+"""
+Reference prefetching
+
+Loading the Document referenced by a DocumentId field one obj at a time costs a query per obj. prefetch() loads the referenced Documents for many objs
+with one $in query per referenced class, and attaches them to the objs. Document.get_reference() then returns them without a query.
+
+	projects = Project.db_find_many({"fk_user_id": user_id})
+	prefetch(projects, Project.fk_org_id, (Project.fk_owner_id, User.fk_team_id)) # A tuple follows references across several hops
+	projects[0].get_reference(Project.fk_org_id)
+
+Only top-level DocumentId fields (see DocumentInfo.reference_fields) can be prefetched.
+Inside a unit of work (see unit_of_work.py), Documents already loaded in the request are reused, and the Documents prefetched join the identity map,
+so the unit of work also acts as a request-scoped loader: get_reference() on an obj that wasn't prefetched reuses what any earlier query loaded.
+"""
+
+D = TypeVar('D', bound='Document')
+
+__prefetched__ = "__prefetched__"
+
+PrefetchPath = FieldSchema | tuple[FieldSchema, ...]
+
+def prefetch(objs: Iterable['Document'], *paths: PrefetchPath) -> None:
+	""" Loads and attaches the Documents referenced by each path, using one query per referenced class and hop. """
+	objs = list(objs)
+	for path in paths:
+		hops = path if isinstance(path, tuple) else (path,)
+		if not hops:
+			raise ValueError("Expected at least one field to prefetch.")
+		current_objs = objs
+		for field_schema in hops:
+			current_objs = _prefetch_field(current_objs, field_schema)
+
+def load_by_ids(document_cls: type[D], ids: Iterable[Any]) -> dict[Any, D]:
+	""" Returns the Documents with these _ids (skipping any that don't exist), using one $in query for those not already loaded in the current unit of work. """
+	unit = current_unit_of_work()
+	loaded: dict[Any, D] = {}
+	missing_ids: list[Any] = []
+	for _id in dict.fromkeys(ids): # Dedupe, keeping the order
+		obj = unit.get(document_cls, _id) if unit is not None else None
+		if obj is not None:
+			loaded[_id] = obj
+		else:
+			missing_ids.append(_id)
+
+	if missing_ids:
+		for obj in document_cls.db_find_many({ "_id": { "$in": missing_ids } }):
+			loaded[obj._id] = obj
+	return loaded
+
+def get_prefetched(obj: 'Document', field_name: str, _id: Any) -> tuple[bool, 'Document | None']:
+	""" Returns (True, referenced obj or None if it doesn't exist) if the field was prefetched for this _id, otherwise (False, None). """
+	prefetched = obj.__dict__.get(__prefetched__)
+	if prefetched is None or field_name not in prefetched:
+		return False, None
+	prefetched_id, referenced_obj = prefetched[field_name]
+	if prefetched_id != _id: # The field was changed since it was prefetched
+		return False, None
+	return True, referenced_obj
+
+def _prefetch_field(objs: list['Document'], field_schema: FieldSchema) -> list['Document']:
+	""" Prefetches a single reference field, and returns the distinct referenced objs. """
+	field_name = field_schema.field_name
+
+	# Group the ids to load by the referenced class
+	referenced_cls_by_cls: dict[type['Document'], type['Document']] = {}
+	ids_by_cls: dict[type['Document'], list[Any]] = {}
+	for obj in objs:
+		referenced_cls = referenced_cls_by_cls.get(type(obj))
+		if referenced_cls is None:
+			referenced_cls = referenced_cls_by_cls[type(obj)] = _get_referenced_cls(type(obj), field_schema)
+		_id = getattr(obj, field_name)
+		if _id is not None:
+			ids_by_cls.setdefault(referenced_cls, []).append(_id)
+
+	loaded_by_cls = { referenced_cls: load_by_ids(referenced_cls, ids) for referenced_cls, ids in ids_by_cls.items() }
+
+	# Attach
+	referenced_objs: dict[int, 'Document'] = {}
+	for obj in objs:
+		_id = getattr(obj, field_name)
+		referenced_obj = loaded_by_cls.get(referenced_cls_by_cls[type(obj)], {}).get(_id) if _id is not None else None
+		obj.__dict__.setdefault(__prefetched__, {})[field_name] = (_id, referenced_obj) # Set through __dict__ so that this also works for frozen Documents
+		if referenced_obj is not None:
+			referenced_objs[id(referenced_obj)] = referenced_obj
+	return list(referenced_objs.values())
+
+def _get_referenced_cls(document_cls: type['Document'], field_schema: FieldSchema) -> type['Document']:
+	if not issubclass(document_cls, field_schema.containing_cls):
+		raise ValueError(f"Can't prefetch field '{field_schema.field_name}' of '{field_schema.containing_cls.__name__}' for a '{document_cls.__name__}'.")
+	referenced_cls = document_cls.get_references().get(field_schema.field_name)
+	if referenced_cls is None:
+		raise ValueError(f"Field '{field_schema.field_name}' of '{document_cls.__name__}' is not a DocumentId reference to another Document.")
+	return referenced_cls
@@ -0,0 +1,106 @@
+import hashlib
+import threading
+import time
+from typing import Any
+
+from bson import json_util
+from bson.json_util import CANONICAL_JSON_OPTIONS
+
+from .change_tracking import copy_bson
+from .document_cache import CacheBackend, LRUCacheBackend
+from . import instrumentation
+
+
+"""
+Query cache
+
+Document classes can opt in to caching the results of db_find_many() and db_count_documents() (and their async versions):
+
+	class Project(Document):
+		__query_cache__ = QueryCachePolicy(max_size=1000, ttl=30)
+
+Entries are keyed by the collection and a hash of the query (including __class_query__), sort, limit, skip and projection.
+Every write made through Document methods or a BulkWriter (inserts, updates, upserts, deletes) bumps the collection's generation, which is part of the key,
+so all of the collection's cached queries miss from then on, and the stale entries are left for the backend to evict. Writes that bypass Document
+(e.g. get_collection().update_one(...)) are not seen: either call invalidate_queries() or rely on the ttl.
+
+Generations are kept in-process. With a backend shared between processes, writes made by the other processes are only seen once the entries expire.
+
+Hits and misses are counted by the policy (see stats()), and reported to instrumentation as 'query_cache_hit' / 'query_cache_miss' operations.
+"""
+
+_generations: dict[str, int] = {}
+_generations_lock = threading.Lock()
+
+def invalidate_queries(collection_name: str) -> None:
+	""" Makes every cached query of the collection miss. """
+	with _generations_lock:
+		_generations[collection_name] = _generations.get(collection_name, 0) + 1
+
+def get_generation(collection_name: str) -> int:
+	return _generations.get(collection_name, 0)
+
+class QueryCachePolicy:
+	""" Configures the query cache for a Document class (see __query_cache__). """
+	def __init__(self, max_size: int = 1024, ttl: float | None = 60, backend: CacheBackend | None = None) -> None:
+		"""
+		Args:
+			max_size: The maximum number of query results kept by the default LRU backend. Ignored if a backend is passed in.
+			ttl: Seconds before an entry expires, or None to keep entries until they're evicted or invalidated.
+			backend: Where to store the entries. Defaults to an LRUCacheBackend.
+		"""
+		if ttl is not None and ttl <= 0:
+			raise ValueError(f"ttl must be positive or None. Instead received {ttl}.")
+		self.ttl = ttl
+		self.backend: CacheBackend = backend if backend is not None else LRUCacheBackend(max_size)
+		self.hits = 0
+		self.misses = 0
+		self.evictions = 0
+		""" Entries evicted by the backend to make room, or expired by the ttl. """
+
+	@staticmethod
+	def key(collection_name: str, operation: str, filter_: dict[str, Any], sort: Any = None, limit: int | None = None, skip: int | None = None, projection: dict[str, Any] | None = None) -> str | None:
+		""" Returns the cache key for a query, or None if the query can't be encoded (and so isn't cached).
+		Top-level query fields are sorted, since their order doesn't change what matches. Nested documents keep their order, since it does. """
+		if isinstance(sort, dict):
+			sort = list(sort.items())
+		try:
+			encoded = json_util.dumps([operation, sorted(filter_.items()), sort, limit or None, skip or None, projection], json_options=CANONICAL_JSON_OPTIONS)
+		except TypeError:
+			return None
+		digest = hashlib.blake2b(encoded.encode(), digest_size=16).hexdigest()
+		return f"{collection_name}:{get_generation(collection_name)}:{digest}" # The generation is read before querying, so a write made during the query isn't hidden
+
+	def get(self, collection_name: str, key: str) -> Any | None:
+		""" Returns a copy of the cached result, or None. """
+		start_time = time.perf_counter()
+		entry = self.backend.get(key)
+		if entry is not None:
+			expires_at, value = entry
+			if expires_at is not None and expires_at <= time.monotonic():
+				self.backend.delete(key)
+				self.evictions += 1
+				entry = None
+		if entry is None:
+			self.misses += 1
+			instrumentation.record(collection_name, "query_cache_miss", start_time)
+			return None
+		self.hits += 1
+		instrumentation.record(collection_name, "query_cache_hit", start_time, document_count=len(value) if isinstance(value, list) else 0)
+		return copy_bson(value) # Deserializing modifies documents, so never hand out the stored ones
+
+	def set(self, key: str, value: Any) -> None:
+		""" Stores a query result. Pass in a copy of any documents, as they are stored as is. """
+		expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+		self.evictions += self.backend.set(key, (expires_at, value))
+
+	def stats(self) -> dict[str, int]:
+		""" Returns the hit, miss and eviction counters. """
+		return {
+			"hits": self.hits,
+			"misses": self.misses,
+			"evictions": self.evictions
+		}
+
+	def reset_stats(self) -> None:
+		self.hits = self.misses = self.evictions = 0
@@ -0,0 +1,206 @@
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Any, Iterator, TypeVar
+
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+	from flask import Flask, Response
+	from .document import Document
+
+
+"""
+Identity map and unit of work
+
+Inside a unit of work, loading the same document twice returns the same instance, keyed by (collection name, _id):
+	- db_find_one({"_id": ...}), db_require_one_by_id() and deference_pointer() (and deference_pointers()) return the instance already loaded without querying mongo.
+	- Other queries still go to mongo, but any document already loaded is returned as the existing instance (including its unsaved changes).
+	- Writes that return the new state of the document (e.g. db_find_one_and_update()) refresh the existing instance, and field updates (db_update_field()) patch it.
+	  If a write is queued for a document they may match, the unit of work is flushed first, so the queued write is neither lost nor sent after them.
+
+With defer_writes (the default), db_insert_self() and db_update_self() only validate and queue the document. The queued writes are serialized
+when the unit of work is flushed and sent with a BulkWriter, as one unordered bulk_write per collection, so a document updated several times in a request is written once.
+Deletes and field updates (db_update_self_field(), db_update_field()) are never deferred. Deleting a document drops its queued write.
+Queries don't see queued inserts, except by _id through the identity map.
+
+	with begin_unit_of_work():          # Outside Flask. Flushes on exit, discards the queued writes if an error is raised.
+		...
+	register_unit_of_work(app)          # Flask: a unit of work per request, flushed after the request unless the response is a server error.
+"""
+
+D = TypeVar('D', bound='Document')
+
+_current: ContextVar['UnitOfWork | None'] = ContextVar("_current_unit_of_work", default=None)
+
+class UnitOfWork:
+	""" Tracks the Documents loaded in a request (the identity map), and the writes queued for them. """
+	def __init__(self, defer_writes: bool = True, chunk_size: int = 1000) -> None:
+		self.defer_writes = defer_writes
+		self.chunk_size = chunk_size
+		""" The maximum number of writes per bulk_write when flushing """
+		self._identity_map: dict[tuple[str, Any], 'Document'] = {}
+		self._pending_inserts: dict[tuple[str, Any], 'Document'] = {}
+		self._pending_updates: dict[tuple[str, Any], 'Document'] = {}
+
+	@staticmethod
+	def _key(obj: 'Document') -> tuple[str, Any]:
+		return (type(obj).get_collection_name(), obj._id)
+
+	# region: Identity map
+	def get(self, document_cls: type[D], _id: Any) -> D | None:
+		""" Returns the loaded instance with this _id, if it is an instance of document_cls. """
+		obj = self._identity_map.get((document_cls.get_collection_name(), _id))
+		if obj is not None and isinstance(obj, document_cls):
+			return obj
+		return None
+
+	def register(self, obj: D) -> D:
+		""" Adds a freshly loaded obj to the identity map. If an instance with the same _id was already loaded, returns that instance instead. """
+		key = self._key(obj)
+		existing = self._identity_map.get(key)
+		if existing is None:
+			self._identity_map[key] = obj
+			return obj
+		if isinstance(existing, type(obj)):
+			return existing
+		# Loaded as an unrelated class (e.g. through a different __class_getitem__ subclass). Don't share the instance.
+		return obj
+
+	def refresh(self, obj: D) -> D:
+		""" Adds an obj holding the latest state of the document (e.g. returned by find_one_and_update) to the identity map, updating the existing instance in place. """
+		key = self._key(obj)
+		existing = self._identity_map.get(key)
+		if existing is None or existing is obj:
+			self._identity_map[key] = obj
+			return obj
+		if not isinstance(existing, type(obj)):
+			return obj
+		if self.has_pending_write(existing):
+			raise ValueError(f"Can't refresh '{type(obj).__name__}' with _id '{obj._id}', since it has a queued write that would be lost. Flush the unit of work first.")
+		existing.__dict__.clear()
+		existing.__dict__.update(obj.__dict__)
+		return existing
+
+	def forget(self, document_cls: type['Document'], _id: Any) -> None:
+		""" Removes the instance with this _id from the identity map (e.g. because it is out of date), so that it is reloaded next time. """
+		self._identity_map.pop((document_cls.get_collection_name(), _id), None)
+
+	def evict(self, obj: 'Document') -> None:
+		""" Removes the obj from the identity map and drops any write queued for it. """
+		key = self._key(obj)
+		if self._identity_map.get(key) is obj:
+			del self._identity_map[key]
+		self._pending_inserts.pop(key, None)
+		self._pending_updates.pop(key, None)
+	# endregion
+
+	# region: Deferred writes
+	def defer_insert(self, obj: 'Document') -> None:
+		""" Queues the obj to be inserted on flush. Call __before_saving__ first. """
+		key = self._key(obj)
+		if key in self._pending_inserts and self._pending_inserts[key] is not obj:
+			raise ValueError(f"A different '{type(obj).__name__}' with _id '{obj._id}' is already queued to be inserted.")
+		self._pending_inserts[key] = obj
+		self._identity_map.setdefault(key, obj)
+
+	def defer_update(self, obj: 'Document') -> None:
+		""" Queues the obj to be saved on flush. Call __before_saving__ first. """
+		key = self._key(obj)
+		if self._pending_inserts.get(key) is obj:
+			return # The insert will save the latest state
+		self._pending_updates[key] = obj
+
+	def is_pending_insert(self, obj: 'Document') -> bool:
+		return self._pending_inserts.get(self._key(obj)) is obj
+
+	def has_pending_write(self, obj: 'Document') -> bool:
+		key = self._key(obj)
+		return self._pending_inserts.get(key) is obj or self._pending_updates.get(key) is obj
+
+	def has_pending_writes(self, collection_name: str) -> bool:
+		""" Returns whether any write is queued for a document of the collection. """
+		return any(key[0] == collection_name for key in self._pending_inserts) or any(key[0] == collection_name for key in self._pending_updates)
+
+	def discard(self) -> None:
+		""" Drops the queued writes without sending them. """
+		self._pending_inserts.clear()
+		self._pending_updates.clear()
+
+	def flush(self) -> None:
+		""" Sends the queued writes with a BulkWriter (see bulk_writer.py): one unordered bulk_write per collection. """
+		from .bulk_writer import BulkWriter
+		
+		if not self._pending_inserts and not self._pending_updates:
+			return
+
+		# Serialize everything before writing anything, so that a validation error doesn't leave a partial flush
+		writer = BulkWriter(chunk_size=self.chunk_size, ordered=False)
+		try:
+			for obj in self._pending_inserts.values():
+				writer._queue_insert(obj) # __before_saving__ already ran when the write was deferred
+			for obj in self._pending_updates.values():
+				writer._queue_update(obj)
+		except Exception:
+			writer.discard()
+			raise
+		self.discard()
+
+		writer.flush()
+		if writer.unmatched_count:
+			raise ValueError(f"Error flushing the unit of work. {writer.unmatched_count} of the updated documents no longer exist.")
+	# endregion
+
+def current_unit_of_work() -> UnitOfWork | None:
+	""" Returns the active unit of work, if any. """
+	return _current.get()
+
+@contextmanager
+def begin_unit_of_work(defer_writes: bool = True) -> Iterator[UnitOfWork]:
+	""" Runs the block in a unit of work, flushing the queued writes on exit. If a unit of work is already active, joins it instead. """
+	existing = _current.get()
+	if existing is not None:
+		yield existing
+		return
+
+	unit = UnitOfWork(defer_writes=defer_writes)
+	token = _current.set(unit)
+	try:
+		yield unit
+		unit.flush()
+	finally:
+		unit.discard()
+		_current.reset(token)
+
+# region: Flask
+def register_unit_of_work(app: 'Flask', defer_writes: bool = True) -> None:
+	""" Runs each Flask request in its own unit of work. Queued writes are flushed after the view returns, unless the response is a server error. """
+	from flask import g
+
+	@app.before_request
+	def _begin_unit_of_work() -> None:
+		unit = UnitOfWork(defer_writes=defer_writes)
+		g._unit_of_work = unit
+		g._unit_of_work_token = _current.set(unit)
+
+	@app.after_request
+	def _flush_unit_of_work(response: 'Response') -> 'Response':
+		unit: UnitOfWork | None = g.get("_unit_of_work")
+		if unit is not None:
+			if response.status_code >= 500:
+				unit.discard()
+			else:
+				unit.flush() # Raising here turns the response into a server error, so the client doesn't think the writes were saved
+		return response
+
+	@app.teardown_request
+	def _end_unit_of_work(exception: BaseException | None) -> None:
+		unit: UnitOfWork | None = g.pop("_unit_of_work", None)
+		token: Token | None = g.pop("_unit_of_work_token", None)
+		if unit is not None:
+			unit.discard()
+		if token is not None:
+			try:
+				_current.reset(token)
+			except ValueError:
+				# The token was created in a different context (e.g. the request was handed off to another thread). Just clear the var.
+				_current.set(None)
+# endregion
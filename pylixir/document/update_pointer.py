@@ -1,12 +1,18 @@
 from typing import Any, TypeVar
+import time
 
 from flask_login import current_user
 
 from ..typing.bsonable_dataclass.bsonable_dataclass import BsonableDataclass
 from .document import Document
-from .document_id import PUBLIC
+from .document_context import DocumentContext
+from . import instrumentation
+from .unit_of_work import current_unit_of_work
+from .document_id import DocumentId, PUBLIC
 from ..utilities.result import UpdateFieldResult
 from ..typing.fields.field_pointer import DocumentFieldPointer
+from ..typing.fields.field_path import FieldPath
+from ..typing.fields.field_schema import FieldSchema
 from ..typing.fields.schema_config import _DocumentSchemaConfig
 from ..typing.registration.get_type_expectation_from_type_annotation import get_type_expectation_from_type_annotation
 from ..utilities.undefined import UNDEFINED, Undefined
@@ -16,7 +22,9 @@ V = TypeVar('V', bound=BsonableDataclass)
 
 def validate_document_ownership(document: Document):
     # Enforce that the user owners this document
-    document_owner = document.get_owner()
+    _validate_owner(document.get_owner())
+
+def _validate_owner(document_owner: DocumentId) -> None:
     if not document_owner == PUBLIC:
         # First check we have a logged in user
         if not current_user.is_authenticated:
@@ -28,47 +36,200 @@ def validate_document_ownership(document: Document):
             raise ValueError(f"Error: This pointer points to a field within a document that doesn't belong to the logged in user '{logged_in_user_id}'. Cannot access.")
 
 def update_pointer_value(pointer: DocumentFieldPointer, new_value: Any) -> UpdateFieldResult:
-    """ UserContext.update_pointer_value() ensures that the logged in user can only update documents that belong to them. """
+    """ UserContext.update_pointer_value() ensures that the logged in user can only update documents that belong to them.
+    
+    If the document class can express ownership as a query (see Document.__owner_query__), the ownership check is part of the update's filter,
+    so the field is updated in a single round trip without loading the document. Otherwise, or if the field has a document_update_validation_func
+    (which shouldn't see a document the user may not access), the document is loaded and checked first.
+    Documents the owner query doesn't match (e.g. whose owner is read from a legacy field) are loaded and checked after the update misses. """
     # Always validate pointer ownership and access controls
     document_cls = pointer.document_cls()
-    document = document_cls.db_require_one_by_id(pointer.document_id)
+    logged_in_user_id = current_user.get_id() if current_user.is_authenticated else None
+    owner_query = _get_update_owner_query(document_cls, [pointer.field_path], logged_in_user_id)
+    
+    if owner_query is None:
+        document = document_cls.db_require_one_by_id(pointer.document_id)
+
+        # VERY IMPORTANT
+        validate_document_ownership(document)
+
+        document.db_update_self_field(pointer.field_path, new_value)
+        return UpdateFieldResult(True, pointer.field_path)
+    
+    # VERY IMPORTANT: the owner query makes the update only match documents the logged in user may access
+    if not document_cls._update_fields(pointer.document_id, {pointer.field_path: new_value}, filter=owner_query):
+        # Nothing matched. Load the document to raise the same error as the check above would have.
+        # The owner query only matches a stored fk_user_id, so a document whose owner comes from a legacy field or the field default passes the check, and is updated here instead.
+        document = document_cls.db_require_one_by_id(pointer.document_id)
+        validate_document_ownership(document)
+        if not document_cls._update_fields(pointer.document_id, {pointer.field_path: new_value}, obj=document):
+            raise ValueError(f"Failed to update the field pointed to by {pointer}. The document changed while it was being updated.")
+    return UpdateFieldResult(True, pointer.field_path)
 
-    # VERY IMPORTANT
-    validate_document_ownership(document)
+def update_pointer_values(pointer_values: list[tuple[DocumentFieldPointer, Any]]) -> list[UpdateFieldResult]:
+    """ Updates several pointers at once (e.g. the fields of a submitted form), with the same ownership checks as update_pointer_value().
+    A document is loaded and checked before its updates are validated if update_pointer_value() would load it, i.e. if any of its fields has a document_update_validation_func.
+    
+    Every value is validated before anything is written. The pointers are grouped by document, and each document gets a single update_one with a single __version__ increment,
+    so the fields of one document are updated atomically. Separate documents are updated one after the other: if one fails, the documents before it stay updated. """
+    logged_in_user_id = current_user.get_id() if current_user.is_authenticated else None
+    
+    # Group by document, keeping the order the documents were first pointed to
+    updates_by_document: dict[tuple[type[Document], DocumentId], dict[FieldPath, Any]] = {}
+    for pointer, new_value in pointer_values:
+        document_updates = updates_by_document.setdefault((pointer.document_cls(), pointer.document_id), {})
+        if pointer.field_path in document_updates:
+            raise ValueError(f"The field pointed to by {pointer} is updated more than once.")
+        document_updates[pointer.field_path] = new_value
+    
+    # Check ownership and validate everything first
+    prepared: list[tuple[type[Document], DocumentId, dict[FieldPath, Any], dict[str, Any], dict | None, Document | None]] = []
+    for (document_cls, document_id), document_updates in updates_by_document.items():
+        owner_query = _get_update_owner_query(document_cls, list(document_updates), logged_in_user_id)
+        document = None
+        if owner_query is None:
+            document = document_cls.db_require_one_by_id(document_id)
+            # VERY IMPORTANT
+            validate_document_ownership(document)
+        update = document_cls._prepare_fields_update(document_id, document_updates)
+        prepared.append((document_cls, document_id, document_updates, update, owner_query, document))
+    
+    for document_cls, document_id, document_updates, update, owner_query, document in prepared:
+        # VERY IMPORTANT: the owner query makes the update only match documents the logged in user may access
+        if not document_cls._send_fields_update(document_id, document_updates, update, filter=owner_query, obj=document):
+            # As in update_pointer_value(), the owner may come from a legacy field or the field default, which the owner query doesn't match
+            document = document_cls.db_require_one_by_id(document_id)
+            validate_document_ownership(document)
+            if not document_cls._send_fields_update(document_id, document_updates, update, obj=document):
+                raise ValueError(f"Failed to update the fields of document {document_id}. The document changed while it was being updated.")
+    
+    return [UpdateFieldResult(True, pointer.field_path) for pointer, _new_value in pointer_values]
 
-    document.db_update_self_field(pointer.field_path, new_value)
-    return UpdateFieldResult(True, pointer.field_path)  
+def _get_update_owner_query(document_cls: type[Document], field_paths: list[FieldPath], user_id: DocumentId | None) -> dict | None:
+    """ Returns the owner query to check ownership with in the update's filter, or None if the document must be loaded and checked before the update is prepared. """
+    for field_path in field_paths:
+        field_schema = field_path.field_schema()
+        if isinstance(field_schema.schema_config, _DocumentSchemaConfig) and field_schema.schema_config.document_update_validation_func:
+            return None
+    return document_cls.__owner_query__(user_id)
 
 def deference_pointer(pointer: DocumentFieldPointer, expected_type: type[V] | Undefined = UNDEFINED) -> V:
-    """ Dereference the pointer value. """
-    from ..typing import type_registry
+    """ Dereference the pointer value.
     
-    # Get the document cls
-    document_cls = type_registry.document_info_list.type_id_to_cls(pointer.field_path.get_root_type_id())
+    If the document isn't already loaded (in the unit of work or the document cache), only the pointed-to field and the owner field are loaded from mongo,
+    and only that field is deserialized. Documents whose class overrides get_owner() or __class_validation__() are loaded whole instead (see Document.__owner_query__). """
+    return deference_pointers([pointer], expected_type)[0]
 
-    # Get the document from the database    
-    document = document_cls.db_find_one({ "_id": pointer.document_id})
-    if not document:
-        raise ValueError(f"Can't find document of type '{document_cls.__type_id__}' with _id '{pointer.document_id}'")
+def deference_pointers(pointers: list[DocumentFieldPointer], expected_type: type[V] | Undefined = UNDEFINED) -> list[V]:
+    """ Dereferences several pointers at once, with the same checks as deference_pointer(). Returns the values in the order of the pointers.
+    The documents that aren't already loaded are queried with one find per collection, projected to the pointed-to fields and the owner field. """
+    from ..typing import type_registry
+    
+    # Validate we can access these fields before querying anything
+    field_schemas = [_get_pointed_field_schema(pointer) for pointer in pointers]
+    
+    # Group by document cls
+    pointer_idxs_by_cls: dict[type[Document], list[int]] = {}
+    for idx, pointer in enumerate(pointers):
+        document_cls = type_registry.document_info_list.type_id_to_cls(pointer.field_path.get_root_type_id())
+        pointer_idxs_by_cls.setdefault(document_cls, []).append(idx)
     
-    # VERY IMPORTANT
-    # Validates whether this is being accessed by a logged in user
-    validate_document_ownership(document)
+    unit = current_unit_of_work()
+    values: list[Any] = [None] * len(pointers)
+    for document_cls, pointer_idxs in pointer_idxs_by_cls.items():
+        # Ownership can only be checked on a projection if it is read from fk_user_id, and there is no class validation to run on the whole document (see Document.__owner_query__)
+        can_project = document_cls.__owner_query__(None) is not None
+        
+        # Use the documents that are already loaded, and query the rest
+        documents: dict[Any, Document | dict[str, Any] | None] = {}
+        for idx in pointer_idxs:
+            document_id = pointers[idx].document_id
+            if document_id in documents:
+                continue
+            loaded_obj = unit.get(document_cls, document_id) if unit is not None else None
+            if loaded_obj is not None:
+                documents[document_id] = loaded_obj
+            elif not can_project:
+                documents[document_id] = document_cls.db_find_one({ "_id": document_id })
+            else:
+                documents[document_id] = document_cls._get_cached_document(document_id, match_class_query=True) # A copy of the whole raw document, which can be read like a projected one
+        
+        unloaded_idxs = [idx for idx in pointer_idxs if can_project and documents[pointers[idx].document_id] is None]
+        if unloaded_idxs:
+            document_ids = list(dict.fromkeys(pointers[idx].document_id for idx in unloaded_idxs))
+            projection = _merge_projection(["fk_user_id", "fk_user_id__legacy__"] + [mongo_field for idx in unloaded_idxs for mongo_field in _get_projected_fields(pointers[idx].field_path)])
+            query = { "_id": document_ids[0] } if len(document_ids) == 1 else { "_id": { "$in": document_ids } }
+            start_time = time.perf_counter()
+            found_documents = list(document_cls.get_collection().find(document_cls.__class_query__() | query, projection=projection))
+            instrumentation.record(document_cls.get_collection_name(), "find_one" if len(document_ids) == 1 else "find_many", start_time, document_count=len(found_documents), documents=found_documents, detail=query)
+            for document in found_documents:
+                documents[document["_id"]] = document
+        
+        for idx in pointer_idxs:
+            pointer = pointers[idx]
+            document = documents.get(pointer.document_id)
+            if not document:
+                raise ValueError(f"Can't find document of type '{document_cls.__type_id__}' with _id '{pointer.document_id}'")
+            
+            # VERY IMPORTANT
+            # Validates whether this is being accessed by a logged in user
+            if isinstance(document, Document):
+                validate_document_ownership(document)
+                field_value = pointer.field_path.navigate_into(document)
+            else:
+                context = DocumentContext(document_path=FieldPath.for_(document_cls), document_id=pointer.document_id, collection_name=document_cls.get_collection_name())
+                _validate_owner(_read_projected_field(document_cls, document, FieldPath.for_(document_cls).subfield("fk_user_id"), document_cls.__bsonable_fields__["fk_user_id"], context))
+                field_value = _read_projected_field(document_cls, document, pointer.field_path, field_schemas[idx], context)
+            
+            # Type check if expected_type is provided
+            if not isinstance(expected_type, Undefined):
+                # Generate a TypeExpectation from the annotation
+                type_expectation = get_type_expectation_from_type_annotation(expected_type)
+                type_expectation.validate(field_value, None)
+            values[idx] = field_value
     
-    # Validate we can access this field
+    return values
+
+def _get_pointed_field_schema(pointer: DocumentFieldPointer) -> FieldSchema:
+    """ Returns the FieldSchema of the pointed-to field, raising an error if it can't be accessed through a pointer. """
     field_schema = pointer.field_path.field_schema()
     if not isinstance(field_schema.schema_config, _DocumentSchemaConfig):
         raise ValueError(f"Field '{field_schema.field_name}' is not configured with DocumentFieldSchema. Attempted field access: {pointer}")
     if not field_schema.schema_config.allow_independent_update:
         raise ValueError(f"The field '{field_schema.field_name}' within class '{pointer.document_cls().__name__}' is not independently updateable.")
+    return field_schema
+
+def _get_projected_fields(field_path: FieldPath) -> list[str]:
+    """ Returns the mongo fields to project to read the field path. Top-level fields may be read from a legacy field (see BsonableDataclass._missing_field_value). """
+    mongo_field = field_path.as_mongo_db_dot_notation()
+    return [mongo_field, mongo_field + "__legacy__"] if len(field_path.get_parts()) == 1 else [mongo_field]
+
+def _merge_projection(mongo_fields: list[str]) -> dict[str, int]:
+    """ Returns a projection of the fields. mongo rejects overlapping paths, so subfields of a projected field are dropped. """
+    projection: dict[str, int] = {}
+    for mongo_field in sorted(set(mongo_fields), key=len):
+        if not any(mongo_field.startswith(projected + ".") for projected in projection):
+            projection[mongo_field] = 1
+    return projection
 
-    # Return the value
-    field_value = pointer.field_path.navigate_into(document)
+def _read_projected_field(document_cls: type[Document], document: dict[str, Any], field_path: FieldPath, field_schema: FieldSchema, context: DocumentContext) -> Any:
+    """ Deserializes the value at the field path of a raw (possibly projected) document. Only that value is deserialized. """
+    from ..typing.serialization.bson_to_type_expectation import bson_to_type_expectation
+    from ..typing.serialization.trusted_deserialization import trusted_deserialization
     
-    # Type check if expected_type is provided
-    if not isinstance(expected_type, Undefined):
-        # Generate a TypeExpectation from the annotation
-        type_expectation = get_type_expectation_from_type_annotation(expected_type)
-        type_expectation.validate(field_value, None)
-        
-    return field_value
\ No newline at end of file
+    parts = field_path.get_parts()
+    bson: Any = document
+    for part, mongo_part in zip(parts, field_path.as_mongo_db_dot_notation().split(".")):
+        context = context.subpath(part)
+        if not isinstance(bson, dict) or mongo_part not in bson:
+            if len(parts) == 1:
+                return document_cls._missing_field_value(document, part, field_schema, context)
+            if part.startswith("{") and part.endswith("}"):
+                raise KeyError(f"Dictionary key '{FieldPath.unescape_periods(part[1:-1])}' not found at '{field_path}'")
+            if not field_schema.schema_config.has_default():
+                raise ValueError(f"Error loading field path '{field_path}'. Document is missing a value for the field.\n\n{context}")
+            return field_schema.schema_config.get_default()
+        bson = bson[mongo_part]
+    
+    with trusted_deserialization():
+        return bson_to_type_expectation(bson, field_schema.type_expectation, context)
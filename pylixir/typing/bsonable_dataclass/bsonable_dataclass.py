@@ -1,7 +1,7 @@
 from abc import ABC
 from typing import Any, ClassVar, Self
 
-from .bsonable_dataclass_meta import SPECIAL_INSTANCE_FIELDS, BsonableDataclassMeta
+from .bsonable_dataclass_meta import SPECIAL_INSTANCE_FIELDS, BsonableDataclassMeta, __initialized__
 from ..fields.field_schema import FieldSchema
 from ...utilities.special_values import ABSTRACT
 from ..serialization.vars import __type_id__, get_type_id
@@ -59,6 +59,13 @@ class BsonableDataclass(ABC, metaclass=BsonableDataclassMeta):
 
 	def to_bson(self) -> dict[str, Any]:
 		from ..serialization.obj_to_bson import obj_to_bson
+		from ..serialization.validating_serialization import is_validating, validate_field_for_serialization
+		from .compile_bsonable_dataclass import get_compiled_bsonable_dataclass
+
+		# Use the compiled encoder for this class, if available
+		compiled = get_compiled_bsonable_dataclass(type(self))
+		if compiled is not None:
+			return compiled.encode(self)
 		
 		# Raise error for abstract classes
 		if type(self).__type_id__ == ABSTRACT:
@@ -67,8 +74,11 @@ class BsonableDataclass(ABC, metaclass=BsonableDataclassMeta):
 		# Convert to document
 		output = { __type_id__: type(self).__type_id__ } # Initialize the dict with __type_id__
 
+		validate = is_validating()
 		for field_name, field_schema in type(self).__bsonable_fields__.items():
 			value = getattr(self, field_name)
+			if validate:
+				validate_field_for_serialization(field_schema, value)
 			output[field_name] = obj_to_bson(value)
 
 		# Allow extra fields
@@ -93,6 +103,13 @@ class BsonableDataclass(ABC, metaclass=BsonableDataclassMeta):
 		""" Define how this BsonableDataclass should be instantiated from a bson document that matches this version. """
 		""" If an annotated field has a default value, it will be set to the default if not in document. """
 		from ..serialization.bson_to_type_expectation import bson_to_type_expectation
+		from ..serialization.trusted_deserialization import is_trusted
+		from .compile_bsonable_dataclass import get_compiled_bsonable_dataclass
+
+		# Use the compiled decoder for this class, if available
+		compiled = get_compiled_bsonable_dataclass(cls)
+		if compiled is not None:
+			return compiled.decode(bson, document_context, coerce_str_values) # type: ignore
 
 		# See if there is a valid subtype, if so, deserialize it into that instead of this cls.
 		valid_subtype = cls.inspect_type_id(bson, document_context)
@@ -116,7 +133,6 @@ class BsonableDataclass(ABC, metaclass=BsonableDataclassMeta):
 			# 2. If the field name does not exist in the document, look for a legacy field name and use that if found.
 			# 3. If there is no legacy field name, use a default value, if set.
 			# 4. If all else fails, raise an Exception.
-			legacy_field_name = expected_field_name + "__legacy__"
 			# If the document has the field, convert it into an object and stash the obj into the obj_dict
 			if expected_field_name in bson:
 				document_attr_value = bson[expected_field_name]
@@ -124,23 +140,9 @@ class BsonableDataclass(ABC, metaclass=BsonableDataclassMeta):
 				attr_obj = bson_to_type_expectation(document_attr_value, expected_field_schema.type_expectation, new_document_context, coerce_str_values=coerce_str_values)
 				obj_dict[expected_field_name] = attr_obj
 			
-			# Look for a legacy field
-			elif legacy_field_name in bson:
-				document_attr_value = bson[expected_field_name]
-				logger.info(f"Using legacy field {legacy_field_name} with value {document_attr_value} for {expected_field_name}.\n\n{document_context}")
-				new_document_context = document_context.subpath(legacy_field_name) if document_context else None
-				attr_obj = bson_to_type_expectation(document_attr_value, expected_field_schema.type_expectation, new_document_context, coerce_str_values=coerce_str_values) # Legacy field still must conform to the original type expectation
-				obj_dict[expected_field_name] = attr_obj
-				
-			# If the field has a default value, set it to that
-			elif expected_field_schema.schema_config.has_default():
-				field_default_value = expected_field_schema.schema_config.get_default()
-				logger.warning(f"Using default value of {field_default_value} for {expected_field_name}.\n\n{document_context}")
-				obj_dict[expected_field_name] = field_default_value # NOTE: It's at this point that the Mongoable object will be assigned a random _id if the _id is not in the document
-			
-			# Otherwise, raise an error
+			# Otherwise, fall back to a legacy field or default value
 			else:
-				raise ValueError(f"Error converting document to object of type {cls.__name__}. Document missing a value for field {expected_field_name}.\n\n{document_context}")
+				obj_dict[expected_field_name] = cls._missing_field_value(bson, expected_field_name, expected_field_schema, document_context, coerce_str_values=coerce_str_values)
 				
 		# Remove __type_id__ from the bson
 		if __type_id__ in bson:
@@ -157,8 +159,62 @@ class BsonableDataclass(ABC, metaclass=BsonableDataclassMeta):
 			# Store loose fields into the object
 			obj_dict[key] = value
 
+		if is_trusted():
+			return cls._construct_trusted(obj_dict)
 		return cls(**obj_dict)
 
+	@classmethod
+	def _init_field_names(cls) -> tuple[str, ...]:
+		""" Returns the field names in the order the generated __init__ assigns them: positional-or-keyword fields, then keyword-only fields. """
+		fields = cls.__bsonable_fields__
+		return (
+			tuple(field_name for field_name, field_schema in fields.items() if not field_schema.schema_config.kw_only) +
+			tuple(field_name for field_name, field_schema in fields.items() if field_schema.schema_config.kw_only)
+		)
+
+	@classmethod
+	def _construct_trusted(cls, obj_dict: dict[str, Any], init_field_names: tuple[str, ...] | None = None) -> Self:
+		""" Builds an instance from an obj_dict produced by from_bson() without running the generated __init__, so field values are not re-validated. See trusted_deserialization. """
+		if init_field_names is None:
+			init_field_names = cls._init_field_names()
+
+		obj = cls.__new__(cls)
+		instance_dict = obj.__dict__ # Write into __dict__ directly to bypass __setattr__ (and the frozen check)
+		for field_name in init_field_names:
+			instance_dict[field_name] = obj_dict[field_name]
+		
+		# Store extra fields into the obj
+		for key, value in obj_dict.items():
+			if key not in instance_dict:
+				instance_dict[key] = value
+
+		instance_dict[__initialized__] = True
+		obj.__post_init__()
+		return obj
+
+	@classmethod
+	def _missing_field_value(cls, bson: Any, expected_field_name: str, expected_field_schema: FieldSchema, document_context: 'DocumentContext | None', *, coerce_str_values: bool = False) -> Any:
+		""" Returns the value for an expected field that is not in the bson: a legacy field if present, otherwise the field's default value. Raises an error if neither is available. """
+		from ..serialization.bson_to_type_expectation import bson_to_type_expectation
+
+		# Look for a legacy field
+		legacy_field_name = expected_field_name + "__legacy__"
+		if legacy_field_name in bson:
+			document_attr_value = bson[legacy_field_name]
+			logger.info(f"Using legacy field {legacy_field_name} with value {document_attr_value} for {expected_field_name}.\n\n{document_context}")
+			new_document_context = document_context.subpath(legacy_field_name) if document_context else None
+			return bson_to_type_expectation(document_attr_value, expected_field_schema.type_expectation, new_document_context, coerce_str_values=coerce_str_values) # Legacy field still must conform to the original type expectation
+			
+		# If the field has a default value, set it to that
+		elif expected_field_schema.schema_config.has_default():
+			field_default_value = expected_field_schema.schema_config.get_default()
+			logger.warning(f"Using default value of {field_default_value} for {expected_field_name}.\n\n{document_context}")
+			return field_default_value # NOTE: It's at this point that the Mongoable object will be assigned a random _id if the _id is not in the document
+		
+		# Otherwise, raise an error
+		else:
+			raise ValueError(f"Error converting document to object of type {cls.__name__}. Document missing a value for field {expected_field_name}.\n\n{document_context}")
+
 	# def get_value_at_field_path(self, field_path: 'FieldPath') -> Any:
 	# 	""" Returns the value stored at the field path. """
 	# 	if field_path.get_root_type_id() != type(self).__type_id__:
@@ -29,6 +29,8 @@ __initialized__ = "__initialized__"
 
 SPECIAL_INSTANCE_FIELDS = (
 	__initialized__,
+	"__db_snapshot__", # Set on Documents loaded from the db (see document/change_tracking.py)
+	"__prefetched__", # Set on Documents by prefetch() (see document/prefetch.py)
 )
 
 # TODO: We should allow BsonableDataclasses to also use DocumentSchemaConfig and access the allow_independent_update
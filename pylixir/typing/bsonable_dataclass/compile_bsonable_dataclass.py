@@ -0,0 +1,211 @@
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from .bsonable_dataclass import BsonableDataclass
+from ..registration.type_expectation import TypeExpectation
+from ..serialization.vars import __type_id__
+from ...utilities.special_values import ABSTRACT
+
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+	from ...document.document_context import DocumentContext
+
+
+"""
+Compiled serializers
+
+BsonableDataclass.to_bson() and from_bson() are written as interpreters: for every object they walk __bsonable_fields__ and re-run the obj_to_bson / bson_to_type_expectation chains to work out how each field should be converted.
+None of those decisions change once the type registry has been created, so for each concrete class we resolve them once and close over the result.
+
+The compiled functions must produce exactly the same output (including key order) as the interpreter path.
+To debug a serialization issue against the interpreter path, call create_type_registry(compile_serializers=False) or set type_registry.use_compiled_serializers = False.
+"""
+
+FieldEncoder = Callable[[Any], Any]
+FieldDecoder = Callable[[Any, 'DocumentContext | None', bool], Any]
+
+@dataclass(frozen=True)
+class CompiledBsonableDataclass:
+	""" Specialized to_bson() / from_bson() functions for a single concrete BsonableDataclass. """
+	cls: type[BsonableDataclass]
+	encode: Callable[[BsonableDataclass], dict[str, Any]]
+	decode: Callable[[Any, 'DocumentContext | None', bool], BsonableDataclass]
+
+def get_compiled_bsonable_dataclass(cls: type[BsonableDataclass]) -> CompiledBsonableDataclass | None:
+	""" Returns the compiled serializers for cls, compiling them on first use. Returns None if the interpreter path should be used. """
+	from .. import type_registry
+
+	if not type_registry.use_compiled_serializers:
+		return None
+
+	compiled = type_registry.compiled_bsonable_dataclasses.get(cls)
+	if compiled is None:
+		# Abstract classes are never serialized directly, let the interpreter path raise the appropriate error
+		if cls.__type_id__ == ABSTRACT:
+			return None
+		compiled = compile_bsonable_dataclass(cls)
+		type_registry.compiled_bsonable_dataclasses[cls] = compiled
+	return compiled
+
+def compile_bsonable_dataclasses(concrete_bsonable_dataclasses: list[type[BsonableDataclass]]) -> None:
+	""" Compiles all concrete BsonableDataclasses ahead of time. Classes created after registration are compiled lazily. """
+	from .. import type_registry
+
+	for bsonable_dataclass in concrete_bsonable_dataclasses:
+		type_registry.compiled_bsonable_dataclasses[bsonable_dataclass] = compile_bsonable_dataclass(bsonable_dataclass)
+
+def compile_bsonable_dataclass(cls: type[BsonableDataclass]) -> CompiledBsonableDataclass:
+	""" Generates the encoder and decoder for a concrete BsonableDataclass. Must be run after the type registry has been created so that forward refs are resolved. """
+	return CompiledBsonableDataclass(
+		cls=cls,
+		encode=_compile_encoder(cls),
+		decode=_compile_decoder(cls)
+	)
+
+#region: Encoding
+def _compile_field_encoder(type_expectation: TypeExpectation) -> FieldEncoder:
+	""" Resolves how a field should be converted to bson based on its annotation. Values that don't match the annotation exactly fall back to obj_to_bson. """
+	from ..serialization.obj_to_bson import obj_to_bson
+	from ..serialization.primitive_to_bson import PASS_THROUGH_PRIMITIVES
+
+	expected_type = type_expectation.type_info.type_
+
+	if expected_type in PASS_THROUGH_PRIMITIVES:
+		def encode_primitive(value: Any) -> Any:
+			if type(value) is expected_type:
+				return value
+			return obj_to_bson(value)
+		return encode_primitive
+
+	if isinstance(expected_type, type) and issubclass(expected_type, BsonableDataclass):
+		def encode_bsonable_dataclass(value: Any) -> Any:
+			if isinstance(value, BsonableDataclass):
+				return value.to_bson()
+			return obj_to_bson(value)
+		return encode_bsonable_dataclass
+
+	return obj_to_bson
+
+def _compile_encoder(cls: type[BsonableDataclass]) -> Callable[[BsonableDataclass], dict[str, Any]]:
+	""" Mirrors BsonableDataclass.to_bson(). """
+	from ..serialization.obj_to_bson import obj_to_bson
+	from ..serialization.validating_serialization import is_validating, validate_field_for_serialization
+
+	type_id = cls.__type_id__
+	field_names = frozenset(cls.__bsonable_fields__)
+	field_encoders = tuple(
+		(field_name, field_schema, _compile_field_encoder(field_schema.type_expectation))
+		for field_name, field_schema in cls.__bsonable_fields__.items()
+	)
+
+	def encode(obj: BsonableDataclass) -> dict[str, Any]:
+		output = { __type_id__: type_id }
+		if is_validating():
+			for field_name, field_schema, encode_field in field_encoders:
+				value = getattr(obj, field_name)
+				validate_field_for_serialization(field_schema, value)
+				output[field_name] = encode_field(value)
+		else:
+			for field_name, field_schema, encode_field in field_encoders:
+				output[field_name] = encode_field(getattr(obj, field_name))
+
+		# Allow extra fields (see BsonableDataclass.to_bson)
+		for key, value in obj.__dict__.items():
+			if key in field_names or key.startswith("__"):
+				continue
+			output[key] = obj_to_bson(value)
+
+		return output
+
+	return encode
+# endregion
+
+#region: Decoding
+def _compile_field_decoder(type_expectation: TypeExpectation) -> FieldDecoder:
+	""" Resolves which branch of bson_to_type_expectation applies to a field. None values and unusual annotations are always handed to bson_to_type_expectation. """
+	from ..bsonable_dict.bsonable_dict import BsonableDict
+	from ..serialization.bson_to_type_expectation import bson_to_type_expectation
+	from ..serialization.bson_to_primitive import bson_to_primitive
+	from .. import type_registry
+
+	expected_type_info = type_expectation.type_info
+	expected_type = expected_type_info.type_
+
+	def decode_generic(bson: Any, document_context: 'DocumentContext | None', coerce_str_values: bool) -> Any:
+		return bson_to_type_expectation(bson, type_expectation, document_context, coerce_str_values=coerce_str_values)
+
+	# type[...] annotations and unresolved forward refs stay on the interpreter path
+	if not isinstance(expected_type, type) or expected_type is type:
+		return decode_generic
+
+	if issubclass(expected_type, (BsonableDataclass, BsonableDict)):
+		from_bson = expected_type.from_bson
+		def decode_bsonable(bson: Any, document_context: 'DocumentContext | None', coerce_str_values: bool) -> Any:
+			if bson is None:
+				return decode_generic(bson, document_context, coerce_str_values)
+			return from_bson(bson, document_context, coerce_str_values=coerce_str_values)
+		return decode_bsonable
+
+	if expected_type in type_registry.primitives:
+		def decode_primitive(bson: Any, document_context: 'DocumentContext | None', coerce_str_values: bool) -> Any:
+			# bson_to_primitive returns values of the exact expected type unchanged
+			if type(bson) is expected_type:
+				return bson
+			if bson is None:
+				return decode_generic(bson, document_context, coerce_str_values)
+			return bson_to_primitive(bson, expected_type_info, document_context, coerce_str_values=coerce_str_values)
+		return decode_primitive
+
+	if issubclass(expected_type, tuple(type_registry.pseudo_primitives)):
+		bson_to_pseudo_primitive = type_registry.bson_to_pseudo_primitive
+		def decode_pseudo_primitive(bson: Any, document_context: 'DocumentContext | None', coerce_str_values: bool) -> Any:
+			if bson is None:
+				return decode_generic(bson, document_context, coerce_str_values)
+			return bson_to_pseudo_primitive(bson, expected_type_info, document_context, coerce_str_values=coerce_str_values)
+		return decode_pseudo_primitive
+
+	return decode_generic
+
+def _compile_decoder(cls: type[BsonableDataclass]) -> Callable[[Any, 'DocumentContext | None', bool], BsonableDataclass]:
+	""" Mirrors BsonableDataclass.from_bson(). """
+	from ..serialization.trusted_deserialization import is_trusted
+
+	field_names = frozenset(cls.__bsonable_fields__)
+	init_field_names = cls._init_field_names()
+	field_decoders = tuple(
+		(field_name, field_schema, _compile_field_decoder(field_schema.type_expectation))
+		for field_name, field_schema in cls.__bsonable_fields__.items()
+	)
+
+	def decode(bson: Any, document_context: 'DocumentContext | None', coerce_str_values: bool = False) -> BsonableDataclass:
+		# See if there is a valid subtype, if so, deserialize it into that instead of this cls.
+		valid_subtype = cls.inspect_type_id(bson, document_context)
+		if valid_subtype:
+			if not issubclass(valid_subtype, cls):
+				raise
+			return valid_subtype.from_bson(bson, document_context)
+
+		obj_dict = {}
+		for field_name, field_schema, decode_field in field_decoders:
+			if field_name in bson:
+				new_document_context = document_context.subpath(field_name) if document_context else None
+				obj_dict[field_name] = decode_field(bson[field_name], new_document_context, coerce_str_values)
+			else:
+				obj_dict[field_name] = cls._missing_field_value(bson, field_name, field_schema, document_context, coerce_str_values=coerce_str_values)
+
+		# Remove __type_id__ from the bson
+		if __type_id__ in bson:
+			del bson[__type_id__]
+
+		# Allow extra fields (see BsonableDataclass.from_bson)
+		for key, value in bson.items():
+			if key in field_names:
+				continue
+			obj_dict[key] = value
+
+		if is_trusted():
+			return cls._construct_trusted(obj_dict, init_field_names)
+		return cls(**obj_dict)
+
+	return decode
+# endregion
@@ -240,8 +240,14 @@ class BsonableDict(Generic[K, V], MutableMapping[K, V], metaclass=BsonableDictMe
 	def to_bson(self) -> Dict[Any, Any]:
 		"""Convert this BsonableDict instance to a BSON-compatible dictionary."""
 		from ..serialization.obj_to_bson import obj_to_bson
+		from ..serialization.validating_serialization import is_validating, validate_value_for_serialization
 		from .. import type_registry
 
+		# When validating, run the same checks as when the dict is rebuilt from bson
+		validate = is_validating()
+		if validate:
+			self.__validate_dict__()
+
 		bson_dict = {
 			# Add metadata fields for documentation purposes (not currently used in deserialization)
 			__type_id__: self.__type_id__,
@@ -258,6 +264,9 @@ class BsonableDict(Generic[K, V], MutableMapping[K, V], metaclass=BsonableDictMe
 			else:
 				raise TypeError(f"Keys in BsonableDicts must be primitives or pseudoprimitives. Instead, we got the following type for a key: '{type(key).__name__}'.")
 			
+			if validate:
+				validate_value_for_serialization(self.__value__.type_expectation, value)
+
 			# Serialize the value normally
 			bson_value = obj_to_bson(value)
 			bson_dict[bson_key] = bson_value
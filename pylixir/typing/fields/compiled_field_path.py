@@ -0,0 +1,283 @@
+from functools import lru_cache
+from operator import attrgetter
+from typing import Any, Callable, Literal, NamedTuple
+
+from .field_schema import FieldSchema
+
+
+"""
+Compiled field paths
+
+A FieldPath is a string (e.g. "Project.scores{favorite|||color}.value"), so every method that needs its structure used to re-parse it.
+compile_field_path() parses a path once into a CompiledFieldPath: its typed segments, the mongo dot path, and (resolved on first use, as they need the
+type registry) the root class and the FieldSchema of each segment. Compiled paths are kept in a bounded LRU cache keyed by the path string,
+so repeated operations on the same path (e.g. pointer updates) cost a dict lookup.
+
+The resolved classes and FieldSchemas come from the type registry, so create_type_registry() clears the cache.
+
+Each compiled path also builds a getter / setter pair on first use (used by FieldPath.navigate_into() and update_instance()).
+Each segment becomes a step specialized to its kind, with the list index parsed and dict keys deserialized once (per key type) instead of on every call.
+Paths made only of attributes are read with a single operator.attrgetter.
+"""
+
+MAX_COMPILED_FIELD_PATHS = 4096
+
+Getter = Callable[[Any], Any]
+Setter = Callable[[Any, Any], None]
+
+SegmentKind = Literal["attr", "index", "key"]
+
+class PathSegment(NamedTuple):
+    """ One step of a field path. """
+    kind: SegmentKind
+    part: str
+    """ The segment as returned by FieldPath.get_parts(), e.g. "inner", "[0]" or "{favorite|||color}" """
+    value: str
+    """ The attribute name, the list index (not yet converted to an int), or the dict key with its periods unescaped """
+
+class CompiledFieldPath:
+    """ The parsed form of a FieldPath. Get one with compile_field_path(). """
+    __slots__ = ("path", "root_type_id", "segments", "parts", "mongo_path", "_root_cls", "_field_schemas", "_getter", "_setter")
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.root_type_id = path.split(".")[0]
+        self.segments = _parse_segments(path)
+        self.parts = tuple(segment.part for segment in self.segments)
+        self.mongo_path = ".".join(segment.part[1:-1] if segment.kind != "attr" else segment.part for segment in self.segments) # Dict keys keep their periods escaped
+        self._root_cls: type | None = None
+        self._field_schemas: tuple[FieldSchema, ...] | None = None
+        self._getter: Getter | None = None
+        self._setter: Setter | None = None
+
+    def root_cls(self) -> type:
+        """ Returns the class registered under the root type id. """
+        if self._root_cls is None:
+            from .. import type_registry
+
+            root_cls = type_registry.lookup_type_by_type_id(self.root_type_id)
+            if root_cls is None:
+                raise ValueError(f"Error getting containing cls for FieldPath {self.path}. Does this field path specify a valid type id?")
+            self._root_cls = root_cls
+        return self._root_cls
+
+    def field_schemas(self) -> tuple[FieldSchema, ...]:
+        """ Returns the FieldSchema of each segment: the field's schema for attributes, and the dict's __value__ schema for keys. """
+        if self._field_schemas is None:
+            self._field_schemas = self._resolve_field_schemas()
+        return self._field_schemas
+
+    def _resolve_field_schemas(self) -> tuple[FieldSchema, ...]:
+        from ..bsonable_dict.bsonable_dict import BsonableDict, __value__
+
+        containing_cls = self.root_cls()
+        field_schemas: list[FieldSchema] = []
+        for idx, segment in enumerate(self.segments):
+            if segment.kind == "index":
+                # Handle lists later
+                raise NotImplementedError
+
+            if segment.kind == "key":
+                # Get the value type from the BsonableDict
+                if not issubclass(containing_cls, BsonableDict):
+                    raise TypeError(f"Type {containing_cls.__name__} is not a BsonableDict")
+                if not hasattr(containing_cls, __value__):
+                    raise ValueError(f"Cannot get field schema for dictionary value type {containing_cls.__name__}")
+                field_schema = getattr(containing_cls, __value__)
+            else:
+                # Look up the attribute of the nested type from the type expectation
+                if not hasattr(containing_cls, segment.value):
+                    raise AttributeError(f"'{containing_cls.__name__}' object has no attribute '{segment.value}'")
+                field_schema = getattr(containing_cls, segment.value)
+                if not isinstance(field_schema, FieldSchema):
+                    raise ValueError(f"Field '{segment.value}' is not a DocumentFieldInfo")
+
+            field_schemas.append(field_schema)
+            if idx < len(self.segments) - 1:
+                # Set the containing class to the type of the field's type expectation
+                containing_cls = field_schema.type_expectation.type_info.type_
+        return tuple(field_schemas)
+
+    def getter(self) -> Getter:
+        """ Returns a function that reads the value at this path from a root instance. The root's type isn't checked. """
+        if self._getter is None:
+            self._getter = _compile_getter(self.segments)
+        return self._getter
+
+    def setter(self) -> Setter:
+        """ Returns a function that validates a new value and sets it at this path within a root instance. The root's type isn't checked. """
+        if self._setter is None:
+            if not self.segments:
+                raise ValueError(f"FieldPath {self.path} points to the root instance, which can't be set.")
+            get_parent = _compile_getter(self.segments[:-1])
+            set_final = _compile_set_step(self.segments[-1])
+            def set_value(instance: Any, new_value: Any) -> None:
+                set_final(get_parent(instance), new_value)
+            self._setter = set_value
+        return self._setter
+
+    def __repr__(self) -> str:
+        return f"CompiledFieldPath({self.path!r})"
+
+@lru_cache(maxsize=MAX_COMPILED_FIELD_PATHS)
+def compile_field_path(path: str) -> CompiledFieldPath:
+    """ Returns the compiled form of the path, parsing it only the first time. """
+    return CompiledFieldPath(str(path))
+
+def clear_compiled_field_paths() -> None:
+    """ Drops every compiled path, e.g. because the type registry was recreated. """
+    compile_field_path.cache_clear()
+
+def _parse_segments(path: str) -> tuple[PathSegment, ...]:
+    """ Splits a path into its segments, skipping the root type id. """
+    parts: list[str] = []
+    current_part = ""
+    i = 0
+    while i < len(path):
+        char = path[i]
+        if char == ".":
+            if current_part:
+                parts.append(current_part)
+                current_part = ""
+        elif char == "[" or char == "{":
+            if current_part:
+                parts.append(current_part)
+                current_part = ""
+            # Find the matching closing bracket or brace
+            closing = "]" if char == "[" else "}"
+            j = path.find(closing, i + 1)
+            if j == -1:
+                j = len(path)
+            parts.append(char + path[i + 1:j] + closing)
+            i = j
+        else:
+            current_part += char
+        i += 1
+    if current_part:
+        parts.append(current_part)
+
+    segments: list[PathSegment] = []
+    for part in parts[1:]: # The first part is the root type id
+        if part.startswith("["):
+            segments.append(PathSegment("index", part, part[1:-1]))
+        elif part.startswith("{"):
+            segments.append(PathSegment("key", part, part[1:-1].replace("|||", "."))) # See FieldPath.unescape_periods
+        else:
+            segments.append(PathSegment("attr", part, part))
+    return tuple(segments)
+
+# region: Accessors
+_MISSING = object()
+
+def _identity(value: Any) -> Any:
+    return value
+
+def _compile_getter(segments: tuple[PathSegment, ...]) -> Getter:
+    if not segments:
+        return _identity
+    if all(segment.kind == "attr" for segment in segments):
+        return attrgetter(".".join(segment.value for segment in segments))
+    steps = [_compile_get_step(segment) for segment in segments]
+    if len(steps) == 1:
+        return steps[0]
+    def get(value: Any) -> Any:
+        for step in steps:
+            value = step(value)
+        return value
+    return get
+
+def _parse_index(segment: PathSegment) -> int:
+    try:
+        return int(segment.value)
+    except ValueError:
+        raise ValueError(f"Invalid array index '{segment.part}'. Must be an integer.")
+
+def _key_resolver(segment: PathSegment) -> Callable[[Any], Any]:
+    """ Returns a function that converts the segment's key string into a key of the BsonableDict passed in, caching the conversion per key type. """
+    from ..registration.type_expectation import TypeExpectation
+    from ..registration.type_info import TypeInfo
+    from ..serialization.bson_to_type_expectation import bson_to_type_expectation
+
+    keys: dict[type, Any] = {}
+    def resolve_key(target: Any) -> Any:
+        key_type = target.__key__
+        key = keys.get(key_type, _MISSING)
+        if key is _MISSING:
+            # Deserialize the key from a string into the expected key type
+            key = bson_to_type_expectation(segment.value, TypeExpectation(TypeInfo(key_type, None), False), None, coerce_str_values=True)
+            if not isinstance(key, key_type):
+                raise TypeError(f"Dictionary key '{key}' is of type {type(key).__name__}, but {type(target).__name__} expects keys of type {key_type.__name__}")
+            keys[key_type] = key
+        return key
+    return resolve_key
+
+def _compile_get_step(segment: PathSegment) -> Getter:
+    from ..bsonable_dict.bsonable_dict import BsonableDict
+
+    if segment.kind == "index":
+        idx = _parse_index(segment)
+        def get_index(target: Any) -> Any:
+            if not hasattr(target, "__getitem__"):
+                raise TypeError(f"Cannot index into {type(target).__name__} using array notation '[{segment.part}]'. Object is not subscriptable.")
+            if not (0 <= idx < len(target)):
+                raise IndexError(f"Array index {idx} is out of range for {type(target).__name__}")
+            return target[idx]
+        return get_index
+
+    if segment.kind == "key":
+        resolve_key = _key_resolver(segment)
+        def get_key(target: Any) -> Any:
+            if not isinstance(target, BsonableDict):
+                raise TypeError(f"Cannot access key in {type(target).__name__} using dictionary notation '{{{segment.part}}}'. Object is not a BsonableDict.")
+            key = resolve_key(target)
+            if key not in target:
+                raise KeyError(f"Dictionary key '{key}' not found in {type(target).__name__}")
+            return target[key]
+        return get_key
+
+    name = segment.value
+    def get_attr(target: Any) -> Any:
+        try:
+            return getattr(target, name)
+        except AttributeError:
+            raise AttributeError(f"'{type(target).__name__}' object has no attribute '{name}'")
+    return get_attr
+
+def _compile_set_step(segment: PathSegment) -> Setter:
+    from ..bsonable_dict.bsonable_dict import BsonableDict
+
+    if segment.kind == "index":
+        idx = _parse_index(segment)
+        def set_index(parent: Any, new_value: Any) -> None:
+            if not hasattr(parent, "__setitem__"):
+                raise TypeError(f"Cannot update index in {type(parent).__name__} using array notation '[{segment.part}]'. Object is not subscriptable.")
+            if not (0 <= idx < len(parent)):
+                raise IndexError(f"Array index {idx} is out of range for {type(parent).__name__}")
+            parent[idx] = new_value
+        return set_index
+
+    if segment.kind == "key":
+        resolve_key = _key_resolver(segment)
+        def set_key(parent: Any, new_value: Any) -> None:
+            if not isinstance(parent, BsonableDict):
+                raise TypeError(f"Cannot update key in {type(parent).__name__} using dictionary notation '{{{segment.part}}}'. Object is not a BsonableDict.")
+            key = resolve_key(parent)
+            # Validate value type against dictionary's value type (__value__ is the FieldSchema for the values)
+            parent.__value__.type_expectation.validate(new_value, None)
+            parent[key] = new_value
+        return set_key
+
+    name = segment.value
+    field_schemas: dict[type, FieldSchema] = {} # By the parent's class, which may be a subclass of the declared type
+    def set_attr(parent: Any, new_value: Any) -> None:
+        parent_cls = type(parent)
+        field_schema = field_schemas.get(parent_cls)
+        if field_schema is None:
+            field_schema = getattr(parent_cls, name, None)
+            if not isinstance(field_schema, FieldSchema):
+                raise AttributeError(f"'{parent_cls.__name__}' has no attribute '{name}'")
+            field_schemas[parent_cls] = field_schema
+        field_schema.type_expectation.validate(new_value, None) # Raises if the value doesn't match
+        setattr(parent, name, new_value)
+    return set_attr
+# endregion
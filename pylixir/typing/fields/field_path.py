@@ -3,10 +3,9 @@
 from typing import Any
 
 from .field_schema import FieldSchema
+from .compiled_field_path import CompiledFieldPath, compile_field_path
 from typing import TYPE_CHECKING
 
-from ..registration.type_expectation import TypeExpectation
-from ..registration.type_info import TypeInfo
 if TYPE_CHECKING:
     from ..bsonable_dataclass.bsonable_dataclass import BsonableDataclass
 
@@ -31,48 +30,15 @@ class FieldPath(str):
         escaped_key = self.escape_periods(str(key))
         return FieldPath(str(self) + f"{{{escaped_key}}}")
 
+    def compiled(self) -> 'CompiledFieldPath':
+        """ Returns the parsed form of this path, which is cached (see compiled_field_path.py). """
+        return compile_field_path(self)
+
     def get_root_type_id(self) ->  str:
-        return self.split(".")[0]
+        return compile_field_path(self).root_type_id
 
     def get_parts(self) -> tuple[str, ...]:
-        parts = []
-        current_part = ""
-        i = 0
-        while i < len(self):
-            if self[i] == ".":
-                if current_part:
-                    parts.append(current_part)
-                    current_part = ""
-            elif self[i] == "[":
-                if current_part:
-                    parts.append(current_part)
-                    current_part = ""
-                # Find matching closing bracket
-                j = i + 1
-                while j < len(self) and self[j] != "]":
-                    current_part += self[j]
-                    j += 1
-                parts.append(f"[{current_part}]")
-                current_part = ""
-                i = j
-            elif self[i] == "{":
-                if current_part:
-                    parts.append(current_part)
-                    current_part = ""
-                # Find matching closing brace
-                j = i + 1
-                while j < len(self) and self[j] != "}":
-                    current_part += self[j]
-                    j += 1
-                parts.append(f"{{{current_part}}}")
-                current_part = ""
-                i = j
-            else:
-                current_part += self[i]
-            i += 1
-        if current_part:
-            parts.append(current_part)
-        return tuple(parts[1:])  # Return all parts except for the root part
+        return compile_field_path(self).parts
     
     def field_name(self) -> str:
         """ Return the field name of the field this path references. (i.e. the final field name) """
@@ -85,21 +51,7 @@ class FieldPath(str):
         Example:
             FieldPath("User.preferences{favorite.color}.value") -> "preferences.favorite|||color.value"
         """
-        parts = self.get_parts()
-        mongo_parts = []
-        
-        for part in parts:
-            if part.startswith("{") and part.endswith("}"):
-                # Convert dictionary key notation to dot notation, keeping periods escaped
-                key = part[1:-1]  # Remove curly braces
-                mongo_parts.append(key)  # The key is already escaped by subkey()
-            elif part.startswith("[") and part.endswith("]"):
-                # Convert array index notation
-                mongo_parts.append(part[1:-1])  # Remove square brackets
-            else:
-                mongo_parts.append(part)
-        
-        return ".".join(mongo_parts)
+        return compile_field_path(self).mongo_path
 
     @staticmethod
     def for_(root_cls: type['BsonableDataclass'], *args: Any | FieldSchema) -> 'FieldPath':
@@ -168,62 +120,14 @@ class FieldPath(str):
         return field_path
 
     def containing_cls(self) -> type['BsonableDataclass']:
-        from .. import type_registry
-        
-        type_id = self.get_root_type_id()
-        containing_cls = type_registry.lookup_type_by_type_id(type_id)
-        if containing_cls is None:
-            raise ValueError(f"Error getting containing cls for FieldPath {self}. Does this field path specify a valid type id?")
-        return containing_cls
+        return compile_field_path(self).root_cls()
 
     def field_schema(self) -> FieldSchema:
         """ Returns the FieldSchema for the field specified in this FieldPath. """
-        from ..bsonable_dict.bsonable_dict import BsonableDict, __value__
-        
-        containing_cls = self.containing_cls()
-        field_names = self.get_parts()
-
-        for idx, field_name in enumerate(field_names):
-            # Handle array index notation
-            if field_name.startswith("[") and field_name.endswith("]"):
-                # Handle lists later
-                raise NotImplementedError
-            
-            # Handle dictionary key notation
-            elif field_name.startswith("{") and field_name.endswith("}"):
-                # Get the value type from the BsonableDict
-                if not issubclass(containing_cls, BsonableDict):
-                    raise TypeError(f"Type {containing_cls.__name__} is not a BsonableDict")
-                
-                # If this is the last element, return a FieldSchema for the dictionary value type
-                if idx == len(field_names) - 1:
-                    # The field schema for a dictionary value should come from the value_type class
-                    if hasattr(containing_cls, __value__):
-                        return getattr(containing_cls, __value__)
-                    raise ValueError(f"Cannot get field schema for dictionary value type {containing_cls.__name__}")
-                
-                # If it's not the last element, update the containing class and then keep iterating
-                containing_cls = containing_cls.__value__.type_expectation.type_info.type_  # Retrieve the value type in the value schema
-                continue
-            
-            else:
-                # Look up the attribute of the nested type from the type expectation
-                if not hasattr(containing_cls, field_name):
-                    raise AttributeError(f"'{containing_cls.__name__}' object has no attribute '{field_name}'")
-                
-                field_schema = getattr(containing_cls, field_name)
-                if not isinstance(field_schema, FieldSchema):
-                    raise ValueError(f"Field '{field_name}' is not a DocumentFieldInfo")
-                
-                # If last element
-                if idx == len(field_names) - 1:
-                    return field_schema
-                
-                # If it's not the last element, update the containing class and then keep iterating
-                # Set the containing class to the type of the field's type expectation
-                containing_cls = field_schema.type_expectation.type_info.type_
-
-        raise RuntimeError("Unexpected code path reached while dereferencing pointer.")
+        field_schemas = compile_field_path(self).field_schemas()
+        if not field_schemas:
+            raise RuntimeError("Unexpected code path reached while dereferencing pointer.")
+        return field_schemas[-1]
 
     def navigate_into(self, instance: 'BsonableDataclass') -> Any:
         """ Returns the value at this field path within the given instance.
@@ -236,53 +140,14 @@ class FieldPath(str):
         Returns:
             The value at this field path
         """
-        from ..bsonable_dict.bsonable_dict import BsonableDict
-        from ..serialization.bson_to_type_expectation import bson_to_type_expectation
+        compiled = compile_field_path(self)
 
         # Validate the root type matches
-        if not isinstance(instance, self.containing_cls()):
-            raise TypeError(f"Instance type {type(instance).__name__} does not match field path root type {self.containing_cls().__name__}")
-
-        # Navigate through the parts to get the final value
-        target = instance
-        for part in self.get_parts():
-            # Handle array index notation
-            if part.startswith("[") and part.endswith("]"):
-                if not hasattr(target, "__getitem__"):
-                    raise TypeError(f"Cannot index into {type(target).__name__} using array notation '[{part}]'. Object is not subscriptable.")
-                try:
-                    idx = int(part[1:-1])
-                except ValueError:
-                    raise ValueError(f"Invalid array index '{part}'. Must be an integer.")
-                if not (0 <= idx < len(target)):
-                    raise IndexError(f"Array index {idx} is out of range for {type(target).__name__}")
-                target = target[idx]
-                continue
-
-            # Handle dictionary key notation
-            if part.startswith("{") and part.endswith("}"):
-                if not isinstance(target, BsonableDict):
-                    raise TypeError(f"Cannot access key in {type(target).__name__} using dictionary notation '{{{part}}}'. Object is not a BsonableDict.")
-                key_str = self.unescape_periods(part[1:-1])
-
-                # Deserialize the key from a string into the expected key type
-                key_type_expectation = TypeExpectation(TypeInfo(target.__key__, None), False)
-                key = bson_to_type_expectation(key_str, key_type_expectation, None, coerce_str_values=True)
+        if not isinstance(instance, compiled.root_cls()):
+            raise TypeError(f"Instance type {type(instance).__name__} does not match field path root type {compiled.root_cls().__name__}")
 
-                # Lookup the key in the dict
-                if not isinstance(key, target.__key__):
-                    raise TypeError(f"Dictionary key '{key}' is of type {type(key).__name__}, but {type(target).__name__} expects keys of type {target.__key__.__name__}")
-                if key not in target:
-                    raise KeyError(f"Dictionary key '{key}' not found in {type(target).__name__}")
-                target = target[key]
-                continue
-
-            # Handle regular attribute access
-            if not hasattr(target, part):
-                raise AttributeError(f"'{type(target).__name__}' object has no attribute '{part}'")
-            target = getattr(target, part)
-
-        return target
+        # Navigate through the parts to get the final value (see compiled_field_path.py)
+        return compiled.getter()(instance)
 
     def update_instance(self, instance: 'BsonableDataclass', new_value: Any) -> None:
         """ Updates the instance at this field path with the new value.
@@ -293,90 +158,11 @@ class FieldPath(str):
             instance: The root instance to update
             new_value: The new value to set at this field path
         """
-        from ..bsonable_dataclass.bsonable_dataclass import BsonableDataclass
-        from ..bsonable_dict.bsonable_dict import BsonableDict
-        
+        compiled = compile_field_path(self)
+
         # Validate the root type matches
-        if not isinstance(instance, self.containing_cls()):
-            raise TypeError(f"Instance type {type(instance).__name__} does not match field path root type {self.containing_cls().__name__}")
-        
-        # Navigate to the parent instance and keep track of the final part
-        target: BsonableDataclass | BsonableDict = instance
-        parts = self.get_parts()
+        if not isinstance(instance, compiled.root_cls()):
+            raise TypeError(f"Instance type {type(instance).__name__} does not match field path root type {compiled.root_cls().__name__}")
         
-        # If only one part, we're updating the root instance directly
-        if len(parts) == 1:
-            final_part = parts[0]
-            parent = target
-        else:
-            # Navigate to the parent of the target
-            for part in parts[:-1]:
-                # Handle array index notation
-                if part.startswith("[") and part.endswith("]"):
-                    if not hasattr(target, "__getitem__"):
-                        raise TypeError(f"Cannot index into {type(target).__name__} using array notation '[{part}]'. Object is not subscriptable.")
-                    try:
-                        idx = int(part[1:-1])
-                    except ValueError:
-                        raise ValueError(f"Invalid array index '{part}'. Must be an integer.")
-                    if not (0 <= idx < len(target)):
-                        raise IndexError(f"Array index {idx} is out of range for {type(target).__name__}")
-                    target = target[idx]
-                    continue
-                
-                # Handle dictionary key notation
-                if part.startswith("{") and part.endswith("}"): 
-                    if not isinstance(target, BsonableDict):
-                        raise TypeError(f"Cannot access key in {type(target).__name__} using dictionary notation '{{{part}}}'. Object is not a BsonableDict.")
-                    key = self.unescape_periods(part[1:-1])
-                    if not isinstance(key, target.__key__):
-                        raise TypeError(f"Dictionary key '{key}' is of type {type(key).__name__}, but {type(target).__name__} expects keys of type {target.__key__.__name__}")
-                    if key not in target:
-                        raise KeyError(f"Dictionary key '{key}' not found in {type(target).__name__}")
-                    target = target[key]
-                    continue
-                
-                # Handle regular field access
-                if not hasattr(target, part):
-                    raise AttributeError(f"'{type(target).__name__}' has no attribute '{part}'")
-                target = getattr(target, part)
-                continue
-            
-            parent = target
-            final_part = parts[-1]
-        
-        # Update the value based on the parent type and final part
-        if final_part.startswith("{") and final_part.endswith("}"): 
-            # Dictionary update
-            if not isinstance(parent, BsonableDict):
-                raise TypeError(f"Cannot update key in {type(parent).__name__} using dictionary notation '{{{final_part}}}'. Object is not a BsonableDict.")
-            key = self.unescape_periods(final_part[1:-1])
-            if not isinstance(key, parent.__key__):
-                raise TypeError(f"Dictionary key '{key}' is of type {type(key).__name__}, but {type(parent).__name__} expects keys of type {parent.__key__.__name__}")
-            # Validate value type against dictionary's value type
-            if not isinstance(new_value, parent.__value__):
-                raise TypeError(f"New value type '{type(new_value).__name__}' does not match dictionary value type '{parent.__value__.__name__}'")
-            parent[key] = new_value
-        elif final_part.startswith("[") and final_part.endswith("]"):
-            # List update
-            if not hasattr(parent, "__setitem__"):
-                raise TypeError(f"Cannot update index in {type(parent).__name__} using array notation '[{final_part}]'. Object is not subscriptable.")
-            try:
-                idx = int(final_part[1:-1])
-            except ValueError:
-                raise ValueError(f"Invalid array index '{final_part}'. Must be an integer.")
-            if not (0 <= idx < len(parent)):
-                raise IndexError(f"Array index {idx} is out of range for {type(parent).__name__}")
-            parent[idx] = new_value
-        else:
-            # Dataclass attribute update
-            if not hasattr(parent, final_part):
-                raise AttributeError(f"'{type(parent).__name__}' has no attribute '{final_part}'")
-            # Get the field schema directly from the parent class
-            field_schema = getattr(type(parent), final_part)
-            assert isinstance(field_schema, FieldSchema)
-            if not field_schema.type_expectation.validate(new_value, None):
-                actual_type = type(new_value).__name__
-                expected_type = field_schema.type_expectation.type_info.type_.__name__
-                raise TypeError(f"New value type '{actual_type}' does not match field type expectation '{expected_type}' for field '{field_schema.field_name}'")
-            setattr(parent, final_part, new_value)
\ No newline at end of file
+        # Navigate to the parent, validate the value and set it (see compiled_field_path.py)
+        compiled.setter()(instance, new_value)
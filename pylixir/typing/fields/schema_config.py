@@ -37,6 +37,10 @@ class _DocumentSchemaConfig(_SchemaConfig):
     """ The update validation function will have access to a pointer to itself. """
     document_insertion_validation_func: Callable[[Any, Any], None] | None
     """ The inseration validation func will have access to the entire document we are attempting to insert. """
+    index: bool = False
+    """ Create a mongo index on this field (see document/indexes.py). """
+    unique: bool = False
+    """ Create a unique mongo index on this field. """
 
     @classmethod
     def from_schema_config(cls, schema_config: _SchemaConfig) -> '_DocumentSchemaConfig':
@@ -95,7 +99,11 @@ def DocumentSchemaConfig(
         
         # This should accept self + the new value
         document_update_validation_func: Callable[['DocumentFieldPointer', Any], None] | None = None,
-        document_insert_validation_func: Callable[[Any, Any], None] | None = None
+        document_insert_validation_func: Callable[[Any, Any], None] | None = None,
+
+        # Indexes created by sync_indexes(). For compound indexes, use Document.__indexes__
+        index: bool = False,
+        unique: bool = False
     ) -> Any:
     """ Use this to add configurations to Document fields.
     
@@ -113,5 +121,7 @@ def DocumentSchemaConfig(
         allow_independent_update=allow_independent_update,
         validation_func=validation_func,
         document_update_validation_func=document_update_validation_func,
-        document_insertion_validation_func=document_insert_validation_func
+        document_insertion_validation_func=document_insert_validation_func,
+        index=index or unique,
+        unique=unique
     )
\ No newline at end of file
@@ -15,8 +15,15 @@ Documentation:
 def create_type_registry(
 		pseudo_primitives: list[type] | None = None,
 		pseudo_primitive_to_bson: Callable[[Any], Any] | None = None,
-		bson_to_pseudo_primitive: Callable[..., Any] | None = None
+		bson_to_pseudo_primitive: Callable[..., Any] | None = None,
+		*,
+		compile_serializers: bool = True,
+		sync_indexes: bool = False
 	) -> None:
+	""" Populates the module-level type_registry.
+	
+	Set compile_serializers to False to serialize BsonableDataclasses using the (slower) interpreter path, which is useful for debugging.
+	Set sync_indexes to True to create the indexes declared on Document classes that are missing from mongo, in a background thread (see document/indexes.py). """
 	
 	logger.debug("Creating type registry...")
 	
@@ -99,4 +106,26 @@ def create_type_registry(
 	
 	type_registry.primitives=list(primitives_dict.values())
 	type_registry.type_id_dict=type_id_dict
-	type_registry.type_name_dict=type_name_dict
\ No newline at end of file
+	type_registry.type_name_dict=type_name_dict
+
+	# Build the type dispatch tables. Handlers for all registered types are resolved up front, so that serialization doesn't need to walk an isinstance chain for every value.
+	from .dispatch_table import DispatchTable
+	from ..serialization.obj_to_bson import resolve_obj_to_bson_handler
+	from ..serialization.bson_to_type_expectation import resolve_bson_to_type_handler
+	type_registry.obj_to_bson_dispatch_table = DispatchTable(resolve_obj_to_bson_handler, all_bsonable_types + [type(None)])
+	type_registry.bson_to_type_expectation_dispatch_table = DispatchTable(resolve_bson_to_type_handler, all_bsonable_types)
+
+	# Compile serializers for all concrete BsonableDataclasses. This must run last, as it relies on the registry being fully populated.
+	from ..bsonable_dataclass.compile_bsonable_dataclass import compile_bsonable_dataclasses
+	type_registry.compiled_bsonable_dataclasses = {}
+	type_registry.use_compiled_serializers = compile_serializers
+	if compile_serializers:
+		compile_bsonable_dataclasses(concrete_bsonable_dataclass_list)
+
+	# Compiled field paths hold classes and FieldSchemas resolved from the previous registry
+	from ..fields.compiled_field_path import clear_compiled_field_paths
+	clear_compiled_field_paths()
+
+	if sync_indexes:
+		from ...document.indexes import sync_indexes_in_background
+		sync_indexes_in_background()
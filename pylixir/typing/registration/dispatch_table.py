@@ -0,0 +1,27 @@
+from types import MappingProxyType
+from typing import Callable, Generic, TypeVar
+
+
+H = TypeVar('H')
+
+class DispatchTable(Generic[H]):
+	""" Maps a type to the handler responsible for it.
+
+	Registered types are looked up by exact type in a frozen table built when create_type_registry() runs.
+	Any other type (for example, a subclass of a pseudo-primitive) is resolved once by walking the same rules used to build the table, and the result is cached.
+	This keeps the cost of each lookup constant, no matter how many types are registered. """
+
+	def __init__(self, resolve: Callable[[type], H], registered_types: list[type]) -> None:
+		self._resolve = resolve
+		self._exact: MappingProxyType[type, H] = MappingProxyType({type_: resolve(type_) for type_ in registered_types})
+		self._resolved: dict[type, H] = {}
+
+	def lookup(self, type_: type) -> H:
+		""" Returns the handler for the type. """
+		handler = self._exact.get(type_)
+		if handler is None:
+			handler = self._resolved.get(type_)
+			if handler is None:
+				handler = self._resolve(type_)
+				self._resolved[type_] = handler
+		return handler
@@ -36,6 +36,10 @@ class TypeRegistry:
             self.primitives = []
             self.type_id_dict = bidict()
             self.type_name_dict = TypeNameDict()
+            self.use_compiled_serializers = False # Set by create_type_registry(). Set to False to debug against the interpreter path.
+            self.compiled_bsonable_dataclasses = {} # Maps BsonableDataclass cls -> CompiledBsonableDataclass
+            self.obj_to_bson_dispatch_table = None # DispatchTable, built by create_type_registry()
+            self.bson_to_type_expectation_dispatch_table = None # DispatchTable, built by create_type_registry()
             self._initialized = True
 
     # @property
@@ -1,4 +1,4 @@
-from typing import Any, ForwardRef
+from typing import Any, Callable, ForwardRef
 
 from ..bsonable_dataclass.bsonable_dataclass import BsonableDataclass
 from ..bsonable_dict.bsonable_dict import BsonableDict
@@ -6,8 +6,11 @@ from .bson_to_primitive import bson_to_primitive
 from .. import type_registry
 from ...document.document_context import DocumentContext
 from ..registration.type_expectation import TypeExpectation
+from ..registration.type_info import TypeInfo
 
 
+BsonToTypeHandler = Callable[[Any, TypeInfo, DocumentContext | None, bool], Any]
+
 def bson_to_type_expectation(bson: Any, type_expectation: TypeExpectation, document_context: DocumentContext | None, *, coerce_str_values: bool = False):
 	""" Deserializes a Bson document into the specified type info. """
 	
@@ -19,42 +22,74 @@ def bson_to_type_expectation(bson: Any, type_expectation: TypeExpectation, docum
 			raise ValueError(f"Received None for type expectation {type_expectation.type_info} which is not nullable.\n{document_context}")
 
 	### Once we have narrowed down to a single expected type, parse the value into this type. ###
-	# Handle types from specific (complex) to general (simple)
-	if type_expectation.type_info.type_ is type:
-		if type_expectation.type_info.sub_type:
-			# The annotated type is the first argument
-			annotated_type = type_expectation.type_info.sub_type
-			assert not isinstance(annotated_type, ForwardRef)
-			# Now you can use this annotated_type as needed
-			# For example, you might want to return it directly:
-			
-			# BsonableDataclasses, which will be annotated type[BsonableDataclass].
-			
-			# Deserialize by type id
-			assert isinstance(bson, str)
-			assert bson.startswith("type_id=")
-			type_id = bson.removeprefix("type_id=")
-			this_type = type_registry.lookup_type_by_type_id(type_id)
-			if not this_type:
-				raise
-			if not issubclass(this_type, annotated_type):
-				raise 
-			return this_type
-		else:
-			raise ValueError(f"TYPE annotation without arguments in type expectation.\n{document_context}")		
+	expected_type_info = type_expectation.type_info
+	dispatch_table = type_registry.bson_to_type_expectation_dispatch_table
+	if dispatch_table is None:
+		# The type registry has not been created yet, so there is nothing to cache against
+		handler = resolve_bson_to_type_handler(expected_type_info.type_)
+	else:
+		handler = dispatch_table.lookup(expected_type_info.type_)
+	return handler(bson, expected_type_info, document_context, coerce_str_values)
 
-	elif issubclass(type_expectation.type_info.type_, BsonableDataclass):
-		return type_expectation.type_info.type_.from_bson(bson, document_context, coerce_str_values=coerce_str_values)
+def resolve_bson_to_type_handler(expected_type: Any) -> BsonToTypeHandler:
+	""" Determines how bson is deserialized into this expected type. Used to build the bson_to_type_expectation dispatch table. """
+
+	# Unresolved forward refs and other non-type annotations can't be deserialized
+	if not isinstance(expected_type, type):
+		return _unregistered_to_type
+
+	# Handle types from specific (complex) to general (simple)
+	if expected_type is type:
+		return _bson_to_type
 	
-	elif issubclass(type_expectation.type_info.type_, BsonableDict):
-		return type_expectation.type_info.type_.from_bson(bson, document_context, coerce_str_values=coerce_str_values)
+	elif issubclass(expected_type, BsonableDataclass):
+		return _bson_to_bsonable
+	
+	elif issubclass(expected_type, BsonableDict):
+		return _bson_to_bsonable
 	
 	# First try to catch primitives based on an exact type match. This should not allow for inheritance, and should be checked before we check pseudoprimitives, as some pseudoprimitives may inherit from a primitive.
-	elif type_expectation.type_info.type_ in type_registry.primitives:
-		return bson_to_primitive(bson, type_expectation.type_info, document_context, coerce_str_values=coerce_str_values)
+	elif expected_type in type_registry.primitives:
+		return _bson_to_primitive
 	
-	elif issubclass(type_expectation.type_info.type_, tuple(type_registry.pseudo_primitives)):
-		return type_registry.bson_to_pseudo_primitive(bson, type_expectation.type_info, document_context, coerce_str_values=coerce_str_values)
+	elif issubclass(expected_type, tuple(type_registry.pseudo_primitives)):
+		return _bson_to_pseudo_primitive
+
+	else:
+		return _unregistered_to_type
 
+#region: Handlers
+def _bson_to_type(bson: Any, expected_type_info: TypeInfo, document_context: DocumentContext | None, coerce_str_values: bool) -> type:
+	if expected_type_info.sub_type:
+		# The annotated type is the first argument
+		annotated_type = expected_type_info.sub_type
+		assert not isinstance(annotated_type, ForwardRef)
+		
+		# BsonableDataclasses, which will be annotated type[BsonableDataclass].
+		
+		# Deserialize by type id
+		assert isinstance(bson, str)
+		assert bson.startswith("type_id=")
+		type_id = bson.removeprefix("type_id=")
+		this_type = type_registry.lookup_type_by_type_id(type_id)
+		if not this_type:
+			raise
+		if not issubclass(this_type, annotated_type):
+			raise 
+		return this_type
 	else:
-		raise ValueError(f"Unable to deserialize unregistered expected type {type_expectation.type_info.type_}.\n{document_context}")
\ No newline at end of file
+		raise ValueError(f"TYPE annotation without arguments in type expectation.\n{document_context}")
+
+def _bson_to_bsonable(bson: Any, expected_type_info: TypeInfo, document_context: DocumentContext | None, coerce_str_values: bool) -> BsonableDataclass | BsonableDict:
+	return expected_type_info.type_.from_bson(bson, document_context, coerce_str_values=coerce_str_values)
+
+def _bson_to_primitive(bson: Any, expected_type_info: TypeInfo, document_context: DocumentContext | None, coerce_str_values: bool) -> Any:
+	return bson_to_primitive(bson, expected_type_info, document_context, coerce_str_values=coerce_str_values)
+
+def _bson_to_pseudo_primitive(bson: Any, expected_type_info: TypeInfo, document_context: DocumentContext | None, coerce_str_values: bool) -> Any:
+	# Looked up on each call so that the handler stays valid if the registry is re-created with different pseudo-primitives
+	return type_registry.bson_to_pseudo_primitive(bson, expected_type_info, document_context, coerce_str_values=coerce_str_values)
+
+def _unregistered_to_type(bson: Any, expected_type_info: TypeInfo, document_context: DocumentContext | None, coerce_str_values: bool) -> Any:
+	raise ValueError(f"Unable to deserialize unregistered expected type {expected_type_info.type_}.\n{document_context}")
+# endregion
@@ -1,38 +1,67 @@
-from typing import Any
+from typing import Any, Callable
 
 from ..bsonable_dataclass.bsonable_dataclass import BsonableDataclass
 from ..bsonable_dict.bsonable_dict import BsonableDict
-from .primitive_to_bson import primitive_to_bson
+from .primitive_to_bson import PASS_THROUGH_PRIMITIVES, primitive_to_bson
 from .. import type_registry
 
 
+ObjToBsonHandler = Callable[[Any], Any]
+
 def obj_to_bson(obj: Any) -> Any:
 	"""
 	Serializes Python object into Bson. See readme.txt.
 	"""
+	dispatch_table = type_registry.obj_to_bson_dispatch_table
+	if dispatch_table is None:
+		# The type registry has not been created yet, so there is nothing to cache against
+		return resolve_obj_to_bson_handler(type(obj))(obj)
+	return dispatch_table.lookup(type(obj))(obj)
+
+def resolve_obj_to_bson_handler(obj_type: type) -> ObjToBsonHandler:
+	""" Determines how objects of this exact type are serialized. Used to build the obj_to_bson dispatch table. """
 
 	# Handle types from specific (complex) to general (simple)
-	if isinstance(obj, type):
-		type_id = type_registry.type_to_type_id(obj)
-		if not type_id:
-			raise TypeError(f"Type {obj} not registered for serialization.")
-		return f"type_id={type_id}"
+	if issubclass(obj_type, type):
+		return _type_to_bson
 	
-	elif isinstance(obj, BsonableDataclass):
-		return obj.to_bson()
+	elif issubclass(obj_type, BsonableDataclass):
+		return _bsonable_to_bson
 	
-	elif isinstance(obj, BsonableDict):
-		return obj.to_bson()
+	elif issubclass(obj_type, BsonableDict):
+		return _bsonable_to_bson
 	
 	# First try to catch primitives based on an exact type match. This should not allow for inheritance, and should be checked before we check pseudoprimitives, as some pseudoprimitives may inherit from a primitive.
-	elif type(obj) in type_registry.primitives:
-		return primitive_to_bson(obj)
+	elif obj_type in type_registry.primitives:
+		if obj_type in PASS_THROUGH_PRIMITIVES:
+			return _pass_through
+		return primitive_to_bson
 	
-	elif isinstance(obj, tuple(type_registry.pseudo_primitives)):
-		return type_registry.pseudo_primitive_to_bson(obj)
+	elif issubclass(obj_type, tuple(type_registry.pseudo_primitives)):
+		return type_registry.pseudo_primitive_to_bson
 	
-	elif obj is None:
-		return None
+	elif obj_type is type(None):
+		return _none_to_bson
 
 	else:
-		raise TypeError(f"Type {type(obj)} not serializable.")
\ No newline at end of file
+		return _not_serializable
+
+#region: Handlers
+def _type_to_bson(obj: type) -> str:
+	type_id = type_registry.type_to_type_id(obj)
+	if not type_id:
+		raise TypeError(f"Type {obj} not registered for serialization.")
+	return f"type_id={type_id}"
+
+def _bsonable_to_bson(obj: BsonableDataclass | BsonableDict) -> Any:
+	return obj.to_bson()
+
+def _pass_through(obj: Any) -> Any:
+	return obj
+
+def _none_to_bson(obj: None) -> None:
+	return None
+
+def _not_serializable(obj: Any) -> Any:
+	raise TypeError(f"Type {type(obj)} not serializable.")
+# endregion
@@ -4,6 +4,9 @@ from typing import Any
 from .validate_primitive_dict import validate_primitive_dict
 
 
+PASS_THROUGH_PRIMITIVES = (str, float, int, bool, datetime)
+""" primitive_to_bson returns values of these exact types unchanged. """
+
 def primitive_to_bson(obj: Any) -> Any:
 	""" Converts a primitive object to its BSON representation. """
 	if type(obj) is dict:
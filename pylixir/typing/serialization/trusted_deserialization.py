@@ -0,0 +1,27 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+
+"""
+Trusted deserialization
+
+Inside a trusted_deserialization() block, BsonableDataclass.from_bson() builds instances directly instead of calling the generated __init__,
+so field values are not re-validated (bson_to_type_expectation has just produced values of the expected types, and the document was validated when it was saved).
+__post_init__ still runs. Only use this for bson read back from our own database.
+"""
+
+_trusted: ContextVar[bool] = ContextVar("_trusted", default=False)
+
+@contextmanager
+def trusted_deserialization() -> Iterator[None]:
+	""" Skips field validation for all BsonableDataclasses deserialized within this block. """
+	token = _trusted.set(True)
+	try:
+		yield
+	finally:
+		_trusted.reset(token)
+
+def is_trusted() -> bool:
+	""" Returns True if BsonableDataclasses should be built without re-validating their fields. """
+	return _trusted.get()
@@ -0,0 +1,76 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator
+
+from ..fields.field_schema import FieldSchema
+from ..registration.type_expectation import TypeExpectation
+from ..registration.type_info import TypeInfo
+
+
+"""
+Validating serialization
+
+Inside a validating_serialization() block, BsonableDataclass.to_bson() and BsonableDict.to_bson() validate each value as they emit it,
+running the same checks the generated __init__ would (the type expectation and the field's validation_func), plus the element types of sequences.
+This lets Document.to_document() validate and serialize in a single pass instead of rebuilding the instance with to_bson() + from_bson() first.
+"""
+
+_validating: ContextVar[bool] = ContextVar("_validating", default=False)
+
+SEQUENCE_TYPES = (list, tuple, set, frozenset)
+
+@contextmanager
+def validating_serialization() -> Iterator[None]:
+	""" Validates all values serialized within this block. """
+	token = _validating.set(True)
+	try:
+		yield
+	finally:
+		_validating.reset(token)
+
+def is_validating() -> bool:
+	""" Returns True if values should be validated as they are serialized. """
+	return _validating.get()
+
+def validate_field_for_serialization(field_schema: FieldSchema, field_value: Any) -> None:
+	""" Validates a field value the same way the generated __init__ would, and additionally checks the elements of sequence fields against the annotated sub type.
+	Values that don't match their type but that bson_to_type_expectation() would coerce into it (e.g. an int for a float) are accepted, as they were when the instance was rebuilt from bson. """
+	try:
+		field_schema.validate_field_value(field_value)
+	except ValueError:
+		# Rerun the checks (including the validation_func) on the value the rebuilt instance would have held
+		coerced_value = _coerce(field_value, field_schema.type_expectation)
+		if coerced_value is _NOT_COERCIBLE:
+			raise
+		field_schema.validate_field_value(coerced_value)
+
+	type_info = field_schema.type_expectation.type_info
+	if field_value is not None and type_info.type_ in SEQUENCE_TYPES and isinstance(type_info.sub_type, type):
+		element_expectation: TypeExpectation | None = None
+		for element in field_value:
+			if isinstance(element, type_info.sub_type):
+				continue
+			if element_expectation is None:
+				element_expectation = TypeExpectation(TypeInfo(type_info.sub_type, None), False)
+			if _coerce(element, element_expectation) is _NOT_COERCIBLE:
+				raise ValueError(f"Element '{element}' in field '{field_schema.field_name}' of '{field_schema.containing_cls.__name__}' is not of expected type {type_info.sub_type.__name__}. Instead received {type(element).__name__}.")
+
+def validate_value_for_serialization(type_expectation: TypeExpectation, value: Any) -> None:
+	""" Validates a value (e.g. a BsonableDict value) against its type expectation, accepting the values that bson_to_type_expectation() would coerce into it. """
+	try:
+		type_expectation.validate(value, None)
+	except ValueError:
+		if _coerce(value, type_expectation) is _NOT_COERCIBLE:
+			raise
+
+_NOT_COERCIBLE = object()
+
+def _coerce(value: Any, type_expectation: TypeExpectation) -> Any:
+	""" Returns the value as it would be deserialized after a round trip through bson, or _NOT_COERCIBLE if that fails. """
+	from .bson_to_type_expectation import bson_to_type_expectation
+	from .obj_to_bson import obj_to_bson
+
+	try:
+		return bson_to_type_expectation(obj_to_bson(value), type_expectation, None)
+	except Exception:
+		return _NOT_COERCIBLE
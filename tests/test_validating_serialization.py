@@ -0,0 +1,59 @@
+import os
+
+import pytest
+
+# pylixir.frontend requires these at import time
+os.environ.setdefault("APP_PROTOCOL", "http")
+os.environ.setdefault("API_HOST", "localhost")
+
+from pylixir.document import Document
+from pylixir.typing import create_type_registry
+from pylixir.typing.bsonable_dict.bsonable_dict import BsonableDict
+from pylixir.typing.fields.schema_config import SchemaConfig
+
+
+class Weights(BsonableDict[str, float]):
+	__type_id__ = "TestWeights"
+	__key__: str
+	__value__: float
+
+class Thing(Document):
+	__type_id__ = "TestThing"
+	__collection_name__ = "test_things"
+	score: float = 0.0
+	tags: list[float] = SchemaConfig(default_factory=list)
+	weights: Weights = SchemaConfig(default_factory=Weights)
+
+	def get_owner(self):
+		return self._id
+
+create_type_registry()
+
+
+def test_int_elements_accepted_in_float_list():
+	thing = Thing(tags=[1, 2])
+	document = thing.to_document()
+	assert document["tags"] == [1, 2]
+	assert Thing.from_document(document).tags == [1.0, 2.0]
+
+def test_int_accepted_for_float_field_set_after_init():
+	thing = Thing()
+	thing.score = 5
+	document = thing.to_document()
+	assert Thing.from_document(document).score == 5.0
+
+def test_int_accepted_for_float_dict_value():
+	thing = Thing()
+	thing.weights._elements["a"] = 1 # Bypass __setitem__'s own type check, as e.g. a default_factory might
+	assert Thing.from_document(thing.to_document()).weights["a"] == 1.0
+
+def test_invalid_values_still_rejected():
+	thing = Thing()
+	thing.score = "high"
+	with pytest.raises(ValueError):
+		thing.to_document()
+
+	thing = Thing()
+	thing.tags = [1.0, "two"]
+	with pytest.raises(ValueError):
+		thing.to_document()